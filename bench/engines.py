@@ -0,0 +1,441 @@
+"""
+End-to-end benchmark: the real engines driven by scripted input, a local UDP
+sink standing in for sclang / Sonic Pi.
+
+Scenarios (each on a fresh engine, same code paths as the front ends):
+
+    siren_slider_sweep   Tk-rate drags on pitch / rate / delay time
+    siren_key_flood      auto-repeat on the arrow / bracket keys, far above 30/s
+    siren_tap_sequence   tap tempo at a steady 150 bpm
+    panel_key_flood      front_panel.py q/a/w/s... with every key held at once
+    gpio_button_mash     raspi/main_py.py pads + pause/stop on gpiozero's MockFactory (Engine path)
+    gpio_bridge_mash     the same presses through the asyncio GpioBridge (ASYNC_BRIDGE, the default)
+
+Per scenario: messages/s and bytes/s seen by the sink, input -> sendto latency
+(the engine's own metrics), input -> sink receive for one-shot triggers, CPU
+time per tick of the sender thread, tick jitter, and allocations per tick from a
+second, shorter run under tracemalloc. No display, audio or GPIO needed.
+The bridge has no ticker: for it, input -> sendto is its edge -> sendto ring and
+input -> sink is taken from each /play bundle's timetag (press + LATENCY).
+
+    python bench/engines.py                       # writes bench/results/<commit>.json
+    python bench/engines.py -d 1 -s gpio_button_mash
+    python bench/engines.py --compare bench/results/67a9b16.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "raspi"))
+from gpiozero.pins.mock import MockFactory
+
+import front_panel
+import main_py
+from tamburi.engine import Engine
+from tamburi.gpio import GpioPads
+from tamburi.gpio_bridge import GpioBridge
+from tamburi.osc import NTP_DELTA
+from tamburi.params import ParamTable
+from tamburi.siren import SirenController
+
+RESULTS_DIR = os.path.join(ROOT, "bench", "results")
+
+# numbers where bigger is better; everything else in the comparison is lower-is-better
+HIGHER_IS_BETTER = {"msgs_per_s", "bytes_per_s", "tick_hz"}
+
+
+class OscSink:
+    """UDP receiver on 127.0.0.1: counts datagrams / messages / bytes, stamps arrival."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self.arrivals = {}  # address -> [perf_counter_ns, ...] for plain messages
+        self.timed = []     # (time.time() at arrival, timetag as Unix time) of timetagged bundles
+        self.reset()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sink", daemon=True)
+        self._thread.start()
+
+    def reset(self):
+        self.packets = 0
+        self.messages = 0
+        self.bytes = 0
+        self.arrivals = {}
+        self.timed = []
+
+    def _run(self):
+        buf = bytearray(65536)
+        view = memoryview(buf)
+        while not self._stop.is_set():
+            try:
+                n = self.sock.recv_into(buf)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            t = time.perf_counter_ns()
+            self.packets += 1
+            self.bytes += n
+            if view[:8] == b"#bundle\0":
+                sec, frac = int.from_bytes(view[8:12], "big"), int.from_bytes(view[12:16], "big")
+                if (sec, frac) != (0, 1):
+                    self.timed.append((time.time(), sec - NTP_DELTA + frac / 4294967296.0))
+                # 16-byte header, then (int32 size, element) pairs
+                i = 16
+                while i + 4 <= n:
+                    i += 4 + int.from_bytes(view[i:i + 4], "big")
+                    self.messages += 1
+            else:
+                self.messages += 1
+                addr = bytes(view[:buf.index(0)])
+                self.arrivals.setdefault(addr, []).append(t)
+
+    def close(self):
+        self._stop.set()
+        self.sock.close()
+        self._thread.join(1.0)
+
+
+def summarize_ns(ns):
+    if not len(ns):
+        return {"n": 0}
+    p50, p95, p99 = (np.percentile(ns, (50, 95, 99)) / 1e6).tolist()
+    return {"n": len(ns), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": float(np.max(ns)) / 1e6}
+
+
+class TickProbe:
+    """Wraps engine.ticker.fn: sender-thread CPU per tick, optionally bytes/blocks per tick."""
+
+    def __init__(self, engine, alloc=False):
+        self.fn = engine.ticker.fn
+        self.alloc = alloc
+        self.cpu_ns = []
+        self.peak_bytes = []
+        self.blocks = []
+        engine.ticker.fn = self
+
+    def __call__(self, now, dt):
+        if self.alloc:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            b0 = sys.getallocatedblocks()
+            self.fn(now, dt)
+            self.blocks.append(sys.getallocatedblocks() - b0)
+            self.peak_bytes.append(tracemalloc.get_traced_memory()[1] - before)
+            return
+        t0 = time.thread_time_ns()
+        self.fn(now, dt)
+        self.cpu_ns.append(time.thread_time_ns() - t0)
+
+
+def paced(rate_hz, duration):
+    """Yield (i, t) at rate_hz for duration seconds on an absolute schedule."""
+    period = 1.0 / rate_hz
+    t0 = time.perf_counter()
+    i = 0
+    while True:
+        t = t0 + i * period
+        if t - t0 >= duration:
+            return
+        wait = t - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        yield i, t - t0
+        i += 1
+
+
+# --- scenarios: build(sink) -> (engine, run(duration) -> inputs, cleanup) ---
+
+def siren_slider_sweep(sink):
+    siren = SirenController("127.0.0.1", sink.port)
+
+    def run(duration):
+        n = 0
+        for i, t in paced(250.0, duration):  # X11 motion events while dragging
+            x = 0.5 + 0.5 * math.sin(2 * math.pi * 0.5 * t)
+            siren.set(("pitch", "rate", "delay_time")[i % 3], x)
+            n += 1
+        return n
+    return siren, run, None
+
+
+def siren_key_flood(sink):
+    siren = SirenController("127.0.0.1", sink.port)
+    keys = [siren.time_up, siren.fb_up, siren.vol_up, siren.time_down, siren.fb_down, siren.vol_down]
+
+    def run(duration):
+        n = 0
+        for i, _ in paced(1000.0, duration):
+            keys[(i // 50) % len(keys)]()
+            n += 1
+        return n
+    return siren, run, None
+
+
+def siren_tap_sequence(sink):
+    siren = SirenController("127.0.0.1", sink.port)
+
+    def run(duration):
+        n = 0
+        for _ in paced(2.5, duration):  # 150 bpm
+            siren.tap()
+            n += 1
+        return n
+    return siren, run, None
+
+
+def panel_key_flood(sink):
+    engine = front_panel.make_engine("127.0.0.1", sink.port)
+    keys = list(front_panel.KEYS.values())
+
+    def run(duration):
+        n = 0
+        for i, _ in paced(2000.0, duration):
+            name, direction = keys[i % len(keys)]
+            engine.nudge(name, direction * front_panel.steps[name])
+            n += 1
+        return n
+    return engine, run, None
+
+
+def mash(factory, duration):
+    """All three pads together, 50 times a second, pause / stop every half second."""
+    pins = [factory.pin(p) for p in main_py.BUTTON_PINS]
+    ctl = [factory.pin(main_py.PAUSE_PIN), factory.pin(main_py.STOP_PIN)]
+    n = 0
+    for i, _ in paced(50.0, duration):
+        for p in pins + ([ctl[(i // 25) % 2]] if i % 25 == 0 else []):
+            p.drive_low()
+            n += 1
+        for p in pins + ctl:
+            p.drive_high()
+    return n
+
+
+def gpio_button_mash(sink):
+    engine = Engine(ParamTable(), "127.0.0.1", sink.port, name="gpio")
+    factory = MockFactory()
+    pads = GpioPads(engine, main_py.BUTTON_PINS, main_py.PAUSE_PIN, main_py.STOP_PIN,
+                    debounce=main_py.DEBOUNCE_SECONDS, pin_factory=factory)
+
+    def run(duration):
+        with contextlib.redirect_stdout(io.StringIO()):  # GpioPads prints every press
+            return mash(factory, duration)
+    return engine, run, pads.close
+
+
+def gpio_bridge_mash(sink):
+    factory = MockFactory()
+    bridge = GpioBridge(main_py.BUTTON_PINS, main_py.PAUSE_PIN, main_py.STOP_PIN, "127.0.0.1", sink.port,
+                        latency=main_py.LATENCY, debounce=main_py.DEBOUNCE_SECONDS, pin_factory=factory,
+                        verbose=False, samples=main_py.SAMPLE_FILES)
+    return bridge, lambda duration: mash(factory, duration), None
+
+
+SCENARIOS = {f.__name__: f for f in (
+    siren_slider_sweep, siren_key_flood, siren_tap_sequence, panel_key_flood, gpio_button_mash,
+    gpio_bridge_mash,
+)}
+BRIDGE_SCENARIOS = {"gpio_bridge_mash"}  # run by bench_bridge(): no Engine, no ticker
+
+
+def run_scenario(build, sink, duration, alloc=False):
+    engine, run, cleanup = build(sink)
+    probe = TickProbe(engine, alloc=alloc)
+    engine.start()
+    time.sleep(0.05)
+    sink.reset()
+    t0 = time.perf_counter()
+    if alloc:
+        tracemalloc.start()
+    inputs = run(duration)
+    time.sleep(0.1)  # let the last glide / trigger reach the sink
+    if alloc:
+        tracemalloc.stop()
+    elapsed = time.perf_counter() - t0
+    st = engine.stats()
+    if cleanup is not None:
+        cleanup()
+    engine.stop()
+    engine.osc.close()
+    return engine, probe, inputs, elapsed, st
+
+
+def trigger_recv_latency(engine, sink):
+    """input -> sink arrival for one-shots: the n-th /play arrival pairs with the n-th trigger."""
+    out = []
+    for addr, times in sink.arrivals.items():
+        stamps = engine.bench_trigger_stamps.get(addr.decode(), [])
+        k = min(len(stamps), len(times))
+        out.extend(t - s for s, t in zip(stamps[:k], times[:k]))
+    return out
+
+
+def bench(name, build, sink, duration, alloc_duration):
+    engine, probe, inputs, elapsed, st = run_scenario(lambda s: stamp_triggers(build(s)), sink, duration)
+    res = {
+        "inputs": inputs,
+        "seconds": elapsed,
+        "msgs_per_s": sink.messages / elapsed,
+        "bytes_per_s": sink.bytes / elapsed,
+        "packets_per_s": sink.packets / elapsed,
+        "msgs_per_input": sink.messages / inputs if inputs else 0.0,
+        "set_latency": st["latency"]["set_latency"],
+        "trigger_latency": st["latency"]["trigger_latency"],
+        "trigger_recv_latency": summarize_ns(trigger_recv_latency(engine, sink)),
+        "counters": st["latency"]["counters"],
+        "tick_hz": st["tick"]["hz"],
+        "tick_jitter_p99_ms": st["tick"]["jitter_p99_ms"],
+        "ticks": st["tick"]["ticks"],
+        "tick_cpu_us": {k.replace("_ms", "_us"): v * 1000.0 if k != "n" else v
+                        for k, v in summarize_ns(probe.cpu_ns).items()},
+    }
+    if alloc_duration > 0:
+        _, aprobe, _, _, _ = run_scenario(build, sink, alloc_duration, alloc=True)
+        ticks = len(aprobe.peak_bytes)
+        res["alloc"] = {
+            "ticks": ticks,
+            "peak_bytes_per_tick": sum(aprobe.peak_bytes) / ticks if ticks else 0.0,
+            "net_blocks_per_tick": sum(aprobe.blocks) / ticks if ticks else 0.0,
+        }
+    return res
+
+
+def bench_bridge(name, build, sink, duration, alloc_duration):
+    """A GpioBridge scenario: presses in, timetagged /play bundles at the sink."""
+    bridge, run, _ = build(sink)
+    bridge.start()
+    time.sleep(0.05)
+    sink.reset()
+    t0 = time.perf_counter()
+    inputs = run(duration)
+    time.sleep(0.1)
+    elapsed = time.perf_counter() - t0
+    st = bridge.stats()
+    bridge.close()
+    # timetag = press (monotonic -> Unix) + latency, so the press is timetag - latency
+    recv = [(arrival - (tag - bridge.latency)) * 1e9 for arrival, tag in sink.timed]
+    return {
+        "inputs": inputs,
+        "seconds": elapsed,
+        "msgs_per_s": sink.messages / elapsed,
+        "bytes_per_s": sink.bytes / elapsed,
+        "packets_per_s": sink.packets / elapsed,
+        "msgs_per_input": sink.messages / inputs if inputs else 0.0,
+        "trigger_latency": st["edge_to_send"],
+        "trigger_recv_latency": summarize_ns(recv),
+        "counters": st["counters"],
+    }
+
+
+def stamp_triggers(built):
+    """Record the input time of every trigger, per address, for trigger_recv_latency()."""
+    engine, run, cleanup = built
+    stamps = engine.bench_trigger_stamps = {}
+    trigger = engine.trigger
+
+    def stamped(addr, *args, t_ns=None):
+        t_ns = t_ns or time.perf_counter_ns()
+        stamps.setdefault(addr, []).append(t_ns)
+        trigger(addr, *args, t_ns=t_ns)
+    engine.trigger = stamped
+    return engine, run, cleanup
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(d, prefix=""):
+    out = {}
+    for k, v in d.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            out.update(flatten(v, key + "."))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = v
+    return out
+
+
+def compare(base, cur):
+    print(f"\n{'vs ' + base['commit']:48s} {'base':>12s} {'now':>12s} {'change':>8s}")
+    for name, res in cur["scenarios"].items():
+        old = flatten(base["scenarios"].get(name, {}))
+        for key, v in flatten(res).items():
+            if key not in old or key.endswith(".n") or key in ("inputs", "seconds", "ticks"):
+                continue
+            b = old[key]
+            ch = (v - b) / abs(b) * 100.0 if b else 0.0
+            worse = ch < -10 if key.split(".")[-1] in HIGHER_IS_BETTER else ch > 10
+            print(f"{name + ' ' + key:48s} {b:12.4g} {v:12.4g} {ch:+7.1f}%{'  !' if worse else ''}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-d", "--duration", type=float, default=3.0, help="seconds per scenario")
+    ap.add_argument("--alloc-duration", type=float, default=0.5, help="tracemalloc run per scenario (0 = skip)")
+    ap.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS), help="only these")
+    ap.add_argument("-o", "--out", help="results JSON (default bench/results/<commit>.json, '-' = stdout)")
+    ap.add_argument("--compare", metavar="JSON", help="print changes against an earlier results file")
+    args = ap.parse_args()
+
+    commit = git_commit()
+    result = {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "duration": args.duration,
+        "scenarios": {},
+    }
+    sink = OscSink()
+    for name in args.scenario or SCENARIOS:
+        runner = bench_bridge if name in BRIDGE_SCENARIOS else bench
+        res = runner(name, SCENARIOS[name], sink, args.duration, args.alloc_duration)
+        result["scenarios"][name] = res
+        lat = res["set_latency"] if res.get("set_latency", {}).get("n") else res["trigger_latency"]
+        print(f"{name:20s} {res['msgs_per_s']:8.0f} msg/s {res['bytes_per_s'] / 1024:7.1f} KiB/s"
+              f"  in->udp p50 {lat.get('p50_ms', 0):5.2f} p99 {lat.get('p99_ms', 0):5.2f} ms"
+              f"  tick cpu p50 {res.get('tick_cpu_us', {}).get('p50_us', 0):6.1f} us", file=sys.stderr)
+    sink.close()
+
+    text = json.dumps(result, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        with open(out, "w") as f:
+            f.write(text + "\n")
+        print(f"-> {out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Microbenchmark: tamburi.osc.OscSender vs pythonosc SimpleUDPClient.
+
+Sends to a local UDP socket (nobody needs to be listening, the kernel drops
+what overflows) and reports time and allocated bytes per operation. The
+pre-encoded paths are not allocation-free: they skip the builder and the
+re-encode, and what remains per send (the args tuple, the socket call) shows in
+"B peak/op".
+
+    python bench/osc_encode.py [-n 20000]
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+from pythonosc.osc_message_builder import OscMessageBuilder
+from pythonosc.udp_client import SimpleUDPClient
+
+from tamburi.osc import OscSender
+
+# the 13 controller.py addresses, i.e. one full tick
+ADDRS = [
+    "/delay/time", "/delay/fb", "/master/vol",
+    "/siren/freq", "/siren/rate", "/siren/depth",
+    "/air/freq", "/air/rate", "/air/depth",
+    "/bens/freq", "/bens/rate", "/bens/tone", "/bens/drive",
+]
+
+
+def measure(fn, n):
+    """(microseconds per call, peak transient bytes allocated by one call)"""
+    for _ in range(min(n, 500)):
+        fn()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    us = (time.perf_counter() - t0) / n * 1e6
+
+    m = min(n, 2000)
+    total = 0
+    tracemalloc.start()
+    for _ in range(m):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn()
+        total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return us, total / m
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=20000, help="iterations per case")
+    args = ap.parse_args()
+
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    port = sink.getsockname()[1]
+
+    ref = SimpleUDPClient("127.0.0.1", port)
+    osc = OscSender("127.0.0.1", port)
+    freq = osc.message("/siren/freq", "f")
+    msgs = [osc.message(a, "f") for a in ADDRS]
+    parts = [(m, (0.5,)) for m in msgs]
+
+    def ref_bundle():
+        b = OscBundleBuilder(IMMEDIATELY)
+        for a in ADDRS:
+            m = OscMessageBuilder(address=a)
+            m.add_arg(0.5, OscMessageBuilder.ARG_TYPE_FLOAT)
+            b.add_content(m.build())
+        ref.send(b.build())
+
+    # (name, fn, index of the pythonosc case it is compared with)
+    cases = [
+        ("SimpleUDPClient.send_message", lambda: ref.send_message("/siren/freq", 1234.5), 0),
+        ("OscSender.send_message", lambda: osc.send_message("/siren/freq", 1234.5), 0),
+        ("Message.send (pre-encoded)", lambda: freq.send(1234.5), 0),
+        ("pythonosc bundle x13", ref_bundle, 3),
+        ("OscSender.send_bundle x13", lambda: osc.send_bundle(parts), 3),
+    ]
+
+    print(f"{'case':32s} {'us/op':>9s} {'B peak/op':>11s} {'speedup':>8s}")
+    times = []
+    for name, fn, ref_i in cases:
+        us, alloc = measure(fn, args.n)
+        times.append(us)
+        print(f"{name:32s} {us:9.2f} {alloc:11.1f} {times[ref_i] / us:7.1f}x")
+
+    sink.close()
+
+
+if __name__ == "__main__":
+    main()
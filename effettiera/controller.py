@@ -1,438 +1,258 @@
 # Python SCRIPT (SMALL UI) + TAP TEMPO + TRUE x2 (DOUBLES/HALVES THE ACTUAL DELAY SLIDER) + 3 SIRENS
 # ONE shared PITCH slider for all 3 (each with its own Hz range)
 # ONE shared RATE  slider for all 3 (each with its own rate range)
+#
+# Thin Tk front end: all parameter / OSC logic lives in tamburi.siren.SirenController
+# (headless, also used by tamburi/rig.py without a display).
 
-from pythonosc.udp_client import SimpleUDPClient
 import tkinter as tk
-import time
-from collections import deque
-
-SC_IP = "127.0.0.1"
-SC_PORT = 57120
-c = SimpleUDPClient(SC_IP, SC_PORT)
-
-TIME_STEP = 0.02
-FB_STEP = 0.03
-VOL_STEP = 0.05
-
-TIME_MIN, TIME_MAX = 0.03, 2.0
-FB_MIN, FB_MAX = 0.0, 0.92
-VOL_MIN, VOL_MAX = 0.0, 1.0
-
-# Per-siren pitch ranges
-S1_HZ_MIN, S1_HZ_MAX = 500.0, 5000.0
-BENS_HZ_MIN, BENS_HZ_MAX = 500.0, 5000.0
-AIR_HZ_MIN, AIR_HZ_MAX = 200.0, 2000.0
-
-# Per-siren rate ranges
-S1_RATE_MIN, S1_RATE_MAX = 0.05, 5.0
-BENS_RATE_MIN, BENS_RATE_MAX = 0.5, 12.0
-AIR_RATE_MIN, AIR_RATE_MAX = 0.05, 1.5
-
-SEND_HZ = 120.0
-SEND_DT = 1.0 / SEND_HZ
-
-# smoothing (audio-safe)
-DELAY_ALPHA = 0.06
-FB_ALPHA = 0.06
-
-PITCH_ALPHA = 0.10
-RATE_ALPHA  = 0.12
-
-S1_DEPTH_ALPHA = 0.10
-AIR_DEPTH_ALPHA = 0.10
-
-BENS_TONE_ALPHA  = 0.12
-BENS_DRIVE_ALPHA = 0.12
-
-
-def clamp(x, lo, hi):
-    return lo if x < lo else hi if x > hi else x
-
-
-def exp_map_0_1(x01: float, vmin: float, vmax: float) -> float:
-    x01 = clamp(x01, 0.0, 1.0)
-    ratio = vmax / vmin
-    return vmin * (ratio ** x01)
-
-
-# --- tap tempo state ---
-tap_times = deque(maxlen=8)
-tap_intervals = deque(maxlen=6)
-
-bpm_var = None
-tap_hint_var = None
-
-
-def _update_bpm_display(delay_time: float, x2_on: bool):
-    bpm = 60.0 / delay_time if delay_time > 1e-9 else 0.0
-    bpm_var.set(f"{bpm:5.1f} bpm")
-    tap_hint_var.set(f"{delay_time:0.3f}s {'x2' if x2_on else ''}".strip())
-
-
-# --- OSC actions ---
-def clear_delay():
-    c.send_message("/delay/clear", 1)
-
-def siren1_toggle():
-    c.send_message("/siren/toggle", 1)
-
-def siren1_stop():
-    c.send_message("/siren/stop", 1)
-
-def air_toggle():
-    c.send_message("/air/toggle", 1)
-
-def air_stop():
-    c.send_message("/air/stop", 1)
-
-def bens_toggle():
-    c.send_message("/bens/toggle", 1)
-
-def bens_stop():
-    c.send_message("/bens/stop", 1)
-
-
-# --- GUI (compact) ---
-root = tk.Tk()
-root.title("Delay + Vol + 3 Sirens (shared pitch/rate)")
-root.focus_force()
-root.option_add("*Font", "TkDefaultFont 10")
-
-outer = tk.Frame(root, padx=8, pady=6)
-outer.pack(fill="both", expand=True)
-
-tk.Label(
-    outer,
-    text="←/→ delay  ↑/↓ fb  [/] vol  t tap  2 x2  s/x dub  a/z air  b/n bip  Esc clear",
-    anchor="w",
-    justify="left"
-).pack(fill="x", pady=(0, 4))
-
-tap_row = tk.Frame(outer)
-tap_row.pack(fill="x", pady=(0, 4))
-
-bpm_var = tk.StringVar(value="— bpm")
-tap_hint_var = tk.StringVar(value="tap (t)")
-
-tk.Label(tap_row, text="Tap:", width=4, anchor="w").pack(side="left")
-tk.Label(tap_row, textvariable=tap_hint_var, width=12, anchor="w").pack(side="left", padx=(0, 8))
-tk.Label(tap_row, text="BPM:", width=4, anchor="w").pack(side="left")
-tk.Label(tap_row, textvariable=bpm_var, width=10, anchor="w").pack(side="left", padx=(0, 8))
-
-x2_var = tk.IntVar(value=0)
-
-knob = tk.Frame(outer)
-knob.pack(fill="both", expand=True)
+import os
+import sys
+import queue
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tamburi.siren import (
+    SirenController, KEYMAP, SC_IP, SC_PORT,
+    TIME_MIN, TIME_MAX, FB_MIN, FB_MAX, VOL_MIN, VOL_MAX,
+)
+from tamburi.presets import Presets, MORPH_SECONDS
 
 SLIDER_LEN = 250
 SLIDER_HANDLE = 14
 
-
-def make_scale(label, frm, to, cmd, from_=0.0, res=0.001):
-    sc = tk.Scale(
-        frm, from_=from_, to=to, resolution=res,
-        orient="horizontal", length=SLIDER_LEN,
-        sliderlength=SLIDER_HANDLE,
-        label=label, command=cmd
-    )
-    sc.pack(fill="x", pady=(2, 0))
-    return sc
-
-
-# --- targets + smoothed ---
-delay_time_target = 0.33
-delay_time_sm = delay_time_target
-
-fb_target = 0.55
-fb_sm = fb_target
-
-vol_target = 0.25
-
-pitch01_target = 0.55
-rate01_target  = 0.45
-pitch01_sm = pitch01_target
-rate01_sm  = rate01_target
-
-# extras
-s1_depth_target = 0.55
-air_depth_target = 0.60
-bens_tone_target = 0.25
-bens_drive_target = 0.15
-
-s1_depth_sm = s1_depth_target
-air_depth_sm = air_depth_target
-bens_tone_sm = bens_tone_target
-bens_drive_sm = bens_drive_target
-
-
-# --- slider callbacks ---
-def on_delay_time_slider(v):
-    global delay_time_target
-    delay_time_target = clamp(float(v), TIME_MIN, TIME_MAX)
-    _update_bpm_display(delay_time_target, x2_var.get() == 1)
-
-def on_fb_slider(v):
-    global fb_target
-    fb_target = clamp(float(v), FB_MIN, FB_MAX)
-
-def on_vol_slider(v):
-    global vol_target
-    vol_target = clamp(float(v), VOL_MIN, VOL_MAX)
-
-def on_pitch(v):
-    global pitch01_target
-    pitch01_target = clamp(float(v), 0.0, 1.0)
-
-def on_rate(v):
-    global rate01_target
-    rate01_target = clamp(float(v), 0.0, 1.0)
-
-def on_s1_depth(v):
-    global s1_depth_target
-    s1_depth_target = clamp(float(v), 0.0, 1.0)
-
-def on_air_depth(v):
-    global air_depth_target
-    air_depth_target = clamp(float(v), 0.0, 1.0)
-
-def on_bens_tone(v):
-    global bens_tone_target
-    bens_tone_target = clamp(float(v), 0.0, 1.0)
-
-def on_bens_drive(v):
-    global bens_drive_target
-    bens_drive_target = clamp(float(v), 0.0, 1.0)
-
-
-# --- build sliders ---
-delay_time_slider = make_scale(
-    "Delay TIME (sec) [tap]  (x2 doubles/halves THIS value)",
-    knob, TIME_MAX, on_delay_time_slider, from_=TIME_MIN, res=0.001
-)
-delay_time_slider.set(delay_time_target)
-
-fb_slider = make_scale("Feedback", knob, FB_MAX, on_fb_slider, from_=FB_MIN, res=0.001)
-fb_slider.set(fb_target)
-
-vol_slider = make_scale("Master Vol", knob, VOL_MAX, on_vol_slider, from_=VOL_MIN, res=0.001)
-vol_slider.set(vol_target)
-
-pitch_slider = make_scale("PITCH (all): dub/ben 500..5000, air 200..2000", knob, 1.0, on_pitch, from_=0.0, res=0.001)
-pitch_slider.set(pitch01_target)
-
-rate_slider = make_scale("RATE (all): dub 0.05..5, ben 0.5..12, air 0.05..1.5", knob, 1.0, on_rate, from_=0.0, res=0.001)
-rate_slider.set(rate01_target)
-
-tk.Label(knob, text="Extras", anchor="w").pack(fill="x", pady=(6, 0))
-s1d = make_scale("Dub Depth", knob, 1.0, on_s1_depth, from_=0.0, res=0.001); s1d.set(s1_depth_target)
-ad  = make_scale("Air Depth", knob, 1.0, on_air_depth, from_=0.0, res=0.001); ad.set(air_depth_target)
-bt  = make_scale("Ben Tone",  knob, 1.0, on_bens_tone, from_=0.0, res=0.001); bt.set(bens_tone_target)
-bd  = make_scale("Ben Drive", knob, 1.0, on_bens_drive, from_=0.0, res=0.001); bd.set(bens_drive_target)
-
-
-# --- x2 that actually doubles/halves the delay slider ---
-_last_x2 = 0
-
-def apply_x2_from_checkbox():
-    """
-    Called when checkbox changes.
-    If it turned ON: multiply delay time by 2
-    If it turned OFF: divide delay time by 2
-    """
-    global delay_time_target, _last_x2
-
-    new_x2 = x2_var.get()
-    if new_x2 == _last_x2:
-        return
-
-    if new_x2 == 1:
-        delay_time_target = clamp(delay_time_target * 2.0, TIME_MIN, TIME_MAX)
-    else:
-        delay_time_target = clamp(delay_time_target * 0.5, TIME_MIN, TIME_MAX)
-
-    _last_x2 = new_x2
-    delay_time_slider.set(delay_time_target)  # makes it feel like you dragged it
-    _update_bpm_display(delay_time_target, x2_var.get() == 1)
-
-def toggle_x2_key():
-    """Key '2' flips the checkbox, then checkbox handler does the doubling."""
-    x2_var.set(0 if x2_var.get() else 1)
-    apply_x2_from_checkbox()
-
-
-tk.Checkbutton(
-    tap_row,
-    text="x2",
-    variable=x2_var,
-    command=apply_x2_from_checkbox
-).pack(side="left")
-
-_update_bpm_display(delay_time_target, x2_var.get() == 1)
-
-
-# --- key helpers ---
-def time_down():
-    global delay_time_target
-    delay_time_target = clamp(delay_time_target - TIME_STEP, TIME_MIN, TIME_MAX)
-    delay_time_slider.set(delay_time_target)
-    _update_bpm_display(delay_time_target, x2_var.get() == 1)
-
-def time_up():
-    global delay_time_target
-    delay_time_target = clamp(delay_time_target + TIME_STEP, TIME_MIN, TIME_MAX)
-    delay_time_slider.set(delay_time_target)
-    _update_bpm_display(delay_time_target, x2_var.get() == 1)
-
-def fb_down():
-    global fb_target
-    fb_target = clamp(fb_target - FB_STEP, FB_MIN, FB_MAX)
-    fb_slider.set(fb_target)
-
-def fb_up():
-    global fb_target
-    fb_target = clamp(fb_target + FB_STEP, FB_MIN, FB_MAX)
-    fb_slider.set(fb_target)
-
-def vol_down():
-    global vol_target
-    vol_target = clamp(vol_target - VOL_STEP, VOL_MIN, VOL_MAX)
-    vol_slider.set(vol_target)
-
-def vol_up():
-    global vol_target
-    vol_target = clamp(vol_target + VOL_STEP, VOL_MIN, VOL_MAX)
-    vol_slider.set(vol_target)
-
-def tap_tempo():
-    """Tap sets the ACTUAL delay time."""
-    global delay_time_target
-    now = time.time()
-    tap_times.append(now)
-    if len(tap_times) < 2:
-        tap_hint_var.set("tap…")
-        return
-    dt = tap_times[-1] - tap_times[-2]
-    if dt < 0.08 or dt > 2.5:
-        tap_intervals.clear()
-        tap_hint_var.set("reset")
-        return
-    tap_intervals.append(dt)
-    if len(tap_intervals) < 2:
-        tap_hint_var.set("…")
-        return
-
-    sdt = sorted(tap_intervals)
-    mid = len(sdt) // 2
-    est = sdt[mid] if (len(sdt) % 2 == 1) else 0.5 * (sdt[mid - 1] + sdt[mid])
-    est = clamp(est, TIME_MIN, TIME_MAX)
-
-    delay_time_target = est
-    delay_time_slider.set(delay_time_target)
-    _update_bpm_display(delay_time_target, x2_var.get() == 1)
-
-
-# --- sending ---
-last_send = 0.0
-last_sent = {}
-
-def maybe_send(addr, val, eps):
-    old = last_sent.get(addr, None)
-    if old is None or abs(val - old) > eps:
-        c.send_message(addr, float(val))
-        last_sent[addr] = val
-
-
-def tick():
-    global delay_time_sm, fb_sm, last_send
-    global pitch01_sm, rate01_sm
-    global s1_depth_sm, air_depth_sm, bens_tone_sm, bens_drive_sm
-
-    now = time.time()
-    if now - last_send >= SEND_DT:
-        last_send = now
-
-        delay_time_sm = delay_time_sm + DELAY_ALPHA * (delay_time_target - delay_time_sm)
-        delay_time_sm = clamp(delay_time_sm, TIME_MIN, TIME_MAX)
-
-        fb_sm = fb_sm + FB_ALPHA * (fb_target - fb_sm)
-        fb_sm = clamp(fb_sm, FB_MIN, FB_MAX)
-
-        vol_now = clamp(vol_target, VOL_MIN, VOL_MAX)
-
-        pitch01_sm = pitch01_sm + PITCH_ALPHA * (pitch01_target - pitch01_sm)
-        rate01_sm  = rate01_sm  + RATE_ALPHA  * (rate01_target  - rate01_sm)
-
-        # pitch per siren
-        s1_hz   = exp_map_0_1(pitch01_sm, S1_HZ_MIN,   S1_HZ_MAX)
-        bens_hz = exp_map_0_1(pitch01_sm, BENS_HZ_MIN, BENS_HZ_MAX)
-        air_hz  = exp_map_0_1(pitch01_sm, AIR_HZ_MIN,  AIR_HZ_MAX)
-
-        # rate per siren
-        s1_rate   = exp_map_0_1(rate01_sm, S1_RATE_MIN,   S1_RATE_MAX)
-        bens_rate = exp_map_0_1(rate01_sm, BENS_RATE_MIN, BENS_RATE_MAX)
-        air_rate  = exp_map_0_1(rate01_sm, AIR_RATE_MIN,  AIR_RATE_MAX)
-
-        # extras smoothing
-        s1_depth_sm   = s1_depth_sm   + S1_DEPTH_ALPHA    * (s1_depth_target  - s1_depth_sm)
-        air_depth_sm  = air_depth_sm  + AIR_DEPTH_ALPHA   * (air_depth_target - air_depth_sm)
-        bens_tone_sm  = bens_tone_sm  + BENS_TONE_ALPHA   * (bens_tone_target - bens_tone_sm)
-        bens_drive_sm = bens_drive_sm + BENS_DRIVE_ALPHA  * (bens_drive_target - bens_drive_sm)
-
-        s1_depth   = clamp(s1_depth_sm, 0, 1)
-        air_depth  = clamp(air_depth_sm, 0, 1)
-        bens_tone  = clamp(bens_tone_sm, 0, 1)
-        bens_drive = clamp(bens_drive_sm, 0, 1)
-
-        maybe_send("/delay/time", delay_time_sm, 0.0005)
-        maybe_send("/delay/fb",   fb_sm,         0.0005)
-        maybe_send("/master/vol", vol_now,       0.0005)
-
-        maybe_send("/siren/freq",  s1_hz,    1.0)
-        maybe_send("/siren/rate",  s1_rate,  0.01)
-        maybe_send("/siren/depth", s1_depth, 0.003)
-
-        maybe_send("/air/freq",  air_hz,    0.7)
-        maybe_send("/air/rate",  air_rate,  0.005)
-        maybe_send("/air/depth", air_depth, 0.003)
-
-        maybe_send("/bens/freq",  bens_hz,    1.0)
-        maybe_send("/bens/rate",  bens_rate,  0.01)
-        maybe_send("/bens/tone",  bens_tone,  0.003)
-        maybe_send("/bens/drive", bens_drive, 0.003)
-
-    root.after(5, tick)
-
-root.after(5, tick)
-
-# --- key bindings ---
-root.bind("<Left>",   lambda e: time_down())
-root.bind("<Right>",  lambda e: time_up())
-root.bind("<Down>",   lambda e: fb_down())
-root.bind("<Up>",     lambda e: fb_up())
-root.bind("<Escape>", lambda e: clear_delay())
-
-root.bind("[",        lambda e: vol_down())
-root.bind("]",        lambda e: vol_up())
-
-root.bind("t",        lambda e: tap_tempo())
-root.bind("T",        lambda e: tap_tempo())
-
-root.bind("2",        lambda e: toggle_x2_key())
-
-root.bind("s",        lambda e: siren1_toggle())
-root.bind("S",        lambda e: siren1_toggle())
-root.bind("x",        lambda e: siren1_stop())
-root.bind("X",        lambda e: siren1_stop())
-
-root.bind("a",        lambda e: air_toggle())
-root.bind("A",        lambda e: air_toggle())
-root.bind("z",        lambda e: air_stop())
-root.bind("Z",        lambda e: air_stop())
-
-root.bind("b",        lambda e: bens_toggle())
-root.bind("B",        lambda e: bens_toggle())
-root.bind("n",        lambda e: bens_stop())
-root.bind("N",        lambda e: bens_stop())
-
-root.mainloop()
+STATS_EVERY_MS = 500
+POLL_MS = 30  # how often changes made by other front ends are pulled into the sliders
+
+METRICS_SOCKET = "/tmp/tamburi-controller.sock"  # JSON stats per connect, None = off
+RECORD = None  # path of a control-event log (python -m tamburi.record info / play), None = off
+
+# extra engines fed from the same encode (tamburi.osc Route arguments), e.g. a backup rig:
+#   [{"host": "192.168.1.20", "port": 57120, "max_rate": 240}]
+ROUTES = []
+# send through the control hub (python -m tamburi.hub) instead of straight to sclang:
+# HUB = "/tmp/tamburi-hub.sock"
+HUB = None
+
+# lower the send rate / widen deadbands while scsynth is loaded (tamburi.feedback):
+# polls /status on SC_SERVER_PORT and pings the /tamburi/ping OSCdef on sclang
+# (second_test.scd); set to True with scsynth on SC_SERVER_PORT, False = fixed rate
+ADAPTIVE_RATE = False
+SC_SERVER_PORT = 57110
+
+# snapshots of every slider (tamburi.presets): F1..F8 recall, Shift+F<n> store,
+# Ctrl+F<n> morph there over MORPH_SECONDS; None = presets kept in memory only
+PRESETS_FILE = "~/.tamburi-presets.npz"
+
+TAP_HINTS = {"first": "tap…", "reset": "reset", "wait": "…"}
+
+
+def build_ui(root, siren, presets):
+    root.title("Delay + Vol + 3 Sirens (shared pitch/rate)")
+    root.focus_force()
+    root.option_add("*Font", "TkDefaultFont 10")
+
+    outer = tk.Frame(root, padx=8, pady=6)
+    outer.pack(fill="both", expand=True)
+
+    tk.Label(
+        outer,
+        text="←/→ delay  ↑/↓ fb  [/] vol  t tap  2 x2  s/x dub  a/z air  b/n bip  Esc clear  m metrics\n"
+             "F1..F8 preset  Shift+F store  Ctrl+F morph",
+        anchor="w",
+        justify="left"
+    ).pack(fill="x", pady=(0, 4))
+
+    tap_row = tk.Frame(outer)
+    tap_row.pack(fill="x", pady=(0, 4))
+
+    bpm_var = tk.StringVar(value="— bpm")
+    tap_hint_var = tk.StringVar(value="tap (t)")
+
+    tk.Label(tap_row, text="Tap:", width=4, anchor="w").pack(side="left")
+    tk.Label(tap_row, textvariable=tap_hint_var, width=12, anchor="w").pack(side="left", padx=(0, 8))
+    tk.Label(tap_row, text="BPM:", width=4, anchor="w").pack(side="left")
+    tk.Label(tap_row, textvariable=bpm_var, width=10, anchor="w").pack(side="left", padx=(0, 8))
+
+    preset_var = tk.StringVar(value="")
+    tk.Label(outer, textvariable=preset_var, anchor="w", justify="left").pack(fill="x", pady=(0, 4))
+
+    osc_stats_var = tk.StringVar(value="")
+    tk.Label(outer, textvariable=osc_stats_var, anchor="w", justify="left", fg="gray40").pack(fill="x", pady=(0, 4))
+
+    x2_var = tk.IntVar(value=0)
+    metrics_var = tk.IntVar(value=0)  # latency overlay, key m
+
+    knob = tk.Frame(outer)
+    knob.pack(fill="both", expand=True)
+
+    def update_bpm_display():
+        delay_time = siren.get("delay_time")
+        bpm = 60.0 / delay_time if delay_time > 1e-9 else 0.0
+        bpm_var.set(f"{bpm:5.1f} bpm")
+        tap_hint_var.set(f"{delay_time:0.3f}s {'x2' if siren.x2 else ''}".strip())
+
+    def make_scale(label, name, frm, to, from_=0.0, res=0.001):
+        def moved(v):
+            # a value we put there ourselves (engine -> slider) is not a new input
+            if name not in shown or abs(float(v) - shown[name]) > res:
+                siren.set(name, float(v))
+
+        sc = tk.Scale(
+            frm, from_=from_, to=to, resolution=res,
+            orient="horizontal", length=SLIDER_LEN,
+            sliderlength=SLIDER_HANDLE,
+            label=label, command=moved
+        )
+        sc.pack(fill="x", pady=(2, 0))
+        sc.set(siren.get(name))
+        sliders[name] = sc
+        return sc
+
+    # --- sliders (control name -> Scale) ---
+    sliders = {}
+    shown = {}  # control name -> last value the engine pushed into its slider
+    make_scale("Delay TIME (sec) [tap]  (x2 doubles/halves THIS value)", "delay_time", knob, TIME_MAX, from_=TIME_MIN)
+    make_scale("Feedback", "fb", knob, FB_MAX, from_=FB_MIN)
+    make_scale("Master Vol", "vol", knob, VOL_MAX, from_=VOL_MIN)
+    make_scale("PITCH (all): dub/ben 500..5000, air 200..2000", "pitch", knob, 1.0)
+    make_scale("RATE (all): dub 0.05..5, ben 0.5..12, air 0.05..1.5", "rate", knob, 1.0)
+
+    tk.Label(knob, text="Extras", anchor="w").pack(fill="x", pady=(6, 0))
+    make_scale("Dub Depth", "s1_depth", knob, 1.0)
+    make_scale("Air Depth", "air_depth", knob, 1.0)
+    make_scale("Ben Tone",  "bens_tone", knob, 1.0)
+    make_scale("Ben Drive", "bens_drive", knob, 1.0)
+
+    # --- engine changes (from here, keys, taps, other front ends) -> sliders ---
+    # watch() runs on whatever thread changed the value: hand it to Tk via a queue.
+    changes = queue.SimpleQueue()
+    siren.watch(lambda name, value: changes.put((name, value)))
+
+    def poll_changes():
+        latest = {}
+        while True:
+            try:
+                name, value = changes.get_nowait()
+            except queue.Empty:
+                break
+            latest[name] = value
+        for name, value in latest.items():
+            if name in sliders:
+                shown[name] = value
+                sliders[name].set(value)  # follows without sending it back
+        if "delay_time" in latest:
+            update_bpm_display()
+        if x2_var.get() != int(siren.x2):
+            x2_var.set(int(siren.x2))
+        root.after(POLL_MS, poll_changes)
+
+    root.after(POLL_MS, poll_changes)
+
+    # --- x2 that actually doubles/halves the delay slider ---
+    tk.Checkbutton(
+        tap_row,
+        text="x2",
+        variable=x2_var,
+        command=lambda: siren.set_x2(x2_var.get() == 1)
+    ).pack(side="left")
+    tk.Checkbutton(tap_row, text="metrics", variable=metrics_var).pack(side="left")
+
+    update_bpm_display()
+
+    # --- presets ---
+    def update_presets():
+        cells = []
+        morphing = presets.stats()["morphing"]
+        for i in range(len(presets)):
+            mark = ">" if morphing == i else " "
+            cells.append(f"{mark}F{i + 1} {presets.names[i] if presets.filled(i) else '—'}")
+        preset_var.set("  ".join(cells))
+
+    def preset_key(slot, how):
+        if how == "store":
+            presets.store(slot)
+        elif how == "morph":
+            presets.morph(slot, MORPH_SECONDS)
+            root.after(int(MORPH_SECONDS * 1000) + POLL_MS, update_presets)
+        else:
+            presets.recall(slot)
+        update_presets()
+
+    for i in range(len(presets)):
+        root.bind(f"<F{i + 1}>", lambda e, i=i: preset_key(i, "recall"))
+        root.bind(f"<Shift-F{i + 1}>", lambda e, i=i: preset_key(i, "store"))
+        root.bind(f"<Control-F{i + 1}>", lambda e, i=i: preset_key(i, "morph"))
+    update_presets()
+
+    def tap_tempo():
+        state = siren.tap()
+        if state in TAP_HINTS:
+            tap_hint_var.set(TAP_HINTS[state])
+
+    # --- stats line (just reads counters) ---
+    def fmt_latency(label, lat):
+        if not lat["n"]:
+            return f"{label} —"
+        return f"{label} p50 {lat['p50_ms']:0.2f} p95 {lat['p95_ms']:0.2f} p99 {lat['p99_ms']:0.2f} ms"
+
+    def update_osc_stats():
+        st = siren.stats()
+        osc, tick = st["osc"], st["tick"]
+        m, p = osc["messages"], osc["packets"]
+        ratio = m / p if p else 0.0
+        text = (
+            f"osc {'bundle' if siren.bundles else 'msg'} {'srv-glide' if siren.server_smoothing else 'client'}:"
+            f" {m} msgs / {osc['bundles']} bundles / {p} pkts  ({ratio:0.1f} msg/pkt)\n"
+            f"tick {tick['hz']:0.1f}/{tick['target_hz']:0.0f} Hz  jitter p50 {tick['jitter_p50_ms']:0.2f}"
+            f" p95 {tick['jitter_p95_ms']:0.2f} p99 {tick['jitter_p99_ms']:0.2f} ms  overruns {tick['overruns']}"
+            f"  {'idle' if tick['sleeping'] else 'run'} ({tick['sleeps']} sleeps)"
+        )
+        fb = st.get("feedback")
+        if fb is not None:
+            cpu = "—" if fb["avg_cpu"] is None else f"{fb['avg_cpu']:0.0f}/{fb['peak_cpu']:0.0f}%"
+            rtt = "—" if fb["rtt_ms"] is None else f"{fb['rtt_ms']:0.1f} ms"
+            text += f"\nserver cpu {cpu}  rtt {rtt}  rate x{fb['scale']:0.2f}  ({fb['reason']})"
+        if metrics_var.get():
+            lat, cnt, rate = st["latency"], st["latency"]["counters"], st["rate"]
+            text += (
+                f"\n{fmt_latency('input→udp', lat['set_latency'])}  |  {fmt_latency('toggle', lat['trigger_latency'])}"
+                f"\n{rate['msgs_per_s']:0.0f} msg/s {rate['bytes_per_s'] / 1024:0.1f} KiB/s  events {cnt['events']}"
+                f"  coalesced {cnt['coalesced']}  dedup {cnt['deduplicated']}  dropped {cnt['dropped']}"
+            )
+        osc_stats_var.set(text)
+        root.after(STATS_EVERY_MS, update_osc_stats)
+
+    root.after(STATS_EVERY_MS, update_osc_stats)
+
+    # --- key bindings (same map as the headless keyboard front end) ---
+    for key, action in KEYMAP.items():
+        fn = tap_tempo if action == "tap" else getattr(siren, action)
+        if len(key) > 1:
+            root.bind(f"<{key}>", lambda e, fn=fn: fn())
+        else:
+            root.bind(key, lambda e, fn=fn: fn())
+            if key.isalpha():
+                root.bind(key.upper(), lambda e, fn=fn: fn())
+    root.bind("m", lambda e: metrics_var.set(1 - metrics_var.get()))
+    root.bind("M", lambda e: metrics_var.set(1 - metrics_var.get()))
+
+
+def main():
+    siren = SirenController(HUB or SC_IP, routes=ROUTES).start()
+    if METRICS_SOCKET:
+        siren.serve_metrics(METRICS_SOCKET)
+    if RECORD:
+        siren.record(RECORD)
+    if ADAPTIVE_RATE:
+        siren.adapt(SC_IP, server_port=SC_SERVER_PORT, lang_port=SC_PORT)
+    presets = Presets(siren, PRESETS_FILE)
+    root = tk.Tk()
+    build_ui(root, siren, presets)
+    try:
+        root.mainloop()
+    finally:
+        siren.stop()
+
+
+if __name__ == "__main__":
+    main()
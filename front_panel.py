@@ -1,8 +1,32 @@
-from pynput import keyboard
-from pythonosc import udp_client
+import threading
+import time
 
-# Set up the OSC client
-client = udp_client.SimpleUDPClient("127.0.0.1", 4559)
+import numpy as np
+
+from tamburi.engine import Engine
+from tamburi.params import ParamTable
+
+SONIC_PI_IP = "127.0.0.1"
+SONIC_PI_PORT = 4559
+SEND_HZ = 120.0  # key presses are coalesced: at most one message per parameter per tick
+
+# True: every tick with changes sends ONE /osc/state [seq, flags, all 6 values]
+# (siren_1.rb :osc_state_listener, one sync); False: one /osc/<name> per change
+SNAPSHOT = True
+STATE_ADDR = "/osc/state"
+RECORD = None  # path of a control-event log (python -m tamburi.record), None = off
+ROUTES = []    # extra destinations for the same stream (tamburi.osc Route arguments)
+HUB = None     # "/tmp/tamburi-hub.sock": through python -m tamburi.hub (run it with --port 4559)
+
+# holding a key: one step on the press, then after HOLD_DELAY the value moves at
+# HOLD_RATE steps/s, speeding up by HOLD_ACCEL (x per held second) up to HOLD_MAX_RATE.
+# Keyboard auto-repeat is ignored: the rate comes from how long the key is held.
+HOLD_DELAY = 0.35
+HOLD_RATE = 6.0
+HOLD_ACCEL = 1.5
+HOLD_MAX_RATE = 40.0
+
+LOG_EVERY = 0.1  # seconds between console lines (latest value of what changed)
 
 # Initialize parameters
 params = {
@@ -24,59 +48,147 @@ steps = {
     "echo_decay": 0.1
 }
 
-# Function to send updated parameters via OSC
-def send_osc(parameter):
-    client.send_message(f"/osc/{parameter}", params[parameter])
-    print(f"Updated {parameter}: {params[parameter]}")
-
-# Key handling
-def on_press(key):
-    try:
-        if key.char == 'q':  # Increase pitch
-            params["pitch"] += steps["pitch"]
-            send_osc("pitch")
-        elif key.char == 'a':  # Decrease pitch
-            params["pitch"] -= steps["pitch"]
-            send_osc("pitch")
-        elif key.char == 'w':  # Increase rate
-            params["rate"] += steps["rate"]
-            send_osc("rate")
-        elif key.char == 's':  # Decrease rate
-            params["rate"] -= steps["rate"]
-            send_osc("rate")
-        elif key.char == 'e':  # Increase delay time
-            params["delay_time"] += steps["delay_time"]
-            send_osc("delay_time")
-        elif key.char == 'd':  # Decrease delay time
-            params["delay_time"] -= steps["delay_time"]
-            send_osc("delay_time")
-        elif key.char == 'r':  # Increase delay feedback
-            params["delay_feedback"] += steps["delay_feedback"]
-            send_osc("delay_feedback")
-        elif key.char == 'f':  # Decrease delay feedback
-            params["delay_feedback"] -= steps["delay_feedback"]
-            send_osc("delay_feedback")
-        elif key.char == 't':  # Increase echo phase
-            params["echo_phase"] += steps["echo_phase"]
-            send_osc("echo_phase")
-        elif key.char == 'g':  # Decrease echo phase
-            params["echo_phase"] -= steps["echo_phase"]
-            send_osc("echo_phase")
-        elif key.char == 'y':  # Increase echo decay
-            params["echo_decay"] += steps["echo_decay"]
-            send_osc("echo_decay")
-        elif key.char == 'h':  # Decrease echo decay
-            params["echo_decay"] -= steps["echo_decay"]
-            send_osc("echo_decay")
-    except AttributeError:
-        # Handle special keys if needed (e.g., arrow keys)
-        pass
-
-def on_release(key):
-    if key == keyboard.Key.esc:  # Stop listener on 'Escape'
-        return False
-
-# Start the keyboard listener
-with keyboard.Listener(on_press=on_press, on_release=on_release) as listener:
-    print("Listening for key presses. Press 'Esc' to exit.")
-    listener.join()
+# key -> (parameter, direction)
+KEYS = {
+    'q': ("pitch", +1),          'a': ("pitch", -1),
+    'w': ("rate", +1),           's': ("rate", -1),
+    'e': ("delay_time", +1),     'd': ("delay_time", -1),
+    'r': ("delay_feedback", +1), 'f': ("delay_feedback", -1),
+    't': ("echo_phase", +1),     'g': ("echo_phase", -1),
+    'y': ("echo_decay", +1),     'h': ("echo_decay", -1),
+}
+
+
+def sonicpi_params():
+    """One /osc/<name> row per parameter, unclamped and unsmoothed (Sonic Pi gets the raw value)."""
+    p = ParamTable()
+    for name, value in params.items():
+        p.add(f"/osc/{name}", value, lo=-np.inf, hi=np.inf, group=name)
+    return p
+
+
+def make_engine(host=SONIC_PI_IP, port=SONIC_PI_PORT, snapshot=SNAPSHOT, routes=ROUTES):
+    # plain messages, no bundles: siren_1.rb syncs on each address
+    return Engine(sonicpi_params(), host, port, hz=SEND_HZ, bundles=False, name="front-panel",
+                  snapshot=STATE_ADDR if snapshot else None, routes=routes)
+
+
+class KeyHold:
+    """Held keys as rates, applied on the engine's sender thread (Engine.on_tick)."""
+
+    def __init__(self, engine, steps, delay=HOLD_DELAY, rate=HOLD_RATE, accel=HOLD_ACCEL, max_rate=HOLD_MAX_RATE):
+        self.engine = engine
+        self.steps = steps
+        self.delay = delay
+        self.rate = rate
+        self.accel = accel
+        self.max_rate = max_rate
+        self.held = {}  # parameter -> (direction, press time)
+        self._lock = threading.Lock()
+        engine.on_tick(self.tick)
+
+    def press(self, name, direction):
+        """Key down (or an auto-repeat of it); returns the new value, None for a repeat."""
+        with self._lock:
+            if self.held.get(name, (0,))[0] == direction:
+                self.engine.metrics.count("key_repeats")
+                return None
+            self.held[name] = (direction, time.perf_counter())
+        self.engine.metrics.count("key_presses")
+        value = self.engine.nudge(name, direction * self.steps[name])
+        self.engine.ticker.wake()  # the hold needs ticks even once the step is sent
+        return value
+
+    def release(self, name, direction):
+        with self._lock:
+            if self.held.get(name, (0,))[0] == direction:
+                del self.held[name]
+
+    def tick(self, now, dt):
+        with self._lock:
+            held = list(self.held.items())
+        for name, (direction, t0) in held:
+            t = now - t0 - self.delay
+            if t > 0:
+                rate = min(self.rate * (1.0 + self.accel * t), self.max_rate)
+                self.engine.nudge(name, direction * self.steps[name] * rate * min(dt, t))
+        return bool(held)
+
+
+class AsyncLog:
+    """
+    "Updated <name>: <value>" lines off the input thread: watch() only stores the
+    latest value, a daemon thread prints what changed every LOG_EVERY seconds.
+    """
+
+    def __init__(self, engine, every=LOG_EVERY):
+        self.engine = engine
+        self.every = every
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        engine.watch(self.put)
+        self._thread = threading.Thread(target=self._run, name="panel-log", daemon=True)
+        self._thread.start()
+
+    def put(self, name, value):
+        with self._lock:
+            if name in self._latest:
+                self.engine.metrics.count("log_coalesced")
+            self._latest[name] = value
+
+    def _run(self):
+        while not self._stop.wait(self.every):
+            with self._lock:
+                latest, self._latest = self._latest, {}
+            for name, value in latest.items():
+                print(f"Updated {name}: {value:g}")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(1.0)
+
+
+def attach_keyboard(engine):
+    """pynput listener driving a KeyHold on the engine; returns the (not yet started) listener."""
+    from pynput import keyboard
+
+    hold = KeyHold(engine, steps)
+
+    # Key handling: no I/O and no waiting here, pynput delivers the next key right away
+    def on_press(key):
+        try:
+            name, direction = KEYS[key.char]
+        except (AttributeError, KeyError):
+            # Handle special keys if needed (e.g., arrow keys)
+            return
+        hold.press(name, direction)
+
+    def on_release(key):
+        if key == keyboard.Key.esc:  # Stop listener on 'Escape'
+            return False
+        try:
+            hold.release(*KEYS[key.char])
+        except (AttributeError, KeyError):
+            pass
+
+    return keyboard.Listener(on_press=on_press, on_release=on_release)
+
+
+def main():
+    engine = make_engine(HUB or SONIC_PI_IP).start()
+    engine.serve_metrics()  # /tmp/tamburi-front-panel.sock
+    if RECORD:
+        engine.record(RECORD)
+    log = AsyncLog(engine)
+    # Start the keyboard listener
+    with attach_keyboard(engine) as listener:
+        print("Listening for key presses. Press 'Esc' to exit.")
+        listener.join()
+    log.close()
+    engine.stop()
+    print(engine.metrics.counters)
+
+
+if __name__ == "__main__":
+    main()
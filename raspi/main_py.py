@@ -1,74 +1,97 @@
-from gpiozero import Button
-from pythonosc.udp_client import SimpleUDPClient
 from signal import pause
-import time
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tamburi.engine import Engine
+from tamburi.gpio import GpioPads
+from tamburi.gpio_bridge import GpioBridge
+from tamburi.params import ParamTable
 
 # === Mappa: GPIO -> campione (SuperCollider usa questi pin come chiavi) ===
 BUTTON_PINS = [17, 27, 22]  # stessi pin usati nei buffer SC
 
+# gli stessi file di main_sc.scd: con questa mappa ogni /play porta anche guadagno e onset
+# analizzati (tamburi.analysis, cache per hash del file) -> SC salta il silenzio iniziale
+# e i pad suonano allo stesso volume. None = /play <pin> e basta
+SAMPLE_FILES = {
+    17: "sounds/Jah Shaka - Jah Shaka answers - 01 1.wav",
+    27: "sounds/Jah Shaka - Jah Shaka answers - 02 2.wav",
+    22: "sounds/Jah Shaka - Jah Shaka answers - 03 3.wav",
+}
+
 # === Controlli ===
 PAUSE_PIN = 5   # pin fisico 29
 STOP_PIN  = 6   # pin fisico 31
 
+# banchi di sample (solo con ASYNC_BRIDGE, tamburi/banks.py): id -> {pin: file}. sclang li carica
+# in background (attivo + successivo), BANK_PIN passa al banco dopo senza fermare i pad,
+# i buffer dei banchi vecchi sono liberati quando nessun player li usa più. None = solo i buffer
+# letti da main_sc.scd al boot
+# BANKS = {
+#     0: SAMPLE_FILES,
+#     1: {17: "sounds/dub_a.wav", 27: "sounds/dub_b.wav", 22: "sounds/dub_c.wav"},
+# }
+BANKS = None
+BANK_PIN = 13   # pin fisico 33
+
 DEBOUNCE_SECONDS = 0.15
 
+# True: bridge asyncio (tamburi/gpio_bridge.py), /play in bundle con timetag = pressione + LATENCY,
+# main_sc.scd fa partire il campione al timetag -> latenza costante
+# False: vecchio percorso via Engine (messaggi semplici, partenza appena arrivano)
+ASYNC_BRIDGE = True
+LATENCY = 0.05
+
+# log di tutte le pressioni (python -m tamburi.record info / play), None = off
+RECORD = None
+
 # OSC verso sclang (gli OSCdef vivono su 57120)
-client = SimpleUDPClient("127.0.0.1", 57120)
-
-# Stato pausa per toggle
-is_paused = False
-last_press_time = {}
-
-def debounce_ok(pin):
-    now = time.time()
-    if now - last_press_time.get(pin, 0) < DEBOUNCE_SECONDS:
-        return False
-    last_press_time[pin] = now
-    return True
-
-def on_sample(pin):
-    if not debounce_ok(pin):
-        return
-    # invia /play con il numero del pin (SuperCollider userà ~bufs[pin])
-    client.send_message("/play", [pin])
-    print(f"▶️ PLAY request from GPIO {pin}")
-
-def on_pause():
-    global is_paused
-    if not debounce_ok(PAUSE_PIN):
-        return
-    if is_paused:
-        client.send_message("/resume", [])
-        is_paused = False
-        print("⏯️ RESUME")
-    else:
-        client.send_message("/pause", [])
-        is_paused = True
-        print("⏸️ PAUSE")
-
-def on_stop():
-    if not debounce_ok(STOP_PIN):
-        return
-    client.send_message("/stop", [])
-    print("⏹️ STOP")
-
-# --- Wiring: un capo del pulsante a GPIO, l’altro a GND (pull-up interna) ---
-buttons = []
-for pin in BUTTON_PINS:
-    btn = Button(pin, pull_up=True, bounce_time=DEBOUNCE_SECONDS)
-    btn.when_pressed = (lambda p: (lambda: on_sample(p)))(pin)
-    buttons.append(btn)
-    last_press_time[pin] = 0.0
-
-btn_pause = Button(PAUSE_PIN, pull_up=True, bounce_time=DEBOUNCE_SECONDS)
-btn_stop  = Button(STOP_PIN,  pull_up=True, bounce_time=DEBOUNCE_SECONDS)
-btn_pause.when_pressed = on_pause
-btn_stop.when_pressed  = on_stop
-last_press_time[PAUSE_PIN] = 0.0
-last_press_time[STOP_PIN]  = 0.0
-
-print("GPIO→OSC ready. Press buttons! Ctrl+C to quit.")
-try:
-    pause()
-except KeyboardInterrupt:
-    print("\nBye.")
+SC_IP = "127.0.0.1"
+SC_PORT = 57120
+# altre destinazioni con la stessa codifica (argomenti di tamburi.osc.Route), es. un rig di backup
+ROUTES = []
+# "/tmp/tamburi-hub.sock": passa dal control hub (python -m tamburi.hub) invece di andare diretto a sclang
+HUB = None
+
+
+def main_async():
+    bridge = GpioBridge(BUTTON_PINS, PAUSE_PIN, STOP_PIN, HUB or SC_IP, SC_PORT,
+                        latency=LATENCY, debounce=DEBOUNCE_SECONDS, routes=ROUTES, samples=SAMPLE_FILES,
+                        banks=BANKS, bank_pin=BANK_PIN if BANKS else None)
+    bridge.serve_metrics()  # /tmp/tamburi-gpio.sock: pressione -> UDP, margine sul timetag, scartate
+    if RECORD:
+        bridge.record(RECORD)
+    print(f"GPIO→OSC ready (asyncio, latenza {LATENCY * 1000:0.0f} ms). Press buttons! Ctrl+C to quit.")
+    try:
+        bridge.run()
+    except KeyboardInterrupt:
+        print("\nBye.")
+    finally:
+        bridge.close()
+        print(bridge.stats())
+
+
+def main():
+    if ASYNC_BRIDGE:
+        return main_async()
+    # solo trigger, nessun parametro continuo: il sender thread dorme sempre
+    # (tamburi/rig.py attacca gli stessi pulsanti al motore delle sirene, un solo processo)
+    engine = Engine(ParamTable(), HUB or SC_IP, SC_PORT, name="gpio", routes=ROUTES).start()
+    engine.serve_metrics()  # /tmp/tamburi-gpio.sock: latenza edge -> UDP, pressioni scartate
+    if RECORD:
+        engine.record(RECORD)
+    pads = GpioPads(engine, BUTTON_PINS, PAUSE_PIN, STOP_PIN, debounce=DEBOUNCE_SECONDS, samples=SAMPLE_FILES)
+
+    print("GPIO→OSC ready. Press buttons! Ctrl+C to quit.")
+    try:
+        pause()
+    except KeyboardInterrupt:
+        print("\nBye.")
+    finally:
+        pads.close()
+        engine.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,11 @@ from signal import pause
 import pygame
 import time
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tamburi.samples import SampleBank
+from tamburi.voices import VoicePool
 
 # --- Mappa GPIO -> file audio (puoi modificare i nomi/file) ---
 BUTTON_SOUNDS = {
@@ -22,24 +27,23 @@ DEBOUNCE_SECONDS = 0.15   # antirimbalzo software
 MIXER_FREQ = 44100        # 44.1 kHz
 MIXER_CHANNELS = 2        # stereo
 MIXER_BUFFER = 512        # buffer piccolo per latenza bassa
+MEMORY_BUDGET_MB = 64     # RAM per gli attacchi residenti (il resto è letto dal disco mentre suona)
+ATTACK_SECONDS = 1.0      # parte iniziale tenuta in RAM: il trigger resta immediato
+LOAD_WORKERS = os.cpu_count() or 1  # processi per decodificare i file non in cache (1 = in sequenza)
+TRIM_ONSET = True         # parte dal primo attacco, non dal frame 0 (salta il silenzio iniziale dei rip)
+NORMALIZE = True          # stesso volume percepito per tutti i pad (LUFS analizzati, cache per hash del file)
+
+# --- Voci ---
+POLYPHONY = 8             # voci contemporanee (il Pi regge molto di più: guarda "peak" nelle stats)
+STEAL_POLICY = "oldest"   # "oldest", "quietest" o "same-pad" (come prima: il pad riparte da capo)
+FADE_MS = 15              # fade-out della voce rubata / chokata, niente click
+CHOKE_GROUPS = {}         # pin -> gruppo: i pad dello stesso gruppo si tagliano, es. {17: "a", 27: "a"}
 
-# --- Init audio ---
-pygame.mixer.pre_init(frequency=MIXER_FREQ, size=-16, channels=MIXER_CHANNELS, buffer=MIXER_BUFFER)
-pygame.init()
-pygame.mixer.set_num_channels(len(BUTTON_SOUNDS))  # un canale per bottone
 is_paused = False  # stato pausa globale
+bank = None
+voices = None
 
-# Carica i suoni
-sounds = {}
-channels = {}
-for idx, (pin, fname) in enumerate(BUTTON_SOUNDS.items()):
-    if not os.path.exists(fname):
-        raise FileNotFoundError(f"File audio mancante: {fname}")
-    sounds[pin] = pygame.mixer.Sound(fname)
-    channels[pin] = pygame.mixer.Channel(idx)  # canale dedicato (consente sovrapposizione tra pulsanti)
-    channels[pin].set_volume(1.0)
-
-# --- Init GPIO (pull-up interna, attivo-basso verso GND) ---
+# --- GPIO (pull-up interna, attivo-basso verso GND) ---
 buttons = {}
 last_press_time = {}
 
@@ -61,14 +65,8 @@ def on_press(pin):
         is_paused = False
         print("⏯️ RESUME (tutti i canali)")
 
-    ch = channels[pin]
-    snd = sounds[pin]
-
-    # Per evitare overlap sullo STESSO canale, scommenta la riga sotto
-    # ch.stop()
-
-    ch.play(snd)
-    print(f"▶️ PLAY GPIO {pin} -> {os.path.basename(fname) if (fname:=snd) else 'audio'}")
+    voices.play(pin)
+    print(f"▶️ PLAY GPIO {pin} -> {os.path.basename(BUTTON_SOUNDS[pin])}")
 
 def on_pause_press():
     global is_paused
@@ -88,28 +86,68 @@ def on_stop_press():
     if not debounce_ok(STOP_PIN):
         return
     pygame.mixer.stop()
+    voices.stop_all()
     is_paused = False
     print("⏹️ STOP (tutti i canali)")
-
-# Pulsanti sample
-for pin in BUTTON_SOUNDS.keys():
-    btn = Button(pin, pull_up=True, bounce_time=DEBOUNCE_SECONDS)
-    btn.when_pressed = (lambda p: (lambda: on_press(p)))(pin)
-    buttons[pin] = btn
-    last_press_time[pin] = 0.0
-
-# Pulsanti pausa/stop
-btn_pause = Button(PAUSE_PIN, pull_up=True, bounce_time=DEBOUNCE_SECONDS)
-btn_stop  = Button(STOP_PIN,  pull_up=True, bounce_time=DEBOUNCE_SECONDS)
-btn_pause.when_pressed = on_pause_press
-btn_stop.when_pressed  = on_stop_press
-last_press_time[PAUSE_PIN] = 0.0
-last_press_time[STOP_PIN]  = 0.0
-
-print("Pronto!\n- 3 pulsanti: riproducono i sample\n- Pin fisico 29 (GPIO5): PAUSA/RIPRENDI\n- Pin fisico 31 (GPIO6): STOP\nCtrl+C per uscire.")
-try:
-    pause()  # resta in attesa di eventi
-except KeyboardInterrupt:
-    print("\nUscita.")
-finally:
-    pygame.quit()
+    print(f"   bank: {bank.stats()}")
+    print(f"   voci: {voices.stats()}")
+
+def on_sample_ready(pin, how, seconds):
+    # il pulsante si attiva appena il SUO sample è pronto, senza aspettare gli altri
+    buttons[pin].when_pressed = (lambda p: (lambda: on_press(p)))(pin)
+    print(f"  GPIO {pin}: {os.path.basename(BUTTON_SOUNDS[pin])} pronto ({how}, {seconds:0.2f} s)")
+
+def main():
+    global bank, voices
+
+    # --- Init audio ---
+    pygame.mixer.pre_init(frequency=MIXER_FREQ, size=-16, channels=MIXER_CHANNELS, buffer=MIXER_BUFFER)
+    pygame.init()
+
+    for fname in BUTTON_SOUNDS.values():
+        if not os.path.exists(fname):
+            raise FileNotFoundError(f"File audio mancante: {fname}")
+
+    # Pulsanti pausa/stop: subito attivi
+    btn_pause = Button(PAUSE_PIN, pull_up=True, bounce_time=DEBOUNCE_SECONDS)
+    btn_stop  = Button(STOP_PIN,  pull_up=True, bounce_time=DEBOUNCE_SECONDS)
+    btn_pause.when_pressed = on_pause_press
+    btn_stop.when_pressed  = on_stop_press
+    last_press_time[PAUSE_PIN] = 0.0
+    last_press_time[STOP_PIN]  = 0.0
+
+    # Pulsanti sample: creati ora, collegati da on_sample_ready
+    for pin in BUTTON_SOUNDS.keys():
+        buttons[pin] = Button(pin, pull_up=True, bounce_time=DEBOUNCE_SECONDS)
+        last_press_time[pin] = 0.0
+
+    # Carica i suoni: solo l'attacco resta in RAM (entro MEMORY_BUDGET_MB, LRU), il resto in streaming;
+    # i file non-WAV sono decodificati una volta sola (in parallelo) nella cache PCM (~/.cache/tamburi/pcm)
+    t_boot = time.perf_counter()
+    bank = SampleBank(BUTTON_SOUNDS, budget_bytes=MEMORY_BUDGET_MB << 20, attack=ATTACK_SECONDS,
+                      trim=TRIM_ONSET, normalize=NORMALIZE)
+    voices = VoicePool(bank, POLYPHONY, STEAL_POLICY, fade_ms=FADE_MS, choke=CHOKE_GROUPS)
+    bank.preload(workers=LOAD_WORKERS, on_ready=on_sample_ready)
+    t_boot = time.perf_counter() - t_boot
+    cold = bank.cache.misses > 0
+    last_cold = bank.cache.record_boot(t_boot)
+    print(f"Caricamento {'a freddo' if cold else 'a caldo'}: {t_boot:0.2f} s"
+          f" ({bank.cache.misses} decodificati con {LOAD_WORKERS} processi, {bank.cache.hits} dalla cache,"
+          f" decodifica {bank.cache.decode_seconds:0.2f} s in totale)"
+          + (f", l'ultimo a freddo era {last_cold:0.2f} s" if not cold and last_cold else ""))
+
+    print("Pronto!\n- 3 pulsanti: riproducono i sample\n- Pin fisico 29 (GPIO5): PAUSA/RIPRENDI\n- Pin fisico 31 (GPIO6): STOP\nCtrl+C per uscire.")
+    try:
+        pause()  # resta in attesa di eventi
+    except KeyboardInterrupt:
+        print("\nUscita.")
+    finally:
+        print(f"bank: {bank.stats()}")
+        print(f"voci: {voices.stats()}")
+        bank.close()
+        pygame.quit()
+
+
+# i processi di decodifica reimportano questo file: niente audio / GPIO fuori da main()
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,27 @@ set :delay_feedback, 0.5  # Delay feedback amount
 set :echo_phase, 0.25  # Echo phase in seconds
 set :echo_decay, 2     # Echo decay duration
 
+# front_panel.py SNAPSHOT = True: one /osc/state per change, one sync applies it
+#   [seq, flags, pitch, rate, delay_time, delay_feedback, echo_phase, echo_decay]
+# flags bit i = value i changed. After a lost packet (seq jumps) every value is
+# applied: each message carries the whole state.
+STATE_KEYS = [:pitch, :rate, :delay_time, :delay_feedback, :echo_phase, :echo_decay]
+set :osc_seq, 0
+set :osc_gaps, 0
+
+live_loop :osc_state_listener do
+  use_real_time
+  seq, flags, *values = sync "/osc/state"
+  last = get[:osc_seq]
+  resync = last != 0 && seq != last + 1
+  set :osc_gaps, get[:osc_gaps] + 1 if resync
+  STATE_KEYS.each_with_index do |key, i|
+    set key, values[i] if resync || flags[i] == 1
+  end
+  set :osc_seq, seq
+end
+
+# front_panel.py SNAPSHOT = False: one message per address, synced in this order
 # Live loop to listen for OSC messages
 live_loop :osc_listener do
   use_real_time
@@ -0,0 +1 @@
+"""Shared bits for the tamburi control scripts (controller, front panel, raspi bridges)."""
@@ -0,0 +1,229 @@
+"""
+Sample analysis index: where each sample really starts, how loud it is and the
+gain that levels it with the rest of the bank, computed once per file content.
+
+    index = SampleIndex()                         # ~/.cache/tamburi/analysis.json
+    a = index.get("raspi/sounds/x.wav")           # WAVs are read here
+    a = index.get(path, pcm, freq)                # or the PCM already decoded (int16, frames x channels)
+    a["onset"], a["gain"]                         # seconds to skip, linear gain to apply
+
+    python -m tamburi.analysis raspi/sounds/*.wav
+
+Per sample, all vectorized over the PCM:
+- onset: first frame within ONSET_DB of the peak (and above FLOOR_DB), minus
+  PREROLL, so the leading silence of a rip is skipped and the transient kept;
+- peak: sample peak, and the true peak from 4x oversampling around the highest
+  samples (what a DAC / resampler really reaches);
+- rms_db, and loudness in LUFS: K-weighted (the two BS.1770 biquads, run with
+  dsp.Biquad), 400 ms blocks with 75% overlap, absolute and relative gates;
+- gain: what brings the loudness to TARGET_LUFS, lowered so the true peak
+  stays under CEILING_DB.
+
+Entries are keyed by the SHA-1 of the file content (as in the PCM cache) and
+ANALYSIS_VERSION, so a replaced file is analysed again and an unchanged one
+never is; the index is one small JSON file.
+"""
+
+import json
+import math
+import os
+import time
+import wave
+
+import numpy as np
+
+from tamburi.dsp import KR, Biquad
+from tamburi.pcmcache import file_hash
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "tamburi", "analysis.json")
+ANALYSIS_VERSION = 1
+
+ONSET_DB = -36.0    # onset: first frame this close to the peak...
+FLOOR_DB = -60.0    # ...and above this absolute level (dBFS)
+PREROLL = 0.002     # seconds kept before the onset
+TARGET_LUFS = -16.0
+CEILING_DB = -1.0   # true peak after gain
+TRUE_PEAK_CANDIDATES = 32
+BLOCK_FRAMES = 4096  # K-weighting runs in pieces this long (multiple of KR)
+
+
+def db(x):
+    return 20.0 * math.log10(x) if x > 0 else -math.inf
+
+
+# --- BS.1770 K-weighting: high shelf + RLB high-pass, (b0, b1, b2, a1, a2) at any rate ---
+def k_shelf(sr, freq=1500.0, gain_db=4.0, q=1.0 / math.sqrt(2.0)):
+    a = 10.0 ** (gain_db / 40.0)
+    w0 = 2.0 * math.pi * freq / sr
+    cw, alpha = math.cos(w0), math.sin(w0) / (2.0 * q)
+    sa = 2.0 * math.sqrt(a) * alpha
+    a0 = (a + 1.0) - (a - 1.0) * cw + sa
+    return (a * ((a + 1.0) + (a - 1.0) * cw + sa) / a0, -2.0 * a * ((a - 1.0) + (a + 1.0) * cw) / a0,
+            a * ((a + 1.0) + (a - 1.0) * cw - sa) / a0, 2.0 * ((a - 1.0) - (a + 1.0) * cw) / a0,
+            ((a + 1.0) - (a - 1.0) * cw - sa) / a0)
+
+
+def k_highpass(sr, freq=38.0, q=0.5):
+    w0 = 2.0 * math.pi * freq / sr
+    cw, alpha = math.cos(w0), math.sin(w0) / (2.0 * q)
+    a0 = 1.0 + alpha
+    return (1.0 + cw) / 2.0 / a0, -(1.0 + cw) / a0, (1.0 + cw) / 2.0 / a0, -2.0 * cw / a0, (1.0 - alpha) / a0
+
+
+def loudness(x, sr):
+    """Integrated loudness (LUFS) of float frames x (n, channels), BS.1770 gating."""
+    n, ch = x.shape
+    shelf, hp = Biquad(k_shelf(sr), ch), Biquad(k_highpass(sr), ch)
+    step = int(0.1 * sr)  # 100 ms: 400 ms blocks overlap by 75%
+    energy = np.zeros(n // step + 1)  # sum over channels of squared K-weighted samples, per 100 ms
+    pad = np.zeros((KR, ch))
+    for o in range(0, n, BLOCK_FRAMES):
+        part = x[o:o + BLOCK_FRAMES]
+        m = len(part)
+        if m % KR:
+            part = np.concatenate((part, pad[:KR - m % KR]))
+        y = hp.process(shelf.process(part))[:m]
+        sq = np.einsum("ij,ij->i", y, y)
+        idx = (o + np.arange(m)) // step
+        energy += np.bincount(idx, sq, minlength=len(energy))[:len(energy)]
+    if n < 4 * step:  # shorter than one block: ungated
+        z = energy.sum() / max(n, 1)
+        return -0.691 + 10.0 * math.log10(z) if z > 0 else -math.inf
+    c = np.concatenate(([0.0], np.cumsum(energy[:n // step])))
+    z = (c[4:] - c[:-4]) / (4 * step)  # mean square of every 400 ms block
+    with np.errstate(divide="ignore"):
+        lk = -0.691 + 10.0 * np.log10(z)
+    z = z[lk > -70.0]
+    if not len(z):
+        return -math.inf
+    rel = -0.691 + 10.0 * math.log10(z.mean()) - 10.0
+    with np.errstate(divide="ignore"):
+        z = z[-0.691 + 10.0 * np.log10(z) > rel]
+    return -0.691 + 10.0 * math.log10(z.mean())
+
+
+def true_peak(x, peak_idx):
+    """Highest |value| of x (n, channels) 4x oversampled around frames `peak_idx`."""
+    taps = 16
+    # 4-phase windowed-sinc interpolator, taps per phase
+    t = np.arange(-taps // 2 + 1, taps // 2 + 1)[None, :] - np.arange(4)[:, None] / 4.0
+    kern = np.sinc(t) * np.kaiser(taps, 6.0)[None, :]
+    kern /= kern.sum(axis=1, keepdims=True)
+    xp = np.pad(x, ((taps, taps), (0, 0)))
+    win = np.lib.stride_tricks.sliding_window_view(xp, taps, axis=0)  # (n + taps + 1, ch, taps)
+    cand = np.clip(np.asarray(peak_idx), 0, len(x) - 1)
+    w = win[cand + taps // 2 + 1]  # windows centred on each candidate
+    return float(np.abs(w @ kern.T).max()) if len(cand) else 0.0
+
+
+def analyze(pcm, freq):
+    """Analysis of int16 (or float) PCM, (frames, channels)."""
+    x = pcm.astype(np.float64)
+    if pcm.dtype == np.int16:
+        x /= 32768.0
+    n = len(x)
+    env = np.abs(x).max(axis=1) if n else np.zeros(0)
+    peak = float(env.max()) if n else 0.0
+    thr = max(peak * 10.0 ** (ONSET_DB / 20.0), 10.0 ** (FLOOR_DB / 20.0))
+    above = env > thr
+    onset = max(int(np.argmax(above)) - int(PREROLL * freq), 0) if above.any() else 0
+
+    k = min(TRUE_PEAK_CANDIDATES, n)
+    tp = max(true_peak(x, np.argpartition(env, n - k)[n - k:]), peak) if k else 0.0
+    rms = float(np.sqrt(np.mean(np.square(x[onset:])))) if n > onset else 0.0
+    lufs = loudness(x[onset:], freq) if n > onset else -math.inf
+
+    gain_db = 0.0
+    if math.isfinite(lufs):
+        gain_db = min(TARGET_LUFS - lufs, CEILING_DB - db(tp))
+    return {
+        "seconds": n / freq,
+        "onset": onset / freq,
+        "peak": peak,
+        "peak_db": db(peak),
+        "true_peak_db": db(tp),
+        "rms_db": db(rms),
+        "loudness": lufs,
+        "gain_db": gain_db,
+        "gain": 10.0 ** (gain_db / 20.0),
+    }
+
+
+def read_wav(path):
+    """(int16 or float32 frames x channels, rate) of a PCM WAV (8/16/24/32-bit)."""
+    with wave.open(path, "rb") as w:
+        width, ch, freq = w.getsampwidth(), w.getnchannels(), w.getframerate()
+        raw = w.readframes(w.getnframes())
+    if width == 2:
+        return np.frombuffer(raw, np.int16).reshape(-1, ch), freq
+    if width == 1:
+        return ((np.frombuffer(raw, np.uint8).astype(np.float32) - 128.0) / 128.0).reshape(-1, ch), freq
+    if width == 3:
+        b = np.frombuffer(raw, np.uint8).reshape(-1, 3)
+        v = (b[:, 0].astype(np.int32) | (b[:, 1].astype(np.int32) << 8) | (b[:, 2].astype(np.int32) << 16))
+        v = np.where(v & 0x800000, v - 0x1000000, v)
+        return (v.astype(np.float32) / 8388608.0).reshape(-1, ch), freq
+    return (np.frombuffer(raw, np.int32).astype(np.float32) / 2147483648.0).reshape(-1, ch), freq
+
+
+class SampleIndex:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.analyze_seconds = 0.0
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            self.entries = data["entries"] if data.get("version") == ANALYSIS_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            self.entries = {}
+
+    def get(self, path, pcm=None, freq=None):
+        """Analysis of the file at `path`; pcm/freq: its decoded frames if at hand (else read as WAV)."""
+        digest = file_hash(path)
+        entry = self.entries.get(digest)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        t0 = time.perf_counter()
+        if pcm is None:
+            pcm, freq = read_wav(path)
+        entry = analyze(pcm, freq)
+        entry["file"] = os.path.basename(path)
+        self.analyze_seconds += time.perf_counter() - t0
+        self.entries[digest] = entry
+        self.save()
+        return entry
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": ANALYSIS_VERSION, "entries": self.entries}, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "analyze_seconds": self.analyze_seconds}
+
+
+def main():
+    import argparse
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("paths", nargs="+", help="WAV files")
+    ap.add_argument("--index", default=DEFAULT_PATH)
+    args = ap.parse_args()
+
+    index = SampleIndex(args.index)
+    for p in args.paths:
+        a = index.get(p)
+        print(f"{os.path.basename(p)}: onset {a['onset'] * 1000:0.1f} ms  peak {a['peak_db']:0.1f}"
+              f" / true {a['true_peak_db']:0.1f} dBFS  rms {a['rms_db']:0.1f} dBFS"
+              f"  {a['loudness']:0.1f} LUFS  gain {a['gain_db']:+0.1f} dB")
+    print(index.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Sample banks for the SuperCollider sampler (raspi/main_sc.scd), switched from
+the GPIO bridge without ever holding up a press.
+
+    banks = {0: {17: "sounds/a.wav", 27: "sounds/b.wav"}, 1: {17: "sounds/c.wav"}}
+    bridge = GpioBridge(PINS, banks=banks, bank_pin=13)   # bank_pin: next bank
+
+The bridge keeps the active bank and the next one resident in scsynth:
+- /bank/load <id> (<pin> <path> <amp> <start>)... asks sclang to Buffer.read a
+  whole bank in the background (scsynth's NRT thread); amp / start are the
+  analysed gain and onset (tamburi.analysis). sclang acks each buffer with
+  /bank/buffer <id> <pin> <frames> <channels> and the bank with /bank/loaded <id>;
+- /bank/switch <id> swaps sclang's pin -> buffer mapping in one assignment, only
+  for a loaded bank; /play keeps hitting the old mapping until then, so a press
+  during a change plays the old bank, never nothing (ack: /bank/active <id>);
+- /bank/free <id> retires a bank: sclang frees its buffers once no player is
+  still reading them (ack: /bank/freed <id>).
+A switch to a bank not loaded yet loads it first and swaps on its /bank/loaded.
+After each swap the bank after it is preloaded and every other one freed,
+sclang's own boot buffers (BOOT_BANK) included after the first swap.
+
+All of it runs on the bridge's event loop through one datagram endpoint (the
+acks come back to it); the press path only ever does its own sendto.
+Stats: state, load time and resident bytes (frames x channels x 4, scsynth's
+float32) per bank, plus loads / switches / frees / errors / timeouts.
+"""
+
+import asyncio
+import os
+import time
+
+from tamburi.osc import decode_packet, encode_message
+
+LOAD_TIMEOUT = 10.0  # seconds for a whole bank to load before it counts as failed
+BOOT_BANK = -1       # main_sc.scd's ~bufs, read at boot: active until our first switch
+
+# idle -> loading -> loaded -> active -> freeing -> idle; loading -> failed
+IDLE, LOADING, LOADED, ACTIVE, FREEING, FAILED = "idle", "loading", "loaded", "active", "freeing", "failed"
+
+
+class _Bank:
+    __slots__ = ("id", "load", "state", "t0", "load_s", "buffers", "errors")
+
+    def __init__(self, bank_id, load):
+        self.id = bank_id
+        self.load = load  # encoded /bank/load
+        self.state = IDLE
+        self.t0 = 0.0
+        self.load_s = None
+        self.buffers = {}  # pin -> bytes in scsynth
+        self.errors = 0
+
+
+class BankSwitcher(asyncio.DatagramProtocol):
+    def __init__(self, host, port, banks, play_args):
+        """
+        banks: id -> {pin: path} (paths as the bridge sees them; sent absolute).
+        play_args: id -> {pin: (pin, gain, onset)} (gpio_bridge.play_args per bank).
+        """
+        self.dest = (host, port)
+        self.order = list(banks)
+        self.banks = {}
+        for bank_id, files in banks.items():
+            args = [bank_id]
+            for pin, path in files.items():
+                _, gain, onset = play_args[bank_id].get(pin, (pin, 1.0, 0.0))
+                args += [pin, os.path.abspath(path), gain, onset]
+            self.banks[bank_id] = _Bank(bank_id, encode_message("/bank/load", args))
+        self.active = None
+        self.pending = None  # bank to switch to as soon as it is loaded
+        self.transport = None
+        self.loop = None
+        self.counters = {"loads": 0, "switches": 0, "frees": 0, "errors": 0, "timeouts": 0}
+
+    async def open(self):
+        self.loop = asyncio.get_running_loop()
+        await self.loop.create_datagram_endpoint(lambda: self, remote_addr=self.dest)
+        return self
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def _send(self, data):
+        if self.transport is not None:
+            self.transport.sendto(data)
+
+    # --- requests (event loop) ---
+    def preload(self, bank_id):
+        b = self.banks[bank_id]
+        if b.state in (IDLE, FAILED):
+            b.state, b.t0, b.load_s = LOADING, time.perf_counter(), None
+            b.buffers.clear()
+            self.counters["loads"] += 1
+            self._send(b.load)
+            self.loop.call_later(LOAD_TIMEOUT, self._timeout, b, b.t0)
+        elif b.state == FREEING:  # still resident: sclang takes it back off the retired list
+            b.state, b.t0 = LOADING, time.perf_counter()
+            self._send(b.load)
+
+    def switch(self, bank_id):
+        self.pending = bank_id
+        if self.banks[bank_id].state in (LOADED, ACTIVE):
+            self._send(encode_message("/bank/switch", [bank_id]))
+        else:
+            self.preload(bank_id)
+
+    def next(self):
+        """Switch to the bank after the active (or pending) one."""
+        cur = self.pending if self.pending is not None else self.active
+        i = self.order.index(cur) + 1 if cur in self.order else 0
+        self.switch(self.order[i % len(self.order)])
+
+    def _timeout(self, b, t0):
+        if b.state == LOADING and b.t0 == t0:
+            b.state = FAILED
+            self.counters["timeouts"] += 1
+
+    # --- acks ---
+    def datagram_received(self, data, addr):
+        try:
+            msgs = decode_packet(data)
+        except (ValueError, IndexError, UnicodeDecodeError):
+            return
+        for address, _, args, _ in msgs:
+            b = self.banks.get(args[0]) if args else None
+            if b is None:
+                continue
+            if address == "/bank/buffer":
+                _, pin, frames, channels = args
+                b.buffers[pin] = frames * channels * 4
+            elif address == "/bank/loaded":
+                if b.state in (LOADING, FAILED):  # a late ack still means loaded
+                    b.state = LOADED
+                    b.load_s = time.perf_counter() - b.t0
+                if self.pending == b.id:
+                    self._send(encode_message("/bank/switch", [b.id]))
+            elif address == "/bank/active":
+                self._activated(b)
+            elif address == "/bank/freed":
+                b.state = IDLE
+                b.buffers.clear()
+            elif address == "/bank/error":
+                b.errors += 1
+                self.counters["errors"] += 1
+
+    def _activated(self, b):
+        if self.active is None:
+            self._send(encode_message("/bank/free", [BOOT_BANK]))
+        elif self.active != b.id:
+            self.banks[self.active].state = LOADED
+        self.active = b.id
+        b.state = ACTIVE
+        if self.pending == b.id:
+            self.pending = None
+        self.counters["switches"] += 1
+        upcoming = self.order[(self.order.index(b.id) + 1) % len(self.order)]
+        for other in self.banks.values():
+            if other.id not in (b.id, upcoming) and other.state in (LOADED, LOADING):
+                other.state = FREEING
+                self.counters["frees"] += 1
+                self._send(encode_message("/bank/free", [other.id]))
+        if upcoming != b.id:
+            self.preload(upcoming)
+
+    def stats(self):
+        banks = {}
+        resident = 0
+        for b in self.banks.values():
+            size = sum(b.buffers.values())
+            if b.state != IDLE:
+                resident += size
+            banks[str(b.id)] = {"state": b.state, "load_ms": None if b.load_s is None else b.load_s * 1e3,
+                                "buffers": len(b.buffers), "bytes": size, "errors": b.errors}
+        return {"active": self.active, "pending": self.pending, "resident_bytes": resident,
+                "banks": banks, "counters": dict(self.counters)}
@@ -0,0 +1,280 @@
+"""
+Block-based NumPy building blocks for the offline renderer (tamburi/render.py).
+
+Audio is processed in blocks of a multiple of KR samples, the scsynth control
+period: control-rate signals are small arrays with one value per KR samples,
+audio-rate signals are (n,) or (n, channels) float64 arrays. Nothing here loops
+per sample in Python. The recursive filters run as a KR x KR impulse-response
+matrix product per sub-block plus a two-value state carried between
+sub-blocks, so a filter costs a handful of NumPy calls per block whatever its
+coefficients.
+
+Filter designs follow the SC UGens they stand in for (2nd-order Butterworth
+LPF / HPF, RBJ resonant RLPF, LeakDC), not bit-exactly.
+"""
+
+import math
+
+import numpy as np
+
+KR = 64  # scsynth's default block size: one control value per KR samples
+
+_IDX = np.subtract.outer(np.arange(KR), np.arange(KR))
+_IDX[_IDX < 0] = KR  # points at the zero appended to the impulse response
+
+
+# --- coefficient designs: (b0, b1, b2, a1, a2), a0 normalised to 1 ---
+def lpf(freq, sr):
+    k = math.tan(math.pi * min(freq, 0.49 * sr) / sr)
+    norm = 1.0 / (1.0 + math.sqrt(2.0) * k + k * k)
+    b0 = k * k * norm
+    return b0, 2.0 * b0, b0, 2.0 * (k * k - 1.0) * norm, (1.0 - math.sqrt(2.0) * k + k * k) * norm
+
+
+def hpf(freq, sr):
+    k = math.tan(math.pi * min(freq, 0.49 * sr) / sr)
+    norm = 1.0 / (1.0 + math.sqrt(2.0) * k + k * k)
+    return norm, -2.0 * norm, norm, 2.0 * (k * k - 1.0) * norm, (1.0 - math.sqrt(2.0) * k + k * k) * norm
+
+
+def rlpf(freq, rq, sr):
+    w0 = 2.0 * math.pi * min(freq, 0.49 * sr) / sr
+    cw = math.cos(w0)
+    alpha = math.sin(w0) * rq / 2.0
+    a0 = 1.0 + alpha
+    b0 = (1.0 - cw) / 2.0 / a0
+    return b0, 2.0 * b0, b0, -2.0 * cw / a0, (1.0 - alpha) / a0
+
+
+def leakdc(coef=0.995):
+    return 1.0, -1.0, 0.0, -coef, 0.0
+
+
+class Biquad:
+    """Direct-form biquad over (n, channels) blocks, n a multiple of KR."""
+
+    def __init__(self, coefs, channels=1):
+        self.x1 = np.zeros(channels)
+        self.x2 = np.zeros(channels)
+        self.y1 = np.zeros(channels)
+        self.y2 = np.zeros(channels)
+        self._coefs = None
+        self.set(coefs)
+
+    def set(self, coefs):
+        """New coefficients from the next block on (cheap if unchanged)."""
+        if coefs == self._coefs:
+            return
+        self._coefs = coefs
+        _, _, _, a1, a2 = coefs
+        # impulse response of the all-pole part; KR steps, only when the coefficients move
+        g = [1.0, -a1]
+        for _ in range(KR - 2):
+            g.append(-a1 * g[-1] - a2 * g[-2])
+        g = np.array(g + [0.0])
+        self._t = g[_IDX]
+        # response of a sub-block to y[-1] = 1 and to y[-2] = 1 (zero input)
+        v1 = -a1 * g[:KR] - a2 * np.concatenate(([0.0], g[:KR - 1]))
+        v2 = -a2 * g[:KR]
+        self._v = np.stack((v1, v2), axis=1)  # (KR, 2)
+        # state (y[-1], y[-2]) of the next sub-block = M @ state + zero-state tail
+        self._m = np.array([[v1[-1], v2[-1]], [v1[-2], v2[-2]]])
+        self._carry = {}
+
+    def _carry_mats(self, subs):
+        """
+        The state at the start of every sub-block (and after the last) as two
+        products: A @ tails + B @ initial state, A holding powers of M.
+        """
+        mats = self._carry.get(subs)
+        if mats is None:
+            m = self._m
+            pw = [np.eye(2)]
+            for _ in range(subs):
+                pw.append(m @ pw[-1])
+            a = np.zeros((subs + 1, 2, subs, 2))
+            for s in range(1, subs + 1):
+                for j in range(s):
+                    a[s, :, j, :] = pw[s - 1 - j]
+            mats = self._carry[subs] = (a.reshape(2 * subs + 2, 2 * subs), np.concatenate(pw))
+        return mats
+
+    def process(self, x):
+        b0, b1, b2, _, _ = self._coefs
+        n, ch = x.shape
+        subs = n // KR
+        xp = np.concatenate((self.x2[None], self.x1[None], x))
+        w = b0 * xp[2:] + b1 * xp[1:-1] + b2 * xp[:-2]
+        self.x2, self.x1 = xp[-2].copy(), xp[-1].copy()
+
+        # zero-state response of every sub-block in one product: (KR, KR) @ (KR, subs * ch)
+        zs = self._t @ w.reshape(subs, KR, ch).transpose(1, 0, 2).reshape(KR, subs * ch)
+        zs = zs.reshape(KR, subs, ch)
+        a, b = self._carry_mats(subs)
+        tails = zs[[-1, -2]].transpose(1, 0, 2).reshape(2 * subs, ch)
+        states = (a @ tails + b @ np.stack((self.y1, self.y2))).reshape(subs + 1, 2, ch)
+        self.y1, self.y2 = states[-1, 0], states[-1, 1]
+        y = zs + (self._v @ states[:-1].transpose(1, 0, 2).reshape(2, subs * ch)).reshape(KR, subs, ch)
+        return y.transpose(1, 0, 2).reshape(n, ch)
+
+
+class Limiter:
+    """
+    Look-ahead peak limiter (Limiter.ar stand-in): output is one block late,
+    gain ramps block to block and never lets a sample above `level`. One gain
+    for all channels (linked, so the stereo image does not shift); any
+    (frames, channels) block works without sizing anything up front.
+    """
+
+    def __init__(self, level=0.98):
+        self.level = level
+        self.prev = None
+        self.gain = 1.0
+
+    def process(self, x):
+        if self.prev is None:
+            self.prev = np.zeros_like(x)
+            self.prev_peak = 0.0
+        peak = float(np.max(np.abs(x))) if len(x) else 0.0
+        safe_prev = self.level / self.prev_peak if self.prev_peak > self.level else 1.0
+        safe_cur = self.level / peak if peak > self.level else 1.0
+        target = min(safe_prev, safe_cur)
+        ramp = np.linspace(self.gain, target, len(x), endpoint=False)
+        out = self.prev * np.minimum(ramp, safe_prev)[:, None]
+        self.gain = target
+        self.prev, self.prev_peak = x, peak
+        return out
+
+
+# --- control rate ---
+class Ramp:
+    """VarLag: glide from the current value to each new target over its lag time."""
+
+    def __init__(self, value, warp="lin"):
+        self.start = self.end = float(value)
+        self.t0 = 0.0
+        self.dur = 0.0
+        self.exp = warp == "exp"
+
+    def set(self, target, t, dur):
+        self.start = float(self.at(t))
+        self.end = float(target)
+        self.t0 = t
+        self.dur = dur
+
+    def at(self, t):
+        if self.dur <= 0.0:
+            return np.full_like(t, self.end, dtype=float) if np.ndim(t) else self.end
+        x = np.clip((np.asarray(t, dtype=float) - self.t0) / self.dur, 0.0, 1.0)
+        if self.exp and self.start > 0.0 and self.end > 0.0:
+            return self.start * (self.end / self.start) ** x
+        return self.start + (self.end - self.start) * x
+
+
+class Lag:
+    """Lag.kr: one-pole smoothing reaching -60 dB in `lag` seconds, per control step."""
+
+    def __init__(self, value, lag, sr):
+        self.y = float(value)
+        self.coef = math.exp(math.log(0.001) / (lag * sr / KR)) if lag > 0 else 0.0
+
+    def process(self, x):
+        c, y = self.coef, self.y
+        out = np.empty(len(x))
+        for i, v in enumerate(x.tolist()):
+            y = v + c * (y - v)
+            out[i] = y
+        self.y = y
+        return out
+
+
+class Phase:
+    """Phase accumulator in cycles, for kr LFOs (rate per control step) or ar oscillators."""
+
+    def __init__(self, phase=0.0):
+        self.phase = phase
+
+    def advance(self, inc):
+        """inc: cycles per step, array; returns the phase (0..1) at each step's start."""
+        ph = self.phase + np.cumsum(inc) - inc
+        self.phase = float(ph[-1] + inc[-1]) % 1.0
+        return ph % 1.0
+
+
+def varsaw(ph, width):
+    """VarSaw / LFTri shape: -1 -> 1 over `width` of the cycle, back down over the rest."""
+    return np.where(ph < width, 2.0 * ph / width - 1.0, 1.0 - 2.0 * (ph - width) / (1.0 - width))
+
+
+def lftri(ph):
+    """LFTri: starts at 0 going up, +1 at a quarter cycle."""
+    return 1.0 - 4.0 * np.abs(((ph + 0.75) % 1.0) - 0.5)
+
+
+def env_curve(y0, y1, x, curve):
+    """Env segment shape for x in 0..1 (SC's numeric `curve`, 0 = linear)."""
+    if abs(curve) < 1e-3:
+        return y0 + (y1 - y0) * x
+    return y0 + (y1 - y0) * (1.0 - np.exp(curve * x)) / (1.0 - math.exp(curve))
+
+
+class Asr:
+    """Env.asr gate envelope at audio rate; starts in the attack, release() on gate 0."""
+
+    def __init__(self, attack, release, sr, curve=-4.0):
+        self.attack_len = attack * sr
+        self.release_len = release * sr
+        self.curve = curve
+        self.stage = "attack"
+        self.start = 0.0
+        self.level = 0.0
+        self.pos = 0
+
+    def release(self):
+        if self.stage != "done":
+            self.stage, self.start, self.pos = "release", self.level, 0
+
+    @property
+    def done(self):
+        return self.stage == "done"
+
+    def process(self, n):
+        if self.stage == "sustain":
+            return np.ones(n)
+        if self.stage == "done":
+            return np.zeros(n)
+        dur = self.attack_len if self.stage == "attack" else self.release_len
+        x = np.minimum((self.pos + np.arange(1, n + 1)) / dur, 1.0)
+        out = env_curve(self.start, 1.0 if self.stage == "attack" else 0.0, x, self.curve)
+        self.pos += n
+        if self.pos >= dur:
+            self.stage = "sustain" if self.stage == "attack" else "done"
+        self.level = float(out[-1])
+        return out
+
+
+class Perc:
+    """Env.perc retriggered by a control-rate trigger (restarts from 0, SC ramps from the current level)."""
+
+    def __init__(self, attack, release, sr, curve=-4.0):
+        self.attack_len = attack * sr
+        self.release_len = release * sr
+        self.curve = curve
+        self.since = 1 << 30  # samples since the last trigger
+
+    def process(self, n, trig_steps):
+        idx = np.arange(n)
+        marks = np.full(n, -1)
+        marks[trig_steps * KR] = trig_steps * KR
+        last = np.maximum.accumulate(marks)
+        since = np.where(last >= 0, idx - last, self.since + idx)
+        self.since = int(since[-1]) + 1
+        up = env_curve(0.0, 1.0, np.minimum(since / self.attack_len, 1.0), self.curve)
+        down = env_curve(1.0, 0.0, np.clip((since - self.attack_len) / self.release_len, 0.0, 1.0), self.curve)
+        return np.where(since < self.attack_len, up, down)
+
+
+def xfade2(a, b, pan):
+    """XFade2 equal-power crossfade, pan -1 (a) .. 1 (b)."""
+    x = (pan + 1.0) * (math.pi / 4.0)
+    return a * np.cos(x) + b * np.sin(x)
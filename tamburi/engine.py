@@ -0,0 +1,231 @@
+"""
+Headless control engine: parameter table + pre-encoded OSC sender + send thread.
+
+No UI in here. Front ends (the Tk window, the pynput keyboard, GPIO buttons)
+only call set() / nudge() / trigger() and, if they show values, watch() for
+changes made by the others. Everything they write lands in the ParamTable;
+the Ticker thread smooths it and sends what changed.
+"""
+
+import time
+
+from tamburi.feedback import ServerFeedback
+from tamburi.metrics import Metrics, RateMeter, serve_unix
+from tamburi.osc import OscSender
+from tamburi.record import SET, Recorder
+from tamburi.ticker import Ticker
+
+
+class Engine:
+    def __init__(self, params, host, port, hz=120.0, bundles=True, idle_sleep=True,
+                 server_smoothing=False, glide_per_tau=3.0, name="engine", snapshot=None, routes=None):
+        """
+        params: a filled ParamTable. bundles: one datagram per tick instead of one
+        per parameter. idle_sleep: sleep once converged (see Ticker). server_smoothing:
+        send targets + glide time and let the SynthDef lags glide. snapshot: an address
+        (e.g. "/osc/state"): each tick with changes sends ONE message there instead,
+        [seq, changed-rows bitmask, value of every row in table order]. routes: extra
+        destinations for the same stream (OscSender routes).
+        """
+        self.params = params
+        self.osc = OscSender(host, port, routes, name=name)
+        self.bundles = bundles
+        self.server_smoothing = server_smoothing
+
+        params.smoothing = not server_smoothing
+        self._glides = (params.tau * glide_per_tau).tolist()
+        # pre-encoded message per row (value, or value + glide)
+        self._msgs = [self.osc.message(a, "ff" if server_smoothing else "f") for a in params.addrs]
+        self._pending = []  # (Message, args) changed in the current tick
+        self._state = None
+        self._seq = 0
+        if snapshot:
+            if params.n > 31:
+                raise ValueError(f"snapshot mode carries at most 31 rows (int32 flags), table has {params.n}")
+            self._state = self.osc.message(snapshot, "ii" + "f" * params.n)
+        self._watchers = []
+        self.name = name
+        self.metrics = Metrics(params.n)
+        self._rate = RateMeter()
+        self._metrics_sock = None
+        self.recorder = None
+        self.feedback = None
+        self._tick_hooks = []
+        self._busy = False
+
+        self._idle_sleep = idle_sleep
+        self.ticker = Ticker(hz, self._tick, name=name, idle=self._idle if idle_sleep else None)
+        params.on_set = self.ticker.wake
+
+    def start(self):
+        self.ticker.start()
+        return self
+
+    def stop(self):
+        if self.feedback is not None:
+            self.feedback.close()
+        self.ticker.stop()
+        if self._metrics_sock is not None:
+            self._metrics_sock.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def serve_metrics(self, path=None):
+        """JSON stats on a UNIX socket (default /tmp/tamburi-<name>.sock); returns the path."""
+        path = path or f"/tmp/tamburi-{self.name}.sock"
+        self._metrics_sock = serve_unix(path, self.stats)
+        return path
+
+    def record(self, path):
+        """Log every set() / trigger() / note() to `path` (tamburi.record format) until stop()."""
+        self.recorder = Recorder(path, self.name)
+        return self.recorder
+
+    def adapt(self, host, **kw):
+        """
+        Follow scsynth's load (tamburi.feedback): poll /status and ping sclang on
+        `host`, lower the send rate and widen deadbands under pressure. Until stop().
+        """
+        self.feedback = ServerFeedback(self, host, **kw).start()
+        return self.feedback
+
+    # --- front-end API (any thread) ---
+    def watch(self, fn):
+        """fn(name, value) after every set(), on the thread that called set()."""
+        self._watchers.append(fn)
+
+    def set(self, name, value, t_ns=None):
+        """
+        Set a control target (clamped by the table); returns the stored value.
+        t_ns: perf_counter_ns() of the input event if the front end took it earlier.
+        """
+        t_ns = t_ns or time.perf_counter_ns()
+        self.metrics.on_set(self.params.groups[name], t_ns)
+        self.params.set(name, value)
+        value = self.params.get(name)
+        if self.recorder is not None:
+            self.recorder.add(SET, name, value, t_ns)
+        for fn in self._watchers:
+            fn(name, value)
+        return value
+
+    def load(self, targets, t_ns=None):
+        """
+        Write all targets at once (one value per table row, control units): watchers
+        and the recorder see one set per control that moved. Returns the rows changed.
+        """
+        t_ns = t_ns or time.perf_counter_ns()
+        rows = self.params.load(targets)
+        if len(rows):
+            self.metrics.on_set(rows, t_ns)
+            for name in self.params.controls_of(rows):
+                value = self.params.get(name)
+                if self.recorder is not None:
+                    self.recorder.add(SET, name, value, t_ns)
+                for fn in self._watchers:
+                    fn(name, value)
+        return rows
+
+    def on_tick(self, fn):
+        """
+        fn(now, dt) on the sender thread at the start of every tick, for inputs that
+        move values over time (a held key). While any fn returns True the ticker
+        does not idle-sleep.
+        """
+        self._tick_hooks.append(fn)
+        self.ticker.wake()
+
+    def get(self, name):
+        return self.params.get(name)
+
+    def nudge(self, name, delta, t_ns=None):
+        return self.set(name, self.get(name) + delta, t_ns)
+
+    def set_at(self, name, value, when, t_ns=None):
+        """
+        Set a control so it lands at Unix time `when`: its rows go out now as one
+        bundle timetagged `when` (glide left to the SynthDef) and the table jumps
+        there without streaming a glide of its own. when None, or a snapshot
+        engine: plain set().
+        """
+        if when is None or self._state is not None:
+            return self.set(name, value, t_ns)
+        t_ns = t_ns or time.perf_counter_ns()
+        rows, vals = self.params.jump(name, value)
+        parts = [(self._msgs[i], (v, self._glides[i]) if self.server_smoothing else (v,))
+                 for i, v in zip(rows.tolist(), vals.tolist())]
+        self.osc.send_bundle(parts, when=when)
+        value = self.params.get(name)
+        if self.recorder is not None:
+            self.recorder.add(SET, name, value, t_ns)
+        for fn in self._watchers:
+            fn(name, value)
+        return value
+
+    def trigger(self, addr, *args, t_ns=None, when=None):
+        """
+        One-shot message (toggles, clear, /play ...), its own datagram right now.
+        when: Unix time for the receiver to act on it (a timetagged bundle).
+        """
+        t0 = t_ns or time.perf_counter_ns()
+        self.osc.send_message(addr, list(args), when)
+        self.metrics.on_trigger(t0, time.perf_counter_ns())
+        if self.recorder is not None:
+            self.recorder.add_trigger(addr, args, t0)
+
+    def note(self, kind, name, value=0.0):
+        """Record a gesture that is not itself a set / trigger (a tap); no-op when not recording."""
+        if self.recorder is not None:
+            self.recorder.add(kind, name, value)
+
+    def stats(self):
+        osc = self.osc.stats()
+        st = {
+            "osc": osc,
+            "rate": self._rate.update(osc),
+            "tick": self.ticker.stats(),
+            "latency": self.metrics.snapshot(),
+        }
+        if self.recorder is not None:
+            st["record"] = self.recorder.stats()
+        if self.feedback is not None:
+            st["feedback"] = self.feedback.stats()
+        return st
+
+    # --- sender thread ---
+    def _tick(self, now, dt):
+        busy = False
+        for fn in self._tick_hooks:
+            busy = fn(now, dt) or busy
+        self._busy = busy
+
+        changed, values = self.params.step(dt)
+        msgs = self._msgs
+        pending = self._pending
+        if self._state is not None:
+            if len(changed):
+                self._seq = (self._seq + 1) & 0x7FFFFFFF
+                flags = sum(1 << i for i in changed.tolist())
+                self._state.send(self._seq, flags, *self.params.last.tolist())
+        else:
+            for i, val in zip(changed.tolist(), values.tolist()):
+                args = (val, self._glides[i]) if self.server_smoothing else (val,)
+                if self.bundles:
+                    pending.append((msgs[i], args))
+                else:
+                    msgs[i].send(*args)
+
+        if pending:
+            self.osc.send_bundle(pending)
+            pending.clear()
+        if len(changed):
+            self.metrics.on_sent(changed, time.perf_counter_ns())
+        elif not self._idle_sleep and self.metrics.pending_ns.any():
+            self._idle()  # fixed-rate mode: still settle inputs that never needed a send
+
+    def _idle(self):
+        if not self._busy and self.params.converged():
+            self.metrics.on_idle()
+            return True
+        return False
+
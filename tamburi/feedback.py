@@ -0,0 +1,187 @@
+"""
+Server load feedback: polls scsynth's /status and pings sclang, and scales an
+Engine's send rate and deadbands down while the server is under pressure.
+
+    siren.adapt("127.0.0.1")            # scsynth on 57110, sclang on 57120
+    siren.stats()["feedback"]           # state, last readings, why it throttled
+
+Every POLL seconds one socket sends /status to scsynth (-> /status.reply with
+average and peak CPU) and /tamburi/ping <seq> to sclang, whose OSCdef answers
+/tamburi/pong <seq> (effettiera/second_test.scd); the round trip is timed here
+against the send time of that seq, so it includes sclang's own scheduling.
+
+The loop is AIMD on a `scale` in MIN_SCALE..1:
+- average CPU >= AVG_CPU_HI, peak CPU >= PEAK_CPU_HI or round trip >= RTT_HI_MS:
+  scale *= DOWN (at most once per poll);
+- average CPU < AVG_CPU_LO and round trip < RTT_HI_MS / 2: scale += UP;
+- in between, or with no reply for STALE seconds: hold.
+The engine then ticks at base_hz * scale and every deadband is base_eps / scale,
+so under pressure fewer ticks send and small moves are dropped; the glides keep
+their length (the table smooths with the measured dt). Each change of scale is
+kept in `events` with the readings that caused it.
+"""
+
+import socket
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from tamburi.osc import decode_packet, encode_message
+
+SERVER_PORT = 57110
+LANG_PORT = 57120
+POLL = 0.25
+STALE = 1.5
+
+AVG_CPU_HI = 60.0
+AVG_CPU_LO = 40.0
+PEAK_CPU_HI = 85.0
+RTT_HI_MS = 25.0
+
+MIN_SCALE = 0.25
+DOWN = 0.7
+UP = 0.05
+
+_STATUS = encode_message("/status", [])
+
+
+class ServerFeedback:
+    def __init__(self, engine, host="127.0.0.1", server_port=SERVER_PORT, lang_port=LANG_PORT, poll=POLL):
+        self.engine = engine
+        self.server = (host, server_port)
+        self.lang = (host, lang_port)
+        self.poll = poll
+        self.base_hz = 1.0 / engine.ticker.period
+        self.base_eps = engine.params.eps.copy()
+        self.scale = 1.0
+        self.reason = "ok"
+
+        self.avg_cpu = None
+        self.peak_cpu = None
+        self.rtt_ms = None
+        self._status_t = 0.0
+        self._pong_t = 0.0
+        self._seq = 0
+        self._pings = {}  # seq -> perf_counter() at send
+        self.events = deque(maxlen=32)
+        self.counters = {"polls": 0, "status_replies": 0, "pongs": 0, "throttles": 0, "recoveries": 0}
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("0.0.0.0", 0))
+        self.sock.settimeout(0.05)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="server-feedback", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(1.0)
+        self.sock.close()
+        self._apply(1.0)
+
+    # --- feedback thread ---
+    def _run(self):
+        next_poll = time.perf_counter()
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            if now >= next_poll:
+                self._send_polls(now)
+                self._adjust(now)
+                next_poll += self.poll
+                if next_poll < now:
+                    next_poll = now + self.poll
+            try:
+                data = self.sock.recv(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._stop.is_set():
+                    return
+                time.sleep(self.poll)  # e.g. ICMP refused while scsynth is down
+                continue
+            try:
+                msgs = decode_packet(data)
+            except (ValueError, IndexError, UnicodeDecodeError):
+                continue
+            for address, _, args, _ in msgs:
+                self._on_reply(address, args, time.perf_counter())
+
+    def _send_polls(self, now):
+        self.counters["polls"] += 1
+        self._seq = (self._seq + 1) & 0x7FFFFFFF
+        self._pings[self._seq] = now
+        if len(self._pings) > 64:
+            self._pings.pop(next(iter(self._pings)))
+        for data, dest in ((_STATUS, self.server), (encode_message("/tamburi/ping", [self._seq]), self.lang)):
+            try:
+                self.sock.sendto(data, dest)
+            except OSError:
+                pass
+
+    def _on_reply(self, address, args, now):
+        if address == "/status.reply" and len(args) >= 7:
+            # [1, ugens, synths, groups, synthdefs, avg cpu %, peak cpu %, nominal sr, actual sr]
+            self.avg_cpu, self.peak_cpu = float(args[5]), float(args[6])
+            self._status_t = now
+            self.counters["status_replies"] += 1
+        elif address == "/tamburi/pong" and args:
+            sent = self._pings.pop(args[0], None)
+            if sent is not None:
+                self.rtt_ms = (now - sent) * 1e3
+                self._pong_t = now
+                self.counters["pongs"] += 1
+
+    def _adjust(self, now):
+        cpu_fresh = now - self._status_t < STALE
+        rtt_fresh = now - self._pong_t < STALE
+        if not cpu_fresh and not rtt_fresh:
+            self.reason = "no reply"
+            return
+        hot = []
+        if cpu_fresh and self.avg_cpu >= AVG_CPU_HI:
+            hot.append(f"avg cpu {self.avg_cpu:.0f}%")
+        if cpu_fresh and self.peak_cpu >= PEAK_CPU_HI:
+            hot.append(f"peak cpu {self.peak_cpu:.0f}%")
+        if rtt_fresh and self.rtt_ms >= RTT_HI_MS:
+            hot.append(f"rtt {self.rtt_ms:.1f} ms")
+        if hot:
+            self.reason = ", ".join(hot)
+            if self.scale > MIN_SCALE:
+                self.counters["throttles"] += 1
+                self._apply(max(MIN_SCALE, self.scale * DOWN), now)
+            return
+        calm = (not cpu_fresh or self.avg_cpu < AVG_CPU_LO) and (not rtt_fresh or self.rtt_ms < RTT_HI_MS / 2)
+        if not calm:
+            self.reason = "hold"
+            return
+        self.reason = "ok"
+        if self.scale < 1.0:
+            self.counters["recoveries"] += 1
+            self._apply(min(1.0, self.scale + UP), now)
+
+    def _apply(self, scale, now=None):
+        self.scale = scale
+        self.engine.ticker.set_rate(self.base_hz * scale)
+        np.divide(self.base_eps, scale, out=self.engine.params.eps)
+        if now is not None:
+            self.events.append({"t": time.time(), "scale": round(scale, 3), "hz": round(self.base_hz * scale, 1),
+                                "reason": self.reason, "avg_cpu": self.avg_cpu, "peak_cpu": self.peak_cpu,
+                                "rtt_ms": self.rtt_ms})
+
+    def stats(self):
+        return {
+            "scale": self.scale,
+            "hz": self.base_hz * self.scale,
+            "reason": self.reason,
+            "avg_cpu": self.avg_cpu,
+            "peak_cpu": self.peak_cpu,
+            "rtt_ms": self.rtt_ms,
+            "counters": dict(self.counters),
+            "events": list(self.events)[-8:],
+        }
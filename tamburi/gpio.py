@@ -0,0 +1,83 @@
+"""
+GPIO front end: sample pads -> /play <pin>, a pause/resume toggle and a stop
+button, sent through an Engine (raspi/main_sc.scd listens on sclang 57120).
+With samples={pin: path}: /play <pin> <gain> <onset> from the analysis index
+(see tamburi.gpio_bridge.play_args).
+
+Wiring: one side of the button to the GPIO, the other to GND (internal pull-up).
+"""
+
+import time
+
+from gpiozero import Button
+
+from tamburi.gpio_bridge import play_args
+
+DEBOUNCE_SECONDS = 0.15
+
+
+class GpioPads:
+    def __init__(self, engine, pins, pause_pin=None, stop_pin=None,
+                 debounce=DEBOUNCE_SECONDS, pin_factory=None, samples=None, index=None):
+        self.engine = engine
+        analysed = play_args(samples, index)
+        self._play_args = {p: analysed.get(p, (p, 1.0, 0.0) if samples else (p,)) for p in pins}
+        self.debounce = debounce
+        self.is_paused = False
+        self.last_press_time = {}
+        self.buttons = []
+
+        for pin in pins:
+            self._button(pin, (lambda p: (lambda: self.on_sample(p)))(pin), pin_factory)
+        if pause_pin is not None:
+            self.pause_pin = pause_pin
+            self._button(pause_pin, self.on_pause, pin_factory)
+        if stop_pin is not None:
+            self.stop_pin = stop_pin
+            self._button(stop_pin, self.on_stop, pin_factory)
+
+    def _button(self, pin, fn, pin_factory):
+        btn = Button(pin, pull_up=True, bounce_time=self.debounce, pin_factory=pin_factory)
+        btn.when_pressed = fn
+        self.buttons.append(btn)
+        self.last_press_time[pin] = 0.0
+
+    def debounce_ok(self, pin):
+        now = time.time()
+        if now - self.last_press_time.get(pin, 0) < self.debounce:
+            self.engine.metrics.count("dropped")
+            return False
+        self.last_press_time[pin] = now
+        return True
+
+    def on_sample(self, pin):
+        t = time.perf_counter_ns()  # edge seen: latency is measured from here
+        if not self.debounce_ok(pin):
+            return
+        # /play con il numero del pin (SuperCollider userà ~bufs[pin])
+        self.engine.trigger("/play", *self._play_args[pin], t_ns=t)
+        print(f"▶️ PLAY request from GPIO {pin}")
+
+    def on_pause(self):
+        t = time.perf_counter_ns()
+        if not self.debounce_ok(self.pause_pin):
+            return
+        if self.is_paused:
+            self.engine.trigger("/resume", t_ns=t)
+            self.is_paused = False
+            print("⏯️ RESUME")
+        else:
+            self.engine.trigger("/pause", t_ns=t)
+            self.is_paused = True
+            print("⏸️ PAUSE")
+
+    def on_stop(self):
+        t = time.perf_counter_ns()
+        if not self.debounce_ok(self.stop_pin):
+            return
+        self.engine.trigger("/stop", t_ns=t)
+        print("⏹️ STOP")
+
+    def close(self):
+        for btn in self.buttons:
+            btn.close()
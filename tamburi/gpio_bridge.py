@@ -0,0 +1,239 @@
+"""
+asyncio GPIO -> OSC bridge for the sampler rig (raspi/main_sc.scd): pads send
+/play <pin>, plus a pause/resume toggle and a stop button.
+
+The gpiozero callbacks only take time.monotonic_ns() and hand (pin, t) to the
+event loop. One sender task debounces on that monotonic stamp and sends each
+press as an OSC bundle timetagged press time + `latency`; main_sc.scd schedules
+the synth at the timetag, so a sample starts a constant `latency` after the
+physical press, whatever the Python, UDP and sclang jitter below that.
+Printing happens in its own task, batched, never between edge and send.
+
+    bridge = GpioBridge([17, 27, 22], pause_pin=5, stop_pin=6, latency=0.05)
+    bridge.run()                    # blocks; or start() / close() for a thread
+
+With samples={pin: wav path} (the files main_sc.scd loads) every /play also
+carries the sample's analysed gain and onset (tamburi.analysis, cached by file
+hash): /play <pin> <amp> <start seconds>, so scsynth skips the leading silence
+and plays every pad at the same loudness.
+
+With banks={id: {pin: path}} (tamburi.banks) sclang loads whole banks in the
+background and bank_pin steps to the next one; gain and onset then travel with
+each bank's load request and /play is just /play <pin> against whichever bank
+is active when it arrives.
+
+    # tests / bench: no hardware
+    from gpiozero.pins.mock import MockFactory
+    factory = MockFactory()
+    bridge = GpioBridge([17], pin_factory=factory, host="127.0.0.1", port=9000).start()
+    factory.pin(17).drive_low(); factory.pin(17).drive_high()
+
+Stats (JSON on /tmp/tamburi-gpio.sock with serve_metrics()): edge -> sendto
+latency, the slack left before the timetag (negative = late, counted), presses,
+debounced drops.
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+from gpiozero import Button
+
+from tamburi.analysis import SampleIndex
+from tamburi.banks import BankSwitcher
+from tamburi.metrics import LatencyRing, serve_unix
+from tamburi.osc import OscSender
+from tamburi.record import Recorder
+
+LATENCY = 0.05          # seconds from press to sound, constant; > the worst edge -> sclang path
+DEBOUNCE_SECONDS = 0.15
+LOG_EVERY = 0.2
+
+
+def play_args(samples, index=None):
+    """pin -> /play args (pin,) or, with samples (pin -> path), (pin, gain, onset seconds) from the index."""
+    if not samples:
+        return {}
+    index = index or SampleIndex()
+    out = {}
+    for pin, path in samples.items():
+        if not os.path.exists(path):  # sclang warns "No buffer" for it anyway
+            continue
+        a = index.get(path)
+        out[pin] = (pin, a["gain"], a["onset"])
+    return out
+
+
+class GpioBridge:
+    def __init__(self, pins, pause_pin=None, stop_pin=None, host="127.0.0.1", port=57120,
+                 latency=LATENCY, debounce=DEBOUNCE_SECONDS, pin_factory=None, verbose=True, routes=None,
+                 samples=None, index=None, banks=None, bank_pin=None):
+        self.pins = list(pins)
+        self.pause_pin = pause_pin
+        self.stop_pin = stop_pin
+        self.bank_pin = bank_pin
+        self.latency = latency
+        self.debounce_ns = int(debounce * 1e9)
+        self.verbose = verbose
+        self.osc = OscSender(host, port, routes, name="gpio")
+        if banks:
+            samples = None  # gain / onset go with each bank
+            index = index or SampleIndex()
+            bank_host = "127.0.0.1" if host.startswith("/") else host  # acks need UDP, not the hub
+            self.banks = BankSwitcher(bank_host, port, banks, {b: play_args(f, index) for b, f in banks.items()})
+        else:
+            self.banks = None
+        self._play = self.osc.message("/play", "iff" if samples else "i")
+        analysed = play_args(samples, index)
+        self._play_args = {p: analysed.get(p, (p, 1.0, 0.0) if samples else (p,)) for p in self.pins}
+        self._pause = self.osc.message("/pause", "")
+        self._resume = self.osc.message("/resume", "")
+        self._stop_msg = self.osc.message("/stop", "")
+        self.is_paused = False
+
+        # monotonic -> Unix time for the timetags (taken once: both clocks tick at the same rate)
+        self._wall_offset = time.time() - time.monotonic_ns() / 1e9
+        self.last_press_ns = {}
+        self.send_latency = LatencyRing()  # edge -> sendto, ns
+        self.slack = LatencyRing()         # sendto -> timetag, ns (what is left of `latency`)
+        self.counters = {"presses": 0, "sent": 0, "dropped": 0, "late": 0}
+
+        self.loop = None
+        self._queue = None
+        self._log = []
+        self._thread = None
+        self._stop_event = None
+        self._metrics_sock = None
+        self.recorder = None
+
+        self.buttons = []
+        for pin in [*self.pins, pause_pin, stop_pin, bank_pin]:
+            if pin is None:
+                continue
+            btn = Button(pin, pull_up=True, pin_factory=pin_factory)
+            btn.when_pressed = (lambda p: (lambda: self._edge(p)))(pin)
+            self.buttons.append(btn)
+
+    # --- gpiozero thread: stamp and hand over, nothing else ---
+    def _edge(self, pin):
+        t = time.monotonic_ns()
+        loop = self.loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._queue.put_nowait, (pin, t))
+
+    # --- event loop ---
+    async def _sender(self):
+        while True:
+            pin, t = await self._queue.get()
+            self.counters["presses"] += 1
+            if t - self.last_press_ns.get(pin, -self.debounce_ns) < self.debounce_ns:
+                self.counters["dropped"] += 1
+                continue
+            self.last_press_ns[pin] = t
+
+            if pin == self.bank_pin:
+                if self.banks is not None:
+                    self.banks.next()
+                    if self.verbose:
+                        self._log.append(f"🔀 BANK -> {self.banks.pending}")
+                continue
+            if pin == self.stop_pin:
+                msg, args, what = self._stop_msg, (), "⏹️ STOP"
+            elif pin == self.pause_pin:
+                msg, args = (self._resume, ()) if self.is_paused else (self._pause, ())
+                what = "⏯️ RESUME" if self.is_paused else "⏸️ PAUSE"
+                self.is_paused = not self.is_paused
+            else:
+                msg, args, what = self._play, self._play_args[pin], f"▶️ PLAY request from GPIO {pin}"
+            when = t / 1e9 + self._wall_offset + self.latency
+            self.osc.send_bundle([(msg, args)], when=when)
+
+            sent = time.monotonic_ns()
+            self.counters["sent"] += 1
+            self.send_latency.add(sent - t)
+            slack = t + int(self.latency * 1e9) - sent
+            self.slack.add(slack)
+            if slack < 0:
+                self.counters["late"] += 1
+            if self.recorder is not None:
+                self.recorder.add_trigger(msg.address, args)
+            if self.verbose:
+                self._log.append(what)
+
+    async def _logger(self):
+        while True:
+            await asyncio.sleep(LOG_EVERY)
+            if self._log:
+                lines, self._log = self._log, []
+                print("\n".join(lines))
+
+    async def main(self, stop=None, ready=None):
+        """Run until `stop` (an asyncio.Event) is set, or forever. ready: threading.Event set once edges are taken."""
+        self._queue = asyncio.Queue()
+        self.loop = asyncio.get_running_loop()
+        tasks = [asyncio.create_task(self._sender()), asyncio.create_task(self._logger())]
+        if self.banks is not None:
+            await self.banks.open()
+            self.banks.switch(self.banks.order[0])  # until it is loaded, sclang's boot buffers play
+        if ready is not None:
+            ready.set()
+        try:
+            await (stop.wait() if stop is not None else asyncio.Future())
+        finally:
+            self.loop = None
+            if self.banks is not None:
+                self.banks.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self):
+        asyncio.run(self.main())
+
+    def start(self):
+        """Run the event loop on a daemon thread; returns self once it accepts edges."""
+        ready = threading.Event()
+
+        async def main():
+            self._stop_event = asyncio.Event()
+            await self.main(self._stop_event, ready)
+
+        self._thread = threading.Thread(target=asyncio.run, args=(main(),), name="gpio-bridge", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    # --- stats / shutdown ---
+    def stats(self):
+        return {
+            "osc": self.osc.stats(),
+            "latency_s": self.latency,
+            "edge_to_send": self.send_latency.summary(),
+            "slack": self.slack.summary(),
+            "counters": dict(self.counters),
+            "banks": self.banks.stats() if self.banks is not None else None,
+        }
+
+    def serve_metrics(self, path="/tmp/tamburi-gpio.sock"):
+        self._metrics_sock = serve_unix(path, self.stats)
+        return path
+
+    def record(self, path):
+        """Log every press sent (tamburi.record format, replayable like the Engine's)."""
+        self.recorder = Recorder(path, "gpio")
+        return self.recorder
+
+    def close(self):
+        if self._thread is not None:
+            loop = self.loop
+            if loop is not None:
+                loop.call_soon_threadsafe(self._stop_event.set)
+            self._thread.join(1.0)
+        for btn in self.buttons:
+            btn.close()
+        if self._metrics_sock is not None:
+            self._metrics_sock.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.osc.close()
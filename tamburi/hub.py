@@ -0,0 +1,243 @@
+"""
+Control hub: one process that every control surface sends to, merging them into
+a single bounded OSC stream towards the engines.
+
+    python -m tamburi.hub                                  # -> sclang 127.0.0.1:57120
+    python -m tamburi.hub --route 127.0.0.1:4559 --stats 2
+
+Front ends point their engine at the hub's UNIX datagram socket instead of
+sclang (HUB = "/tmp/tamburi-hub.sock" in controller.py / front_panel.py /
+raspi/main_py.py, --hub in tamburi.rig); they send exactly what they would
+send to the engine, bundles included.
+
+Continuous values are merged per OSC address, last writer wins: the hub keeps
+only the latest value per address and sends everything that changed as ONE
+bundle per tick, skipping values equal to what was last sent. So the stream is
+at most one message per address per tick, however many surfaces are playing.
+One-shots (…/toggle, /stop, /clear, /play, /pause, /resume) are forwarded at
+once and in order, with their bundle timetag if they had one; so is any
+message in a timetagged bundle (a delay time quantized to the beat), which
+also becomes the last value sent for its address.
+
+Stats (JSON on /tmp/tamburi-hub-stats.sock): per source messages, rate and
+conflicts (its value overwritten by another source before it was sent);
+merged totals: in, out, coalesced, conflicts, deduplicated, triggers, and
+send_errors (a message that could not be sent is counted and dropped, the
+stream goes on).
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import struct
+import threading
+import time
+
+from tamburi.metrics import serve_unix
+from tamburi.osc import PACKED_TAGS, Encoded, OscSender, decode_packet
+from tamburi.ticker import Ticker
+
+HUB_SOCK = "/tmp/tamburi-hub.sock"
+STATS_SOCK = "/tmp/tamburi-hub-stats.sock"
+HUB_HZ = 120.0
+ONE_SHOTS = {"toggle", "stop", "clear", "play", "pause", "resume"}  # last address segment
+
+
+def is_one_shot(address):
+    return address.rsplit("/", 1)[-1] in ONE_SHOTS
+
+
+class _Source:
+    __slots__ = ("name", "messages", "conflicts", "last_seen", "_rate_n", "_rate_t", "rate")
+
+    def __init__(self, name):
+        self.name = name
+        self.messages = 0
+        self.conflicts = 0
+        self.last_seen = 0.0
+        self._rate_n = 0
+        self._rate_t = time.monotonic()
+        self.rate = 0.0
+
+
+class Hub:
+    def __init__(self, path=HUB_SOCK, host="127.0.0.1", port=57120, routes=None, hz=HUB_HZ):
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(path)
+        self.sock.settimeout(0.5)
+        self.osc = OscSender(host, port, routes, name="hub")
+
+        self._pending = {}  # address -> (tags, args, source), latest unsent value
+        self._sent = {}     # address -> args last sent
+        self._lock = threading.Lock()
+        self.sources = {}
+        self.counters = {"in": 0, "out": 0, "coalesced": 0, "conflicts": 0, "deduplicated": 0,
+                         "triggers": 0, "bad": 0, "send_errors": 0}
+        self.last_error = None
+        self._stop = threading.Event()
+        self._rx = threading.Thread(target=self._recv, name="hub-recv", daemon=True)
+        self.ticker = Ticker(hz, self._tick, name="hub", idle=lambda: not self._pending)
+        self._metrics_sock = None
+
+    def start(self):
+        self._rx.start()
+        self.ticker.start()
+        return self
+
+    def _message(self, address, tags, args):
+        # pre-encoded handle for numbers, a one-off encode for anything with a string
+        return self.osc.message(address, tags) if PACKED_TAGS.issuperset(tags) else Encoded(address, args)
+
+    def _failed(self, e):
+        self.counters["send_errors"] += 1
+        self.last_error = f"{type(e).__name__}: {e}"
+
+    # --- receive thread: merge ---
+    def _source(self, addr):
+        # abstract name "\0tamburi-<name>-<pid>-<n>"; anything else is kept as is
+        if isinstance(addr, bytes):
+            addr = addr.decode(errors="replace")
+        name = (addr or "?").lstrip("\0")
+        if name.startswith("tamburi-"):
+            name = name[len("tamburi-"):].rsplit("-", 1)[0]
+        src = self.sources.get(name)
+        if src is None:
+            src = self.sources[name] = _Source(name)
+        return src
+
+    def _recv(self):
+        while not self._stop.is_set():
+            try:
+                data, addr = self.sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            src = self._source(addr)
+            try:
+                msgs = decode_packet(data)
+            except (ValueError, IndexError, UnicodeDecodeError):
+                self.counters["bad"] += 1
+                continue
+            src.messages += len(msgs)
+            src.last_seen = time.monotonic()
+            self.counters["in"] += len(msgs)
+            woke = False
+            for address, tags, args, when in msgs:
+                if when is not None or is_one_shot(address):
+                    self.counters["triggers"] += 1
+                    try:
+                        msg = self._message(address, tags, args)
+                        if when is None:
+                            self.osc.send_prepared(msg, args)
+                        else:
+                            if not is_one_shot(address):
+                                with self._lock:
+                                    self._pending.pop(address, None)
+                                    self._sent[address] = args
+                            self.osc.send_bundle([(msg, args)], when=when)
+                    except (ValueError, TypeError, struct.error) as e:
+                        self._failed(e)
+                    continue
+                with self._lock:
+                    prev = self._pending.get(address)
+                    if prev is not None:
+                        self.counters["coalesced"] += 1
+                        if prev[2] is not src:
+                            self.counters["conflicts"] += 1
+                            prev[2].conflicts += 1
+                    self._pending[address] = (tags, args, src)
+                woke = True
+            if woke:
+                self.ticker.wake()
+
+    # --- ticker thread: one bundle per tick ---
+    def _tick(self, now, dt):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        parts = []
+        sent = self._sent
+        for address, (tags, args, _) in pending.items():
+            if sent.get(address) == args:
+                self.counters["deduplicated"] += 1
+                continue
+            sent[address] = args
+            parts.append((self._message(address, tags, args), args))
+        if not parts:
+            return
+        try:
+            self.osc.send_bundle(parts)
+        except (ValueError, TypeError, struct.error):  # e.g. past BUNDLE_MAX: one message at a time
+            for part in parts:
+                try:
+                    self.osc.send_prepared(*part)
+                except (ValueError, TypeError, struct.error) as e:
+                    self._failed(e)
+                    continue
+                self.counters["out"] += 1
+            return
+        self.counters["out"] += len(parts)
+
+    # --- stats / shutdown ---
+    def stats(self):
+        now = time.monotonic()
+        sources = {}
+        for s in list(self.sources.values()):
+            dt = now - s._rate_t
+            if dt >= 0.5:
+                s.rate = (s.messages - s._rate_n) / dt
+                s._rate_n, s._rate_t = s.messages, now
+            sources[s.name] = {"messages": s.messages, "msgs_per_s": s.rate, "conflicts": s.conflicts,
+                               "idle_s": now - s.last_seen}
+        return {"sources": sources, "merge": dict(self.counters), "last_error": self.last_error,
+                "osc": self.osc.stats(),
+                "tick": self.ticker.stats()}
+
+    def serve_metrics(self, path=STATS_SOCK):
+        self._metrics_sock = serve_unix(path, self.stats)
+        return path
+
+    def close(self):
+        self._stop.set()
+        self.ticker.stop()
+        self.sock.close()
+        self._rx.join(1.0)
+        if self._metrics_sock is not None:
+            self._metrics_sock.close()
+        self.osc.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sock", default=HUB_SOCK, help="UNIX datagram socket the front ends send to")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=57120)
+    ap.add_argument("--route", action="append", default=[], metavar="HOST:PORT", help="another engine (repeatable)")
+    ap.add_argument("--hz", type=float, default=HUB_HZ)
+    ap.add_argument("--stats", type=float, default=0.0, metavar="SEC", help="print stats every SEC")
+    ap.add_argument("--stats-sock", default=STATS_SOCK, help="UNIX socket for JSON stats ('' = off)")
+    args = ap.parse_args()
+
+    routes = [{"host": h, "port": int(p)} for h, p in (r.rsplit(":", 1) for r in args.route)]
+    hub = Hub(args.sock, args.host, args.port, routes, args.hz).start()
+    if args.stats_sock:
+        hub.serve_metrics(args.stats_sock)
+
+    done = threading.Event()
+    signal.signal(signal.SIGINT, lambda *a: done.set())
+    signal.signal(signal.SIGTERM, lambda *a: done.set())
+    print(f"hub {args.sock} -> {args.host}:{args.port}  (Ctrl+C to quit)")
+    while not done.wait(args.stats or None):
+        print(json.dumps(hub.stats()))
+    hub.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Input -> UDP latency instrumentation and a tiny local metrics endpoint.
+
+Every input event (Engine.set / nudge / trigger, with an optional timestamp taken
+earlier by the front end, e.g. at the GPIO edge) is stamped with
+perf_counter_ns(). For continuous parameters the stamp is kept per table row
+until the row's next datagram leaves the socket; several events before that
+send are counted as coalesced, events whose row never had to be sent (below the
+deadband) as deduplicated. Latencies go into fixed-size ring buffers, so
+recording costs the same after a night of playing as after a minute.
+
+Updates come from the front-end threads and the sender thread without a lock:
+a race can at worst lose one sample, never block a send.
+
+    socat - UNIX-CONNECT:/tmp/tamburi-rig.sock    # one JSON snapshot per connect
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+
+import numpy as np
+
+RING_SIZE = 4096
+
+
+class LatencyRing:
+    """Last RING_SIZE latencies in ns, preallocated."""
+
+    def __init__(self, size=RING_SIZE):
+        self.buf = np.zeros(size, dtype=np.int64)
+        self.i = 0
+        self.count = 0
+
+    def add(self, ns):
+        self.buf[self.i] = ns
+        self.i = (self.i + 1) % len(self.buf)
+        self.count += 1
+
+    def add_many(self, ns):
+        for v in ns.tolist():
+            self.add(v)
+
+    def summary(self):
+        """p50 / p95 / p99 / max in ms over what is in the ring."""
+        n = min(self.count, len(self.buf))
+        if n == 0:
+            return {"n": 0}
+        p50, p95, p99 = (np.percentile(self.buf[:n], (50, 95, 99)) / 1e6).tolist()
+        return {"n": self.count, "p50_ms": p50, "p95_ms": p95, "p99_ms": p99,
+                "max_ms": float(self.buf[:n].max()) / 1e6}
+
+
+class Metrics:
+    def __init__(self, n_rows):
+        self.pending_ns = np.zeros(n_rows, dtype=np.int64)  # first unsent input per row, 0 = none
+        self.set_latency = LatencyRing()
+        self.trigger_latency = LatencyRing()
+        self.counters = {"events": 0, "coalesced": 0, "deduplicated": 0, "triggers": 0, "dropped": 0}
+
+    def count(self, name, n=1):
+        """Front-end counters, e.g. count("dropped") for a debounced GPIO edge."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    # --- continuous parameters ---
+    def on_set(self, rows, t_ns):
+        self.counters["events"] += 1
+        pend = self.pending_ns[rows]
+        if pend.all():
+            self.counters["coalesced"] += 1
+        else:
+            self.pending_ns[rows[pend == 0]] = t_ns
+
+    def on_sent(self, rows, t_ns):
+        """rows: table rows that just left in a datagram at t_ns."""
+        pend = self.pending_ns[rows]
+        hit = pend > 0
+        if hit.any():
+            self.set_latency.add_many(t_ns - pend[hit])
+            self.pending_ns[rows[hit]] = 0
+
+    def on_idle(self):
+        """Everything converged: inputs still pending never needed a send."""
+        left = int(np.count_nonzero(self.pending_ns))
+        if left:
+            self.counters["deduplicated"] += left
+            self.pending_ns[:] = 0
+
+    # --- one-shots ---
+    def on_trigger(self, t_event_ns, t_sent_ns):
+        self.counters["triggers"] += 1
+        self.trigger_latency.add(t_sent_ns - t_event_ns)
+
+    def snapshot(self):
+        return {
+            "set_latency": self.set_latency.summary(),
+            "trigger_latency": self.trigger_latency.summary(),
+            "counters": dict(self.counters),
+        }
+
+
+class RateMeter:
+    """messages/s and bytes/s between two successive reads of the OSC counters."""
+
+    def __init__(self):
+        self._last = None
+
+    def update(self, osc_stats):
+        now = time.monotonic()
+        out = {"msgs_per_s": 0.0, "bytes_per_s": 0.0, "packets_per_s": 0.0}
+        if self._last is not None:
+            t, prev = self._last
+            dt = now - t
+            if dt > 0:
+                out["msgs_per_s"] = (osc_stats["messages"] - prev["messages"]) / dt
+                out["bytes_per_s"] = (osc_stats["bytes"] - prev["bytes"]) / dt
+                out["packets_per_s"] = (osc_stats["packets"] - prev["packets"]) / dt
+        self._last = (now, dict(osc_stats))
+        return out
+
+
+def serve_unix(path, snapshot):
+    """
+    Answer every connection on UNIX socket `path` with json.dumps(snapshot()) + newline.
+    Runs on a daemon thread; returns the listening socket (close() it to stop).
+    """
+    if os.path.exists(path):
+        os.unlink(path)
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    srv.bind(path)
+    srv.listen(4)
+
+    def loop():
+        while True:
+            try:
+                conn, _ = srv.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.sendall(json.dumps(snapshot()).encode() + b"\n")
+                except OSError:
+                    pass
+
+    threading.Thread(target=loop, name="metrics", daemon=True).start()
+    return srv
@@ -0,0 +1,392 @@
+"""
+Pre-encoded OSC sender for the hot paths (drop-in for SimpleUDPClient.send_message).
+
+An OSC message with numeric args is a fixed byte layout:
+    address\\0 pad | ,tags\\0 pad | 4 bytes per arg (big-endian int32 / float32)
+so for each (address, typetags) we build that layout once into a bytearray and
+afterwards only patch the argument bytes in place with struct.pack_into before
+send() on a persistent socket. No builder object and no re-encoding of the
+address per send; what is left per call is the args tuple and the interpreter's
+own call overhead (bench/osc_encode.py prints the bytes per op).
+
+Bundles are assembled the same way into one reusable buffer.
+
+    osc = OscSender("127.0.0.1", 57120)
+    osc.send_message("/play", [17])           # same call as SimpleUDPClient
+    freq = osc.message("/siren/freq", "f")    # hot path: keep the handle
+    freq.send(1200.0)
+    osc.send_bundle([(freq, (1200.0,)), (rate, (0.6,))])
+
+Only i / f / d args go through the template path (Message refuses any other
+tag); a string arg falls back to a one-off encode (still without pythonosc),
+wrapped in an Encoded that goes wherever a Message does, bundles included.
+
+Fan-out: extra routes get every datagram too, from the same encode, each on its
+own connected socket, optionally with addresses rewritten (or dropped) for that
+engine and a packet-rate cap:
+
+    osc = OscSender("127.0.0.1", 57120, routes=[
+        {"host": "10.0.0.2", "port": 57120},                              # backup scsynth rig
+        {"host": "127.0.0.1", "port": 4559, "rewrite": {"/delay/time": "/osc/delay_time"},
+         "only_rewritten": True, "max_rate": 60},                         # Sonic Pi
+    ])
+
+A rewritten message costs one join of its new head with the already packed
+argument bytes; routes without rewrites send the very same bytes.
+"""
+
+import os
+import socket
+import struct
+import threading
+import time
+
+NTP_DELTA = 2208988800  # 1900-01-01 -> 1970-01-01, seconds
+IMMEDIATE = b"\x00\x00\x00\x00\x00\x00\x00\x01"
+BUNDLE_MAX = 8192
+PACKED_TAGS = frozenset("ifd")  # fixed-size args a Message can patch in place
+
+_BUNDLE_HEAD = b"#bundle\x00"
+_I32 = struct.Struct(">i")
+_TIMETAG = struct.Struct(">II")
+
+
+def _pad(b):
+    """OSC string: bytes + NUL, padded to a multiple of 4."""
+    b += b"\x00"
+    return b + b"\x00" * (-len(b) % 4)
+
+
+def _tags_for(args):
+    tags = []
+    for a in args:
+        t = type(a)
+        if t is float:
+            tags.append("f")
+        elif t is int or t is bool:
+            tags.append("i")
+        elif t is str:
+            tags.append("s")
+        else:
+            raise TypeError(f"unsupported OSC arg type: {t.__name__}")
+    return "".join(tags)
+
+
+def timetag(t):
+    """Unix time (time.time() seconds) -> 8-byte NTP timetag."""
+    sec = int(t)
+    return _TIMETAG.pack(sec + NTP_DELTA, int((t - sec) * 4294967296.0) & 0xFFFFFFFF)
+
+
+def encode_message(address, args):
+    """One-off encode (any i/f/s args), for messages with string args."""
+    tags = _tags_for(args)
+    out = [_pad(address.encode()), _pad(("," + tags).encode())]
+    for tag, a in zip(tags, args):
+        if tag == "f":
+            out.append(struct.pack(">f", a))
+        elif tag == "i":
+            out.append(_I32.pack(int(a)))
+        else:
+            out.append(_pad(a.encode()))
+    return b"".join(out)
+
+
+def decode_packet(data, when=None):
+    """
+    [(address, tags, args, when)] of a message or a (nested) bundle, for receivers
+    (tamburi.hub, tamburi.feedback). when: the bundle's timetag as Unix time, None = immediately.
+    """
+    if data[:8] == _BUNDLE_HEAD:
+        sec, frac = _TIMETAG.unpack_from(data, 8)
+        if (sec, frac) != (0, 1):
+            when = sec - NTP_DELTA + frac / 4294967296.0
+        out = []
+        o = 16
+        while o + 4 <= len(data):
+            (size,) = _I32.unpack_from(data, o)
+            out += decode_packet(data[o + 4:o + 4 + size], when)
+            o += 4 + size
+        return out
+    end = data.index(b"\0")
+    address = data[:end].decode()
+    o = (end + 4) & ~3
+    end = data.index(b"\0", o)
+    tags = data[o + 1:end].decode()
+    o = (end + 4) & ~3
+    args = []
+    for tag in tags:
+        if tag == "f":
+            args.append(struct.unpack_from(">f", data, o)[0])
+            o += 4
+        elif tag == "i":
+            args.append(_I32.unpack_from(data, o)[0])
+            o += 4
+        elif tag == "d":  # scsynth's /status.reply sample rates
+            args.append(struct.unpack_from(">d", data, o)[0])
+            o += 8
+        elif tag == "s":
+            end = data.index(b"\0", o)
+            args.append(data[o:end].decode())
+            o = (end + 4) & ~3
+        else:
+            raise ValueError(f"unsupported OSC type tag {tag!r}")
+    return [(address, tags, tuple(args), when)]
+
+
+class Message:
+    """Pre-encoded message for one (address, typetags); args are patched in place."""
+
+    __slots__ = ("address", "tags", "buf", "size", "_st", "_off", "_osc")
+
+    def __init__(self, osc, address, tags):
+        if not PACKED_TAGS.issuperset(tags):
+            raise ValueError(f"pre-encoded OSC args must be i / f / d, not {tags!r} (use encode_message)")
+        head = _pad(address.encode()) + _pad(("," + tags).encode())
+        self.address = address
+        self.tags = tags
+        self._st = struct.Struct(">" + tags)
+        self._off = len(head)
+        self.size = len(head) + self._st.size
+        self.buf = bytearray(head) + bytearray(self._st.size)
+        self._osc = osc
+
+    def pack(self, args):
+        self._st.pack_into(self.buf, self._off, *args)
+        return self.buf
+
+    def send(self, *args):
+        self._osc.send_prepared(self, args)
+
+
+class Encoded:
+    """A one-off encode_message() with the Message interface, for args a Message can't patch (strings)."""
+
+    __slots__ = ("address", "tags", "buf", "size", "_off")
+
+    def __init__(self, address, args):
+        self.address = address
+        self.tags = _tags_for(args)
+        self.buf = encode_message(address, args)
+        self.size = len(self.buf)
+        self._off = len(_pad(address.encode())) + len(_pad(("," + self.tags).encode()))
+
+    def pack(self, args):
+        return self.buf
+
+
+class Route:
+    """
+    One destination: a connected UDP socket, per-address rewrites, a packet-rate
+    cap (token bucket, max_rate datagrams/s, bursts of a tenth of a second),
+    counters. Send errors (nobody listening, network down) are counted, not raised.
+
+    A host starting with "/" is a UNIX datagram socket path (the tamburi.hub
+    daemon; port is ignored). The sending socket is then bound to an abstract
+    name "tamburi-<name>-<pid>-..." so the hub can tell sources apart.
+    """
+
+    def __init__(self, host, port, rewrite=None, only_rewritten=False, max_rate=None, name="osc"):
+        if host.startswith("/"):
+            self.dest = host
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.sock.bind(f"\0tamburi-{name}-{os.getpid()}-{id(self) & 0xFFFF:04x}")
+        else:
+            self.dest = (socket.gethostbyname(host), port)
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._connected = False
+        self._connect()
+        self.rewrite = dict(rewrite or {})  # address -> new address, None = not sent here
+        self.only_rewritten = only_rewritten  # drop addresses with no rewrite entry
+        self.plain = not self.rewrite and not only_rewritten
+        self._heads = {}  # (address, tags) -> encoded new head, None = dropped
+        self.max_rate = max_rate
+        self._burst = max(1.0, (max_rate or 0) / 10.0)
+        self._tokens = self._burst
+        self._t = time.monotonic()
+        self.packets = 0
+        self.bytes = 0
+        self.errors = 0
+        self.capped = 0
+        self.last_error = None
+
+    def head(self, address, tags):
+        key = (address, tags)
+        try:
+            return self._heads[key]
+        except KeyError:
+            pass
+        new = self.rewrite.get(address, None if self.only_rewritten else address)
+        h = self._heads[key] = None if new is None else _pad(new.encode()) + _pad(("," + tags).encode())
+        return h
+
+    def allow(self):
+        if self.max_rate is None:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._t) * self.max_rate)
+        self._t = now
+        if self._tokens < 1.0:
+            self.capped += 1
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def _connect(self):
+        try:
+            self.sock.connect(self.dest)
+            self._connected = True
+        except OSError as e:  # the hub is not up yet: retried on the next send
+            self.errors += 1
+            self.last_error = str(e)
+
+    def send(self, data):
+        if not self.allow():
+            return
+        if not self._connected:
+            self._connect()
+            if not self._connected:
+                return
+        try:
+            self.sock.send(data)
+        except OSError as e:
+            self.errors += 1
+            self.last_error = str(e)
+            return
+        self.packets += 1
+        self.bytes += len(data)
+
+    def stats(self):
+        dest = self.dest if isinstance(self.dest, str) else f"{self.dest[0]}:{self.dest[1]}"
+        return {"dest": dest, "packets": self.packets, "bytes": self.bytes,
+                "errors": self.errors, "capped": self.capped, "last_error": self.last_error}
+
+    def close(self):
+        self.sock.close()
+
+
+class OscSender:
+    """
+    Pre-encoded messages sent to one or more Routes, counters.
+
+    Safe to share between threads (the Tk thread for one-shot toggles and the
+    sender thread for the stream): a send holds a lock only for pack + sendto.
+    """
+
+    def __init__(self, host, port, routes=None, name="osc"):
+        """
+        routes: extra destinations, dicts of Route arguments (host, port, rewrite, ...).
+        name: who is sending, for a hub on the other end of a UNIX route.
+        """
+        self.routes = [Route(host, port, name=name)] + [Route(**{"name": name, **r}) for r in routes or ()]
+        self.dest = self.routes[0].dest
+        self._fanout = len(self.routes) > 1
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._bbuf = bytearray(BUNDLE_MAX)
+        self._bview = memoryview(self._bbuf)
+        self._bbuf[0:8] = _BUNDLE_HEAD
+        self._elems = []  # (Message, offset) of the bundle being built, for rewriting routes
+        self.messages = 0   # OSC messages sent (inside bundles too)
+        self.bundles = 0
+        self.packets = 0    # datagrams
+        self.bytes = 0
+
+    def message(self, address, tags):
+        """Pre-encoded handle for (address, typetags), built once and cached; ValueError outside i / f / d."""
+        key = (address, tags)
+        m = self._cache.get(key)
+        if m is None:
+            m = self._cache[key] = Message(self, address, tags)
+        return m
+
+    def _sendto(self, data, n_msgs):
+        for r in self.routes:
+            r.send(data)
+        self.messages += n_msgs
+        self.packets += 1
+        self.bytes += len(data)
+
+    def _send_rewritten(self, data, address, tags, arg_off):
+        """A single message: plain routes get `data`, the others their own head + the same arg bytes."""
+        self.messages += 1
+        self.packets += 1
+        self.bytes += len(data)
+        for r in self.routes:
+            if r.plain:
+                r.send(data)
+            else:
+                h = r.head(address, tags)
+                if h is not None:
+                    r.send(h + data[arg_off:])
+
+    def send_prepared(self, msg, args):
+        with self._lock:
+            if self._fanout:
+                self._send_rewritten(msg.pack(args), msg.address, msg.tags, msg._off)
+            else:
+                self._sendto(msg.pack(args), 1)
+
+    def send_message(self, address, value, when=None):
+        """
+        Same call as SimpleUDPClient.send_message: value is a scalar or a list.
+        when: Unix time -> sent as a one-message bundle with that timetag (string args too).
+        """
+        args = value if isinstance(value, (list, tuple)) else (value,)
+        tags = _tags_for(args)
+        msg = self.message(address, tags) if PACKED_TAGS.issuperset(tags) else Encoded(address, args)
+        if when is not None:
+            self.send_bundle([(msg, args)], when)
+        else:
+            self.send_prepared(msg, args)
+
+    def send_bundle(self, parts, when=None):
+        """
+        parts: iterable of (Message, args). when: Unix time for the timetag,
+        None = immediately. All parts go out as ONE datagram.
+        """
+        buf = self._bbuf
+        with self._lock:
+            buf[8:16] = IMMEDIATE if when is None else timetag(when)
+            o = 16
+            n = 0
+            elems = self._elems
+            elems.clear()
+            for msg, args in parts:
+                size = msg.size
+                if o + 4 + size > BUNDLE_MAX:
+                    raise ValueError("OSC bundle larger than BUNDLE_MAX")
+                _I32.pack_into(buf, o, size)
+                buf[o + 4:o + 4 + size] = msg.pack(args)
+                elems.append((msg, o + 4))
+                o += 4 + size
+                n += 1
+            if not n:
+                return
+            self.messages += n
+            self.packets += 1
+            self.bundles += 1
+            self.bytes += o
+            view = self._bview
+            for r in self.routes:
+                if r.plain:
+                    r.send(view[:o])
+                    continue
+                out = [buf[:16]]
+                for msg, start in elems:
+                    h = r.head(msg.address, msg.tags)
+                    if h is not None:
+                        body = h + buf[start + msg._off:start + msg.size]
+                        out += [_I32.pack(len(body)), body]
+                if len(out) > 1:
+                    r.send(b"".join(out))
+
+    def stats(self):
+        st = {"messages": self.messages, "bundles": self.bundles, "packets": self.packets, "bytes": self.bytes}
+        if self._fanout:
+            st["routes"] = [r.stats() for r in self.routes]
+        return st
+
+    def close(self):
+        for r in self.routes:
+            r.close()
@@ -0,0 +1,166 @@
+"""
+Parameter table: every OSC parameter is one row in a set of contiguous NumPy arrays.
+
+A row holds the target (written by the UI), the smoothed value, its smoothing
+time constant, the clamp range, the output mapping (linear or exponential, like the old
+exp_map_0_1) and the send deadband. step() runs smoothing, clamping, mapping and
+change detection for all rows at once, so the cost per tick barely grows with
+the number of parameters.
+
+Several rows can share one control: add() them with the same `group` and a
+single set() writes all their targets (the shared PITCH / RATE sliders).
+`controls` lists the names front ends set: each group once, plus the address of
+every row added without one.
+
+Smoothing is a one-pole with time constant `tau` seconds, applied with the
+measured dt of each tick (alpha = 1 - exp(-dt / tau)), so glide time does not
+depend on the loop running on time. tau = 0 means no smoothing.
+With smoothing = False every row jumps straight to its target (the glide is
+then left to the receiver, see controller.py SERVER_SMOOTHING).
+"""
+
+import numpy as np
+
+LIN = 0  # value sent as is
+EXP = 1  # control 0..1 mapped to vmin * (vmax / vmin) ** x
+
+
+class ParamTable:
+    def __init__(self):
+        self.addrs = []
+        self.groups = {}   # control name -> np.ndarray of row indices
+        self.controls = []  # settable names in table order: groups, ungrouped addresses
+        self._rows = []    # build-time specs, frozen into arrays by _freeze()
+        self._group_rows = {}
+        self.n = 0
+        self.on_set = None  # called after every set(), e.g. Ticker.wake
+        self.smoothing = True
+        self._freeze()
+
+    def add(self, addr, value, tau=0.0, lo=0.0, hi=1.0, eps=0.0,
+            curve=LIN, vmin=1.0, vmax=1.0, group=None):
+        """Add one OSC parameter; value/lo/hi are in control units (0..1 for EXP rows)."""
+        i = len(self.addrs)
+        self.addrs.append(addr)
+        self._rows.append((value, tau, lo, hi, eps, curve, vmin, vmax))
+        for name in (addr, group):
+            if name is not None:
+                self._group_rows.setdefault(name, []).append(i)
+        control = addr if group is None else group
+        if control not in self.controls:
+            self.controls.append(control)
+        self._freeze()
+        return i
+
+    def _freeze(self):
+        cols = np.array(self._rows, dtype=np.float64).reshape(-1, 8).T
+        value, tau, lo, hi, eps, curve, vmin, vmax = cols
+        self.n = len(self._rows)
+
+        self.target = np.clip(value, lo, hi)
+        self.sm = self.target.copy()
+        self.tau = tau
+        with np.errstate(divide="ignore"):
+            self.neg_inv_tau = -1.0 / tau  # -inf for tau = 0 -> alpha = 1
+        self.lo = lo
+        self.hi = hi
+        self.eps = eps
+        self.is_exp = curve == EXP
+        self.vmin = vmin
+        self.log_ratio = np.where(self.is_exp, np.log(vmax / vmin), 0.0)
+        self.last = np.full(self.n, np.nan)  # last value sent, NaN = never
+        self.out = np.empty(self.n)
+        self._alpha = np.empty(self.n)
+        self._tgt_out = np.empty(self.n)
+        self.groups = {k: np.asarray(v, dtype=np.intp) for k, v in self._group_rows.items()}
+
+    # --- UI side ---
+    def set(self, name, value):
+        idx = self.groups[name]
+        self.target[idx] = np.clip(value, self.lo[idx], self.hi[idx])
+        if self.on_set is not None:
+            self.on_set()
+
+    def load(self, values):
+        """Write every row's target at once (clamped, e.g. a preset); returns the rows that changed."""
+        new = np.clip(values, self.lo, self.hi)
+        changed = np.flatnonzero(new != self.target)
+        self.target[changed] = new[changed]
+        if len(changed) and self.on_set is not None:
+            self.on_set()
+        return changed
+
+    def controls_of(self, rows):
+        """Names in `controls` that own at least one of `rows`."""
+        hit = np.zeros(self.n, dtype=bool)
+        hit[rows] = True
+        return [name for name in self.controls if hit[self.groups[name]].any()]
+
+    def get(self, name):
+        """Current target of a control (first row of the group)."""
+        return float(self.target[self.groups[name][0]])
+
+    def mapped(self, name, value):
+        """[(addr, value sent)] for every row of control `name` set to `value` (clamped, mapped)."""
+        idx = self.groups[name]
+        v = self._map_rows(idx, np.clip(value, self.lo[idx], self.hi[idx]))
+        return [(self.addrs[i], val) for i, val in zip(idx.tolist(), v.tolist())]
+
+    def jump(self, name, value):
+        """
+        Set a control with no glide and count it as already sent, for a value the
+        caller sends itself (a timetagged bundle). Returns (rows, mapped values).
+        """
+        idx = self.groups[name]
+        x = np.clip(value, self.lo[idx], self.hi[idx])
+        v = self._map_rows(idx, x)
+        self.target[idx] = x
+        self.sm[idx] = x
+        self.last[idx] = v
+        return idx, v
+
+    def _map_rows(self, idx, x):
+        return np.where(self.is_exp[idx], self.vmin[idx] * np.exp(x * self.log_ratio[idx]), x)
+
+    # --- sender side ---
+    def _map(self, x, out):
+        np.copyto(out, x)
+        e = self.is_exp
+        out[e] = self.vmin[e] * np.exp(x[e] * self.log_ratio[e])
+        return out
+
+    def step(self, dt):
+        """
+        One smoothing step of dt seconds for every row. Returns (indices, values) of
+        the rows whose mapped value moved more than their deadband since it was last
+        sent; those are then considered sent.
+        """
+        sm = self.sm
+        if self.smoothing:
+            alpha = self._alpha
+            np.multiply(self.neg_inv_tau, max(dt, 1e-6), out=alpha)
+            np.exp(alpha, out=alpha)
+            np.subtract(1.0, alpha, out=alpha)
+            sm += alpha * (self.target - sm)
+        else:
+            np.copyto(sm, self.target)
+        np.clip(sm, self.lo, self.hi, out=sm)
+
+        out = self._map(sm, self.out)
+
+        changed = np.flatnonzero(~(np.abs(out - self.last) <= self.eps))  # NaN -> changed
+        vals = out[changed]
+        self.last[changed] = vals
+        return changed, vals
+
+    def converged(self):
+        """
+        True when every target is already reflected (within its deadband) by the
+        last value sent: further ticks could not send anything, the sender may sleep.
+        """
+        target = self.target.copy()  # the UI thread may write meanwhile
+        tgt = self._map(target, self._tgt_out)
+        if np.all(np.abs(tgt - self.last) <= self.eps):
+            self.sm[:] = target  # land exactly, the next gesture glides from here
+            return True
+        return False
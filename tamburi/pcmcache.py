@@ -0,0 +1,207 @@
+"""
+On-disk cache of decoded PCM in the mixer format, so boots after the first one
+skip MP3 decoding.
+
+Entries are plain 16-bit WAVs named after the SHA-1 of the source file's
+content plus the format (rate, channels), so editing or replacing a file, or
+changing MIXER_FREQ / MIXER_CHANNELS, simply misses and decodes again; stale
+entries are left behind (prune() removes the ones nothing asked for). Being
+WAVs, entries open in any editor and in SuperCollider's Buffer.read as well.
+
+Entries are read through mmap: the attack and the streamed chunks are slices
+of the mapping passed straight to pygame.mixer.Sound(buffer=...).
+
+    python -m tamburi.pcmcache raspi/sounds/*.mp3    # warm the cache, print entries
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import time
+import wave
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tamburi", "pcm")
+HASH_CHUNK = 1 << 20
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            b = f.read(HASH_CHUNK)
+            if not b:
+                break
+            h.update(b)
+    return h.hexdigest()
+
+
+class PcmSource:
+    """Mixer-format PCM at [offset, offset + nbytes) of a file, mapped read-only."""
+
+    def __init__(self, path, offset, nbytes):
+        self.path = path
+        self.offset = offset
+        self.nbytes = nbytes
+        self._mm = None
+
+    @classmethod
+    def from_wav(cls, path):
+        with open(path, "rb") as f:
+            w = wave.open(f)
+            offset = f.tell()  # wave stops right after the data chunk header
+            n = w.getnframes() * w.getsampwidth() * w.getnchannels()
+        return cls(path, offset, n)
+
+    def view(self, start, n):
+        """memoryview of n bytes from `start` (clipped at the end), no copy."""
+        if self._mm is None:
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start = self.offset + start
+        end = min(start + n, self.offset + self.nbytes)
+        return memoryview(self._mm)[start:end]
+
+    def close(self):
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:  # a slice is still referenced; the mapping goes with it
+                pass
+            self._mm = None
+
+
+def write_entry(out, raw, freq, channels):
+    """Write raw s16 PCM as the WAV entry `out`."""
+    tmp = f"{out}.{os.getpid()}.tmp"
+    with wave.open(tmp, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(freq)
+        w.writeframes(raw)
+    os.replace(tmp, out)  # never a half-written entry, even if killed
+
+
+# --- decoding in worker processes (one mixer per worker, no audio device) ---
+def _worker_init(freq, channels):
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    import pygame
+    pygame.mixer.init(frequency=freq, size=-16, channels=channels)
+    if pygame.mixer.get_init() != (freq, -16, channels):
+        raise RuntimeError(f"worker mixer is {pygame.mixer.get_init()}, wanted {(freq, -16, channels)}")
+
+
+def decode_job(path, out, freq, channels):
+    """Worker side of PcmCache: decode `path` into entry `out`; returns seconds spent."""
+    import pygame
+    t0 = time.perf_counter()
+    write_entry(out, pygame.mixer.Sound(path).get_raw(), freq, channels)
+    return time.perf_counter() - t0
+
+
+def decode_pool(freq, channels, workers):
+    """ProcessPoolExecutor for decode_job(); spawned, so the parent's SDL state is not inherited."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_worker_init, initargs=(freq, channels))
+
+
+def wav_format(path):
+    """(rate, sample width, channels) of a WAV, or None if it is not one."""
+    try:
+        with wave.open(path, "rb") as w:
+            return w.getframerate(), w.getsampwidth(), w.getnchannels()
+    except (wave.Error, EOFError):
+        return None
+
+
+class PcmCache:
+    def __init__(self, freq, channels, directory=DEFAULT_DIR):
+        self.freq = freq
+        self.channels = channels
+        self.dir = directory
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.decode_seconds = 0.0
+        self._used = set()
+
+    def entry_path(self, digest):
+        return os.path.join(self.dir, f"{digest}-{self.freq}-{self.channels}ch.wav")
+
+    def lookup(self, path):
+        """(PcmSource or None on a miss, entry path to decode into)."""
+        out = self.entry_path(file_hash(path))
+        self._used.add(os.path.basename(out))
+        if os.path.exists(out):
+            self.hits += 1
+            return PcmSource.from_wav(out), out
+        self.misses += 1
+        return None, out
+
+    def get(self, path, decode):
+        """
+        PcmSource for `path` in the mixer format. decode(path) -> raw s16 bytes
+        is called only on a miss (pygame's Sound(path).get_raw() in the sampler).
+        """
+        src, out = self.lookup(path)
+        return src if src is not None else self.decode_into(out, path, decode)
+
+    def decode_into(self, out, path, decode):
+        """Decode `path` into entry `out` (from lookup()) on this thread; returns its PcmSource."""
+        t0 = time.perf_counter()
+        write_entry(out, decode(path), self.freq, self.channels)
+        self.decode_seconds += time.perf_counter() - t0
+        return PcmSource.from_wav(out)
+
+    def prune(self):
+        """Delete entries not returned by get() since this cache was created."""
+        for name in os.listdir(self.dir):
+            if name.endswith(".wav") and name not in self._used:
+                os.unlink(os.path.join(self.dir, name))
+
+    # --- boot timing, to compare a cold start with the warm ones ---
+    def record_boot(self, seconds):
+        """Store a cold boot's time; returns the last cold boot's time (None if unknown)."""
+        info = os.path.join(self.dir, "boot.json")
+        try:
+            with open(info) as f:
+                last = json.load(f)
+        except (OSError, ValueError):
+            last = {}
+        key = f"{self.freq}-{self.channels}"
+        if self.misses:
+            last[key] = seconds
+            with open(info, "w") as f:
+                json.dump(last, f)
+        return last.get(key)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "decode_seconds": self.decode_seconds}
+
+
+def main():
+    import argparse
+    import pygame
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("paths", nargs="+")
+    ap.add_argument("--freq", type=int, default=44100)
+    ap.add_argument("--channels", type=int, default=2)
+    ap.add_argument("--dir", default=DEFAULT_DIR)
+    args = ap.parse_args()
+
+    freq, channels = args.freq, args.channels
+    pygame.mixer.pre_init(frequency=freq, size=-16, channels=channels)
+    pygame.mixer.init()
+    cache = PcmCache(freq, channels, args.dir)
+    for p in args.paths:
+        src = cache.get(p, lambda q: pygame.mixer.Sound(q).get_raw())
+        print(f"{p} -> {src.path} ({src.nbytes / (freq * 2 * channels):0.1f} s)")
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Preset snapshots of every control target, with instant recall and timed morphs.
+
+    presets = Presets(siren, "~/.tamburi-presets.npz")   # loads the file if it exists
+    presets.store(0, "dub intro")       # the current targets -> slot 0 (saved at once)
+    presets.recall(0)                   # all targets at once, one write
+    presets.morph(1, 4.0)               # from where we are to slot 1 in 4 s
+    presets.morph(1, 4.0, start=0)      # from slot 0 to slot 1
+
+The bank is one (slots, rows) float64 array in ParamTable row order, NaN for an
+empty slot, so a recall is a single row copy into the table (Engine.load) and a
+morph step is one vectorized lerp over every row. Targets are in control units,
+where EXP rows are the 0..1 slider position: interpolating there moves their
+output along the same exponential curve as the slider does (exp_map_0_1), not
+linearly in Hz. The morph runs as an Engine tick hook on the sender thread, so
+it is exactly one target write per tick and the ticker does not idle while it
+runs; watchers (the sliders) get the moved controls like for any other set().
+
+On disk: an .npz with the slot names, the bank and the row addresses; a file
+saved from a different table is loaded by address, rows it lacks stay empty.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+SLOTS = 8
+MORPH_SECONDS = 3.0
+
+
+class Presets:
+    def __init__(self, engine, path=None, slots=SLOTS):
+        self.engine = engine
+        self.path = os.path.expanduser(path) if path else None
+        self.names = [""] * slots
+        self.bank = np.full((slots, engine.params.n), np.nan)
+        self._buf = np.empty(engine.params.n)
+        self._morph = None  # (from, to, t0, seconds, slot)
+        self._lock = threading.Lock()
+        self.counters = {"stored": 0, "recalled": 0, "morphs": 0, "morph_ticks": 0}
+        if self.path and os.path.exists(self.path):
+            self.load(self.path)
+        engine.on_tick(self._tick)
+
+    def __len__(self):
+        return len(self.names)
+
+    def filled(self, slot):
+        return not np.isnan(self.bank[slot]).any()
+
+    # --- front-end API (any thread) ---
+    def store(self, slot, name=None):
+        """Snapshot the current targets into `slot` (and the file, if any)."""
+        self.bank[slot] = self.engine.params.target
+        self.names[slot] = name or self.names[slot] or f"preset {slot + 1}"
+        self.counters["stored"] += 1
+        if self.path:
+            self.save(self.path)
+
+    def recall(self, slot):
+        """Jump every target to `slot` (stops a running morph). False if the slot is empty."""
+        if not self.filled(slot):
+            return False
+        with self._lock:
+            self._morph = None
+            self.engine.load(self.bank[slot])
+        self.counters["recalled"] += 1
+        return True
+
+    def morph(self, slot, seconds=MORPH_SECONDS, start=None):
+        """Glide every target to `slot` over `seconds`, from slot `start` or (None) from the current targets."""
+        if not self.filled(slot) or (start is not None and not self.filled(start)):
+            return False
+        frm = self.engine.params.target.copy() if start is None else self.bank[start].copy()
+        with self._lock:
+            self._morph = (frm, self.bank[slot].copy(), time.perf_counter(), max(seconds, 1e-6), slot)
+        self.counters["morphs"] += 1
+        self.engine.ticker.wake()
+        return True
+
+    def stop(self):
+        """Leave a running morph where it is."""
+        self._morph = None
+
+    @property
+    def morphing(self):
+        return self._morph is not None
+
+    # --- sender thread ---
+    def _tick(self, now, dt):
+        with self._lock:
+            m = self._morph
+            if m is None:
+                return False
+            frm, to, t0, seconds, _ = m
+            x = min(max((now - t0) / seconds, 0.0), 1.0)
+            if x < 1.0:
+                buf = self._buf
+                np.subtract(to, frm, out=buf)
+                buf *= x
+                buf += frm
+            else:
+                buf = to  # land exactly
+            self.engine.load(buf)
+            self.counters["morph_ticks"] += 1
+            if x >= 1.0:
+                self._morph = None
+                return False
+        return True
+
+    # --- disk ---
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, names=np.array(self.names), bank=self.bank, addrs=np.array(self.engine.params.addrs))
+        os.replace(tmp, path)
+
+    def load(self, path):
+        with np.load(path) as data:
+            names, bank, addrs = data["names"].tolist(), data["bank"], data["addrs"].tolist()
+        n = min(len(names), len(self.names))
+        self.names[:n] = names[:n]
+        if addrs == self.engine.params.addrs:
+            self.bank[:n] = bank[:n]
+            return
+        col = {a: i for i, a in enumerate(addrs)}
+        for row, addr in enumerate(self.engine.params.addrs):
+            if addr in col:
+                self.bank[:n, row] = bank[:n, col[addr]]
+
+    def stats(self):
+        return {"slots": [n if self.filled(i) else None for i, n in enumerate(self.names)],
+                "morphing": None if self._morph is None else self._morph[4], **self.counters}
@@ -0,0 +1,319 @@
+"""
+Control-event log: every set(), trigger() and tap an Engine receives, appended
+to a compact binary file, and a replayer that plays a log back into an Engine
+at the recorded timing or N times faster (the load generator for sclang's
+OSCdefs).
+
+    engine.record("/tmp/set.tmbr")      # front ends: RECORD = "..." / --record
+    python -m tamburi.record info /tmp/set.tmbr
+    python -m tamburi.record play /tmp/set.tmbr --speed 8      # 8x real time
+    python -m tamburi.record play /tmp/set.tmbr --speed 0      # as fast as it goes
+    python -m tamburi.record script /tmp/set.tmbr > set.jsonl  # for tamburi.render
+
+Recording costs four array.array appends under a lock per event; the columns
+are written out every CHUNK events (and on close) as one block of fixed 15-byte
+records (int64 ns since the start, kind, name index, float32 value). Names
+(control names, OSC addresses) are stored once, in the block that first uses
+them. A crash loses at most the last unwritten block.
+
+Kinds: SET (a control target, as given to Engine.set), TRIGGER with no / one
+int / one float argument, TRIGGER_ARGS for any other argument list (e.g. the
+pads' /play pin gain onset), and TAP (a tap-tempo press; the delay_time set it
+leads to is recorded on its own, so replay skips taps). A TRIGGER_ARGS name is
+the address and the arguments as JSON, so a pad that always sends the same
+arguments adds one name to the table and then 15 bytes per press. Arguments
+JSON cannot hold are not recorded (counted in `skipped`).
+"""
+
+import argparse
+import array
+import json
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"TMBREC1\n"
+SUFFIX = ".tmbr"
+CHUNK = 4096
+
+SET, TRIGGER, TRIGGER_INT, TRIGGER_FLOAT, TAP, TRIGGER_ARGS = range(6)
+KIND_NAMES = ("set", "trigger", "trigger", "trigger", "tap", "trigger")
+
+RECORD = np.dtype([("t_ns", "<i8"), ("kind", "u1"), ("key", "<u2"), ("value", "<f4")])  # packed: 15 bytes
+_U32 = struct.Struct("<I")
+_U16 = struct.Struct("<H")
+
+
+class Recorder:
+    def __init__(self, path, source, chunk=CHUNK):
+        """source: the engine's name, used by the replayer to rebuild a matching engine."""
+        self.path = path
+        self.chunk = chunk
+        self.t0 = time.perf_counter_ns()
+        self._f = open(path, "wb")
+        head = json.dumps({"source": source, "wall": time.time()}).encode()
+        self._f.write(MAGIC + _U32.pack(len(head)) + head)
+        self._f.flush()
+
+        self._t = array.array("q")
+        self._kind = array.array("B")
+        self._key = array.array("H")
+        self._value = array.array("f")
+        self._keys = {}
+        self._new = []  # names first used since the last write
+        self._lock = threading.Lock()
+        self.events = 0
+        self.skipped = 0
+        self.bytes = self._f.tell()
+
+    def add(self, kind, name, value=0.0, t_ns=None):
+        t = (t_ns or time.perf_counter_ns()) - self.t0
+        with self._lock:
+            key = self._keys.get(name)
+            if key is None:
+                key = self._keys[name] = len(self._keys)
+                self._new.append(name)
+            self._t.append(t)
+            self._kind.append(kind)
+            self._key.append(key)
+            self._value.append(value)
+            self.events += 1
+            if len(self._t) >= self.chunk:
+                self._write()
+
+    def add_trigger(self, addr, args, t_ns=None):
+        if not args:
+            self.add(TRIGGER, addr, 0.0, t_ns)
+        elif len(args) == 1 and isinstance(args[0], int):
+            self.add(TRIGGER_INT, addr, args[0], t_ns)
+        elif len(args) == 1 and isinstance(args[0], float):
+            self.add(TRIGGER_FLOAT, addr, args[0], t_ns)
+        else:
+            try:
+                name = json.dumps([addr, *args])
+            except (TypeError, ValueError):
+                self.skipped += 1
+                return
+            self.add(TRIGGER_ARGS, name, 0.0, t_ns)
+
+    def _write(self):
+        if self._f is None:
+            return
+        n = len(self._t)
+        rec = np.empty(n, RECORD)
+        rec["t_ns"] = np.frombuffer(self._t, np.int64)
+        rec["kind"] = np.frombuffer(self._kind, np.uint8)
+        rec["key"] = np.frombuffer(self._key, np.uint16)
+        rec["value"] = np.frombuffer(self._value, np.float32)
+        parts = [_U32.pack(len(self._new)), _U32.pack(n)]
+        for name in self._new:
+            b = name.encode()
+            parts += [_U16.pack(len(b)), b]
+        parts.append(rec.tobytes())
+        data = b"".join(parts)
+        self._f.write(data)
+        self._f.flush()
+        self.bytes += len(data)
+        self._new = []
+        for col in (self._t, self._kind, self._key, self._value):
+            del col[:]
+
+    def flush(self):
+        with self._lock:
+            if self._t or self._new:
+                self._write()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+    def stats(self):
+        return {"path": self.path, "events": self.events, "skipped": self.skipped, "bytes": self.bytes}
+
+
+class Log:
+    """A recording loaded whole: `records` is a RECORD array, `names` its key table."""
+
+    def __init__(self, source, wall, names, records):
+        self.source = source
+        self.wall = wall
+        self.names = names
+        self.records = records
+
+    @property
+    def duration(self):
+        return float(self.records["t_ns"][-1]) / 1e9 if len(self.records) else 0.0
+
+    def events(self):
+        """(t seconds, kind, name, args) in order; args as Engine.trigger() takes them."""
+        names = self.names
+        decoded = {}  # TRIGGER_ARGS key -> (addr, args)
+        for t, kind, key, value in zip((self.records["t_ns"] / 1e9).tolist(), self.records["kind"].tolist(),
+                                       self.records["key"].tolist(), self.records["value"].tolist()):
+            if kind == TRIGGER_ARGS:
+                if key not in decoded:
+                    addr, *args = json.loads(names[key])
+                    decoded[key] = addr, tuple(args)
+                addr, args = decoded[key]
+                yield t, kind, addr, args
+                continue
+            if kind == TRIGGER_INT:
+                args = (int(value),)
+            elif kind == TRIGGER:
+                args = ()
+            else:
+                args = (value,)
+            yield t, kind, names[key], args
+
+    def info(self):
+        counts = np.bincount(self.records["kind"], minlength=len(KIND_NAMES))
+        by_kind = {}
+        for k, c in enumerate(counts.tolist()):
+            by_kind[KIND_NAMES[k]] = by_kind.get(KIND_NAMES[k], 0) + c
+        d = self.duration
+        return {
+            "source": self.source,
+            "recorded": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.wall)),
+            "events": len(self.records),
+            "seconds": d,
+            "events_per_sec": len(self.records) / d if d else 0.0,
+            "kinds": by_kind,
+            "names": len(self.names),
+        }
+
+
+def read(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: not a tamburi control log")
+    o = len(MAGIC)
+    (n,) = _U32.unpack_from(data, o)
+    head = json.loads(data[o + 4:o + 4 + n])
+    o += 4 + n
+    names = []
+    blocks = []
+    while o + 8 <= len(data):
+        n_names, n_rec = _U32.unpack_from(data, o)[0], _U32.unpack_from(data, o + 4)[0]
+        o += 8
+        for _ in range(n_names):
+            (size,) = _U16.unpack_from(data, o)
+            names.append(data[o + 2:o + 2 + size].decode())
+            o += 2 + size
+        size = n_rec * RECORD.itemsize
+        if o + size > len(data):  # cut short while writing: keep what is whole
+            n_rec = (len(data) - o) // RECORD.itemsize
+            size = n_rec * RECORD.itemsize
+        blocks.append(np.frombuffer(data, RECORD, n_rec, o))
+        o += size
+    records = np.concatenate(blocks) if blocks else np.empty(0, RECORD)
+    return Log(head["source"], head["wall"], names, records)
+
+
+# --- replay ---
+def replay(log, engine, speed=1.0, stop=None):
+    """
+    Feed a log into a started engine: SET -> engine.set(), triggers -> engine.trigger(),
+    at the recorded times divided by `speed` (0 = no waiting). stop: Event to end early.
+    Returns {"events", "seconds", "late_ms_p50", "late_ms_max"}.
+    """
+    late = []
+    t_start = time.perf_counter()
+    n = 0
+    for t, kind, name, args in log.events():
+        if stop is not None and stop.is_set():
+            break
+        if speed > 0:
+            due = t_start + t / speed
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            late.append(time.perf_counter() - due)
+        if kind == SET:
+            engine.set(name, args[0])
+        elif kind == TAP:
+            continue
+        else:
+            engine.trigger(name, *args)
+        n += 1
+    late.sort()
+    return {
+        "events": n,
+        "seconds": time.perf_counter() - t_start,
+        "late_ms_p50": late[len(late) // 2] * 1e3 if late else 0.0,
+        "late_ms_max": late[-1] * 1e3 if late else 0.0,
+    }
+
+
+def make_engine(source, host=None, port=None):
+    """An engine like the one that recorded `source` (its name), started."""
+    kw = {k: v for k, v in (("host", host), ("port", port)) if v is not None}
+    if source == "front-panel":
+        from front_panel import make_engine as make_panel  # run from the repo root
+        return make_panel(**kw).start()
+    if source == "gpio":
+        from tamburi.engine import Engine
+        from tamburi.params import ParamTable
+        return Engine(ParamTable(), kw.get("host", "127.0.0.1"), kw.get("port", 57120), name="gpio").start()
+    from tamburi.siren import SirenController
+    return SirenController(**kw).start()
+
+
+def to_script(log, params=None):
+    """
+    (t, addr, args) events as the SynthDefs' OSCdefs see them, for tamburi.render:
+    control sets become one message per row of the control, mapped like the engine does.
+    """
+    if params is None:
+        from tamburi.siren import siren_params
+        params = siren_params()
+    out = []
+    for t, kind, name, args in log.events():
+        if kind == SET:
+            if name in params.groups:
+                out.extend((t, addr, [v]) for addr, v in params.mapped(name, args[0]))
+        elif kind != TAP:
+            out.append((t, name, list(args)))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("info")
+    p.add_argument("log")
+    p = sub.add_parser("play")
+    p.add_argument("log")
+    p.add_argument("--speed", type=float, default=1.0, help="x real time, 0 = no waiting")
+    p.add_argument("--host")
+    p.add_argument("--port", type=int)
+    p.add_argument("--loops", type=int, default=1)
+    p = sub.add_parser("script")
+    p.add_argument("log")
+    args = ap.parse_args()
+
+    log = read(args.log)
+    if args.cmd == "info":
+        print(json.dumps(log.info(), indent=1))
+    elif args.cmd == "script":
+        for t, addr, a in to_script(log):
+            sys.stdout.write(json.dumps([round(t, 6), addr, *a]) + "\n")
+    else:
+        engine = make_engine(log.source, args.host, args.port)
+        try:
+            for _ in range(args.loops):
+                print(json.dumps(replay(log, engine, args.speed)))
+            time.sleep(0.2)  # let the sender thread flush the last glide
+            print(json.dumps(engine.stats()["osc"]))
+        finally:
+            engine.stop()
+
+
+if __name__ == "__main__":
+    main()
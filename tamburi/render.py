@@ -0,0 +1,482 @@
+"""
+Offline render of the effettiera/second_test.scd patch (dubDelay, the three
+sirens, masterOut) with NumPy, faster than real time, no scsynth needed.
+
+    python -m tamburi.render -o /tmp/demo.wav              # built-in demo script
+    python -m tamburi.render set.jsonl -o set.wav --tail 6
+    python -m tamburi.render /tmp/set.tmbr -o set.wav           # a recorded session
+
+A script is one event per line, `[t, "/addr", args...]` with t in seconds
+(lines starting with # are skipped): the same messages the OSCdefs take,
+optional [lag] included, so a controller session replays as it was played.
+
+The signal graph mirrors the SynthDefs: sirens write dry to the master bus
+and send to the fx bus, the delay reads fx and writes master, masterOut
+applies the volume and the limiter. Differences from scsynth, all inaudible
+for regression checks: gates and toggles start at the block containing their
+time (BLOCK samples), filter cutoffs move once per block, Formant is a
+windowed-sine burst per period, LFPar is a sine, and every Limiter is one
+block late instead of 10 ms.
+
+Prints the realtime factor (audio seconds per wall second) and where the time
+went, to keep an eye on DSP cost as the patch grows.
+"""
+
+import argparse
+import json
+import math
+import time
+import wave
+
+import numpy as np
+
+from tamburi.dsp import (KR, Asr, Biquad, Lag, Limiter, Perc, Phase, Ramp, hpf, leakdc, lftri, lpf,
+                         rlpf, varsaw, xfade2)
+from tamburi.record import SUFFIX, read, to_script
+
+SR = 48000
+BLOCK = 512    # samples per render block, a multiple of KR
+TAIL = 4.0     # seconds rendered after the last event
+PAN_CENTRE = math.cos(math.pi / 4.0)  # Pan2 at 0
+TWO_PI = 2.0 * math.pi
+
+
+def _lag_arg(args):
+    return min(max(float(args[1]), 0.0), 2.0) if len(args) > 1 else None
+
+
+# --- sirens ---
+class _Siren:
+    """
+    One running synth. CONTROLS: name -> (default, min, max, default lag, warp),
+    mirroring the ~siren... state in the .scd; set() is the synth's .set(name, v, nameLag, lag).
+    """
+
+    CONTROLS = {}
+    ATTACK, RELEASE = 0.01, 0.2
+    DRY, SEND = 0.1, 0.1
+
+    def __init__(self, values, sr):
+        self.sr = sr
+        self.ctl = {name: Ramp(values[name], warp) for name, (_, _, _, _, warp) in self.CONTROLS.items()}
+        self.env = Asr(self.ATTACK, self.RELEASE, sr)
+        self.limiter = Limiter(0.98)
+
+    def set(self, name, value, lag, t):
+        self.ctl[name].set(value, t, lag)
+
+    def process(self, kt, n):
+        """Mono (n, 1) after env and limiter; kt: the control steps' times."""
+        sig = self.voice({k: r.at(kt) for k, r in self.ctl.items()}, n)
+        return self.limiter.process(sig * self.env.process(n)[:, None])
+
+    def voice(self, c, n):
+        raise NotImplementedError
+
+
+class DubSiren(_Siren):
+    CONTROLS = {
+        "freq": (1000.0, 500.0, 5000.0, 0.12, "exp"),
+        "rate": (0.6, 0.05, 5.0, 0.15, "exp"),
+        "depth": (0.55, 0.0, 1.0, 0.15, "lin"),
+    }
+    ATTACK, RELEASE = 0.015, 0.4
+    DRY, SEND = 0.10, 0.18
+    LP, HP, WOBBLE, WOBBLE_RATE = 3200.0, 120.0, 0.12, 0.22
+
+    def __init__(self, values, sr):
+        super().__init__(values, sr)
+        self.sweep = Phase()
+        self.vib = Phase()
+        self.wob = Phase()
+        self.osc = Phase()
+        self.lp = Biquad(lpf(self.LP, sr))
+        self.hp = Biquad(hpf(self.HP, sr))
+        self.dc = Biquad(leakdc())
+        self.hp20 = Biquad(hpf(20.0, sr))
+
+    def voice(self, c, n):
+        sr, k = self.sr, len(c["freq"])
+        sweep_depth = 0.15 * (2.8 / 0.15) ** c["depth"]
+        sweep = lftri(self.sweep.advance(c["rate"] * (KR / sr)))
+        vib = np.sin(TWO_PI * self.vib.advance(np.full(k, 5.0 * KR / sr))) * 0.006
+        f = np.clip(c["freq"] * (1.0 + sweep_depth * sweep), 30.0, 12000.0) * (1.0 + vib)
+
+        ph = self.osc.advance(np.repeat(f / sr, KR))
+        sig = np.tanh(varsaw(ph, 0.5) * 1.5)[:, None]
+        wob = self.wob.advance(np.full(k, self.WOBBLE_RATE * KR / sr))[0]
+        self.lp.set(lpf(self.LP + (0.5 + 0.5 * math.sin(TWO_PI * wob)) * self.WOBBLE * self.LP, sr))
+        sig = self.hp.process(self.lp.process(sig))
+        return self.hp20.process(self.dc.process(sig))
+
+
+class AirSiren(_Siren):
+    CONTROLS = {
+        "freq": (450.0, 200.0, 2000.0, 0.10, "exp"),
+        "rate": (0.18, 0.05, 1.5, 0.20, "exp"),
+        "depth": (0.60, 0.0, 1.0, 0.20, "lin"),
+    }
+    ATTACK, RELEASE = 0.02, 0.7
+    DRY, SEND = 0.07, 0.16
+    DUTY, RATIO, TONE, RQ = 0.78, 9.0, 0.35, 0.55
+
+    def __init__(self, values, sr):
+        super().__init__(values, sr)
+        self.cycle = Phase()
+        self.fm = Phase()
+        self.osc = Phase()
+        self.sub = Phase()
+        self.res = Biquad(rlpf(1000.0, self.RQ, sr))
+        self.hp = Biquad(hpf(70.0, sr))
+        self.lp = Biquad(lpf(3200.0, sr))
+        self.dc = Biquad(leakdc())
+        self.hp20 = Biquad(hpf(20.0, sr))
+
+    def voice(self, c, n):
+        sr, k = self.sr, len(c["freq"])
+        depth = c["depth"]
+        # Phasor.kr(0, rate / SampleRate.ir): steps once per control period, as in the SynthDef
+        ph = self.cycle.advance(c["rate"] / sr)
+        x = np.where(ph < self.DUTY, ph / self.DUTY, 1.0 - (ph - self.DUTY) / (1.0 - self.DUTY))
+        curve = np.clip(x, 0.0, 1.0) ** 1.7
+        span = np.clip(self.RATIO + depth * 5.0, 1.0, 12.0)
+        f = np.clip(c["freq"] * span ** curve, 40.0, 12000.0)
+        f = np.clip(f * (1.0 + np.sin(TWO_PI * self.fm.advance(np.full(k, 0.22 * KR / sr))) * 0.008), 40.0, 12000.0)
+        follow = 0.12 + 0.88 * curve
+
+        fa = np.repeat(f / sr, KR)
+        ph = self.osc.advance(fa)
+        # Formant(f, f * 1.5, f * 2.5): a Hann-windowed formant sine from each period start
+        tw = ph * 2.5
+        sig = np.sin(TWO_PI * 1.5 * ph) * np.where(tw < 1.0, 0.5 - 0.5 * np.cos(TWO_PI * tw), 0.0) * 0.6
+        extra = np.sin(TWO_PI * ph) * 0.25 + varsaw(self.sub.advance(fa * 0.5), 0.2) * 0.15
+        sig = (sig + extra * self.TONE)[:, None]
+
+        res = min(max(0.35 + depth[0] * 0.35, 0.0), 1.0)
+        self.res.set(rlpf(min(max(f[0] * (1.0 + res * 2.0), 200.0), 8000.0), self.RQ, sr))
+        self.lp.set(lpf(min(max(3200.0 + depth[0] * 3500.0, 300.0), 16000.0), sr))
+        sig = self.lp.process(self.hp.process(self.res.process(sig)))
+        grit = np.clip(0.18 + depth * 0.25, 0.0, 1.0)
+        sig = np.tanh(sig * np.repeat(1.0 + grit * 6.0, KR)[:, None]) * np.repeat(follow, KR)[:, None]
+        return self.hp20.process(self.dc.process(sig))
+
+
+class Bens(_Siren):
+    CONTROLS = {
+        "freq": (1200.0, 500.0, 5000.0, 0.08, "exp"),
+        "rate": (4.0, 0.5, 12.0, 0.10, "exp"),
+        "tone": (0.25, 0.0, 1.0, 0.10, "lin"),
+        "drive": (0.15, 0.0, 1.0, 0.10, "lin"),
+    }
+    ATTACK, RELEASE = 0.012, 0.2
+    DRY, SEND = 0.045, 0.11
+
+    def __init__(self, values, sr):
+        super().__init__(values, sr)
+        self.beat = Phase()
+        self.glide = Lag(values["freq"], 0.010, sr)
+        self.bip = Perc(0.0018, 0.040, sr)
+        self.osc = Phase()
+        self.sub = Phase()
+        self.dc = Biquad(leakdc())
+        self.hp = Biquad(hpf(60.0, sr))
+        self.lp = Biquad(lpf(8400.0, sr))
+
+    def voice(self, c, n):
+        sr = self.sr
+        inc = c["rate"] * (KR / sr)
+        ph = self.beat.advance(inc)
+        trig = np.flatnonzero(ph < inc)  # Impulse.kr fires where the phase wrapped
+        # LFPulse high for the first half of the beat: the second, lower tone
+        fsel = np.where(ph < 0.5, np.clip(c["freq"] * 0.82, 500.0, 5000.0), c["freq"])
+        fg = self.glide.process(fsel)
+
+        fa = np.repeat(fg / sr, KR)
+        ph = self.osc.advance(fa)
+        sine = np.sin(TWO_PI * ph) * 0.95
+        body = varsaw(ph, 0.25) * 0.35 + np.where(self.sub.advance(fa * 0.5) < 0.5, 0.12, -0.12)
+        sig = xfade2(sine, body, np.repeat(c["tone"] * 2.0 - 1.0, KR))
+        drive = np.repeat(c["drive"], KR)
+        sig = np.tanh(sig * (1.0 + drive * 10.0)) / (1.0 + drive * 2.0)
+        sig = (sig * self.bip.process(n, trig))[:, None]
+
+        self.lp.set(lpf(min(max(fg[0] * 7.0, 1500.0), 12000.0), sr))
+        return self.lp.process(self.hp.process(self.dc.process(sig)))
+
+
+class SirenSlot:
+    """The ~siren / ~air / ~bens variable plus its state: toggle, stop and set, as the OSCdefs do."""
+
+    def __init__(self, cls, sr):
+        self.cls = cls
+        self.sr = sr
+        self.values = {k: d for k, (d, _, _, _, _) in cls.CONTROLS.items()}
+        self.lags = {k: lag for k, (_, _, _, lag, _) in cls.CONTROLS.items()}
+        self.current = None
+
+    def handle(self, cmd, args, t, voices):
+        if cmd == "toggle":
+            if self.current is None:
+                self.current = self.cls(self.values, self.sr)
+                voices.append(self.current)
+            else:
+                self.stop()
+        elif cmd == "stop":
+            self.stop()
+        elif cmd in self.values:
+            _, lo, hi, _, _ = self.cls.CONTROLS[cmd]
+            self.values[cmd] = min(max(float(args[0]), lo), hi)
+            lag = _lag_arg(args)
+            if lag is not None:
+                self.lags[cmd] = lag
+            if self.current is not None:
+                self.current.set(cmd, self.values[cmd], self.lags[cmd], t)
+        else:
+            raise KeyError(cmd)
+
+    def stop(self):
+        if self.current is not None:
+            self.current.env.release()  # keeps sounding through its release, then freed
+            self.current = None
+
+
+# --- delay + master ---
+class DubDelay:
+    MAX_DELAY = 2.0
+
+    def __init__(self, sr, block):
+        if 0.03 * sr < block + 4:
+            raise ValueError(f"block {block} too long for the 30 ms minimum delay at {sr} Hz")
+        self.sr = sr
+        self.time = Ramp(0.33)
+        self.time_lag = 0.35
+        self.fb = Ramp(0.55)
+        self.fb_lag = 0.20
+        self.clear_until = -1.0
+        self.wobble = Phase()
+        self.dly = Lag(0.33, 0.04, sr)
+        self.d_prev = 0.33 * sr
+        self.size = int(self.MAX_DELAY * sr) + block + 8
+        self.buf = np.zeros((self.size, 2))
+        self.w = 0
+        self.loop_tail = np.zeros((KR, 2))  # LocalIn: last control block's LocalOut
+        self.hp = Biquad(hpf(160.0, sr), 2)
+        self.lp1 = Biquad(lpf(3800.0, sr), 2)
+        self.lp2 = Biquad(lpf(3800.0 * (1.0 - 0.45 * 0.7), sr), 2)
+        self.limiter = Limiter(0.98)
+
+    def handle(self, cmd, args, t):
+        if cmd == "time":
+            self.time_lag = _lag_arg(args) if len(args) > 1 else self.time_lag
+            self.time.set(min(max(float(args[0]), 0.03), 2.0), t, self.time_lag)
+        elif cmd == "fb":
+            self.fb_lag = _lag_arg(args) if len(args) > 1 else self.fb_lag
+            self.fb.set(min(max(float(args[0]), 0.0), 0.92), t, self.fb_lag)
+        elif cmd == "clear":
+            self.clear_until = t + 0.06  # Trig1.kr(clear, 0.06)
+        else:
+            raise KeyError(cmd)
+
+    def process(self, x, kt):
+        sr, n, k = self.sr, len(x), len(kt)
+        gain = np.repeat(np.where(kt < self.clear_until, 0.0, 1.0), KR)[:, None]
+        fb = np.repeat(self.fb.at(kt), KR)[:, None]
+        wob = np.sin(TWO_PI * self.wobble.advance(np.full(k, 0.25 * KR / sr))) * 0.002
+        d = self.dly.process(np.clip(self.time.at(kt) + wob, 0.03, 2.0)) * sr
+        # DelayC ramps a control-rate delay time across the block
+        starts = np.concatenate(([self.d_prev], d[:-1]))
+        d = (starts[:, None] + (d - starts)[:, None] * (np.arange(1, KR + 1) / KR)).ravel()
+        self.d_prev = d[-1]
+
+        # the read is at least 30 ms back, older than the whole block: one gather, cubic
+        pos = self.w + np.arange(n) - d
+        i0 = np.floor(pos).astype(np.int64)
+        fr = (pos - i0)[:, None]
+        xm1, x0, x1, x2 = (self.buf[(i0 + o) % self.size] for o in (-1, 0, 1, 2))
+        c1 = 0.5 * (x1 - xm1)
+        c2 = xm1 - 2.5 * x0 + 2.0 * x1 - 0.5 * x2
+        c3 = 0.5 * (x2 - xm1) + 1.5 * (x0 - x1)
+        wet = ((c3 * fr + c2) * fr + c1) * fr + x0
+
+        out = wet * fb * gain  # LocalOut, heard by LocalIn one control block later
+        loop = np.concatenate((self.loop_tail, out[:-KR]))
+        self.loop_tail = out[-KR:]
+        sig = self.lp2.process(self.lp1.process(self.hp.process(x + loop * gain)))
+        sig = np.tanh(sig * 1.6)
+        idx = (self.w + np.arange(n)) % self.size
+        self.buf[idx] = sig
+        self.w = (self.w + n) % self.size
+
+        return self.limiter.process(xfade2(x, wet, 1.0))  # mix 1, level 1
+
+
+class Master:
+    def __init__(self):
+        self.vol = Ramp(0.25)
+        self.vol_lag = 0.002
+        self.limiter = Limiter(0.98)
+
+    def handle(self, cmd, args, t):
+        if cmd != "vol":
+            raise KeyError(cmd)
+        self.vol_lag = _lag_arg(args) if len(args) > 1 else self.vol_lag
+        self.vol.set(min(max(float(args[0]), 0.0), 1.0), t, min(self.vol_lag, 0.2))
+
+    def process(self, x, kt):
+        return self.limiter.process(x * np.repeat(self.vol.at(kt), KR)[:, None])
+
+
+class Patch:
+    def __init__(self, sr=SR, block=BLOCK):
+        if block % KR:
+            raise ValueError(f"block must be a multiple of {KR}")
+        self.sr = sr
+        self.block = block
+        self.voices = []
+        self.slots = {"siren": SirenSlot(DubSiren, sr), "air": SirenSlot(AirSiren, sr),
+                      "bens": SirenSlot(Bens, sr)}
+        self.delay = DubDelay(sr, block)
+        self.master = Master()
+        self.seconds = {"sirens": 0.0, "delay": 0.0, "master": 0.0}
+        self.unknown = 0
+
+    def handle(self, t, addr, args):
+        head, _, cmd = addr.strip("/").partition("/")
+        try:
+            if head in self.slots:
+                self.slots[head].handle(cmd, args, t, self.voices)
+            elif head == "delay":
+                self.delay.handle(cmd, args, t)
+            elif head == "master":
+                self.master.handle(cmd, args, t)
+            else:
+                raise KeyError(addr)
+        except (KeyError, IndexError, ValueError):
+            self.unknown += 1  # sclang has no OSCdef for it (or bad args): dropped there too
+
+    def process(self, t0):
+        n = self.block
+        kt = t0 + np.arange(n // KR) * (KR / self.sr)
+
+        t = time.perf_counter()
+        dry = np.zeros((n, 1))
+        send = np.zeros((n, 1))
+        for v in self.voices:
+            sig = v.process(kt, n) * PAN_CENTRE
+            dry += sig * v.DRY
+            send += sig * v.SEND
+        self.voices = [v for v in self.voices if not (v.env.done and v.limiter.prev_peak == 0.0)]
+        t1 = time.perf_counter()
+        mix = dry + self.delay.process(np.repeat(send, 2, axis=1), kt)
+        t2 = time.perf_counter()
+        out = self.master.process(mix, kt)
+        t3 = time.perf_counter()
+
+        self.seconds["sirens"] += t1 - t
+        self.seconds["delay"] += t2 - t1
+        self.seconds["master"] += t3 - t2
+        return out
+
+
+def render(events, sr=SR, block=BLOCK, tail=TAIL):
+    """events: (t, addr, args) sorted by t. Returns (float stereo array, stats dict)."""
+    patch = Patch(sr, block)
+    end = (events[-1][0] if events else 0.0) + tail
+    nblocks = int(math.ceil(end * sr / block))
+    out = np.empty((nblocks * block, 2))
+    i = 0
+    wall = time.perf_counter()
+    for b in range(nblocks):
+        t0 = b * block / sr
+        t1 = t0 + block / sr
+        while i < len(events) and events[i][0] < t1:
+            patch.handle(*events[i])
+            i += 1
+        out[b * block:(b + 1) * block] = patch.process(t0)
+    wall = time.perf_counter() - wall
+    audio = len(out) / sr
+    stats = {
+        "audio_seconds": audio,
+        "wall_seconds": wall,
+        "realtime_factor": audio / wall if wall else float("inf"),
+        "events": len(events),
+        "unknown_events": patch.unknown,
+        "share": {k: v / wall for k, v in patch.seconds.items()},
+        "peak": float(np.max(np.abs(out))) if len(out) else 0.0,
+    }
+    return out, stats
+
+
+def load_script(path):
+    """JSONL script, or a control log from tamburi.record (*.tmbr)."""
+    if path.endswith(SUFFIX):
+        return sorted(to_script(read(path)), key=lambda e: e[0])
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            t, addr, *args = json.loads(line)
+            events.append((float(t), addr, args))
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def demo_script():
+    """About 20 s touching every synth and most controls."""
+    return [
+        (0.0, "/siren/toggle", []),
+        (1.0, "/siren/freq", [2200.0, 0.8]),
+        (2.0, "/siren/rate", [2.5]),
+        (3.0, "/siren/depth", [0.9, 0.5]),
+        (4.0, "/delay/time", [0.5, 0.6]),
+        (4.0, "/delay/fb", [0.45]),
+        (5.5, "/siren/toggle", []),
+        (6.0, "/air/toggle", []),
+        (7.0, "/air/freq", [700.0, 1.0]),
+        (8.0, "/air/depth", [1.0, 0.5]),
+        (9.5, "/bens/toggle", []),
+        (10.5, "/bens/rate", [8.0]),
+        (11.0, "/bens/tone", [0.8, 0.3]),
+        (11.5, "/bens/drive", [0.6]),
+        (12.0, "/air/stop", []),
+        (13.0, "/delay/time", [0.18, 0.05]),
+        (14.0, "/bens/toggle", []),
+        (14.5, "/delay/clear", []),
+        (15.0, "/siren/toggle", []),
+        (15.5, "/master/vol", [0.4, 0.2]),
+        (17.0, "/siren/stop", []),
+    ]
+
+
+def write_wav(path, x, sr):
+    pcm = (np.clip(x, -1.0, 1.0) * 32767.0).astype("<i2")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(x.shape[1])
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(pcm.tobytes())
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("script", nargs="?", help="events, one [t, addr, args...] per line (default: demo)")
+    ap.add_argument("-o", "--out", default="render.wav")
+    ap.add_argument("--sr", type=int, default=SR)
+    ap.add_argument("--block", type=int, default=BLOCK)
+    ap.add_argument("--tail", type=float, default=TAIL, help="seconds after the last event")
+    args = ap.parse_args()
+
+    events = load_script(args.script) if args.script else demo_script()
+    out, stats = render(events, args.sr, args.block, args.tail)
+    write_wav(args.out, out, args.sr)
+    share = "  ".join(f"{k} {v * 100:0.0f}%" for k, v in stats["share"].items())
+    print(f"{args.out}: {stats['audio_seconds']:0.1f} s in {stats['wall_seconds']:0.2f} s  "
+          f"x{stats['realtime_factor']:0.1f} realtime  ({share})  peak {stats['peak']:0.3f}")
+    if stats["unknown_events"]:
+        print(f"{stats['unknown_events']} event(s) with no handler in the patch, skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+One process per rig, no display needed: the siren engine plus whichever
+front ends are plugged in, all sharing one sender thread and one socket.
+
+    python -m tamburi.rig --gpio            # Pi: pads + pause/stop -> /play ...
+    python -m tamburi.rig --keys --stats 2  # keyboard (controller.py keymap) + stats every 2 s
+
+The Tk window (effettiera/controller.py) is the same engine with a GUI on top.
+"""
+
+import argparse
+import json
+import signal
+import threading
+
+from tamburi.siren import SirenController, KEYMAP, SC_IP, SC_PORT
+
+GPIO_PINS = [17, 27, 22]
+GPIO_PAUSE_PIN = 5
+GPIO_STOP_PIN = 6
+
+
+def attach_keys(siren):
+    """pynput listener with the controller.py key bindings; returns it started."""
+    from pynput import keyboard
+
+    special = {
+        "Left": keyboard.Key.left, "Right": keyboard.Key.right,
+        "Up": keyboard.Key.up, "Down": keyboard.Key.down,
+        "Escape": keyboard.Key.esc,
+    }
+    actions = {}
+    for key, action in KEYMAP.items():
+        fn = getattr(siren, action)
+        if key in special:
+            actions[special[key]] = fn
+        else:
+            actions[key] = fn
+            actions[key.upper()] = fn
+
+    def on_press(key):
+        fn = actions.get(key) or actions.get(getattr(key, "char", None))
+        if fn is not None:
+            fn()
+
+    listener = keyboard.Listener(on_press=on_press)
+    listener.start()
+    return listener
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default=SC_IP)
+    ap.add_argument("--port", type=int, default=SC_PORT)
+    ap.add_argument("--keys", action="store_true", help="pynput keyboard with the controller.py keymap")
+    ap.add_argument("--gpio", action="store_true", help="GPIO sample pads + pause/stop")
+    ap.add_argument("--stats", type=float, default=0.0, metavar="SEC", help="print engine stats every SEC")
+    ap.add_argument("--metrics-sock", default="/tmp/tamburi-rig.sock", help="UNIX socket for JSON stats ('' = off)")
+    ap.add_argument("--hub", metavar="PATH", help="send through the control hub (python -m tamburi.hub) at PATH")
+    ap.add_argument("--route", action="append", default=[], metavar="HOST:PORT",
+                    help="also send the stream there (repeatable), e.g. a backup engine")
+    ap.add_argument("--record", metavar="PATH", help="log every control event (python -m tamburi.record)")
+    ap.add_argument("--adapt", action="store_true",
+                    help="follow scsynth load: /status + ping feedback lowers the send rate (tamburi.feedback)")
+    args = ap.parse_args()
+
+    routes = [{"host": h, "port": int(p)} for h, p in (r.rsplit(":", 1) for r in args.route)]
+    siren = SirenController(args.hub or args.host, args.port, routes=routes).start()
+    if args.metrics_sock:
+        siren.serve_metrics(args.metrics_sock)
+    if args.record:
+        siren.record(args.record)
+    if args.adapt:
+        siren.adapt(args.host, lang_port=args.port)
+    closers = []
+    if args.keys:
+        closers.append(attach_keys(siren).stop)
+    if args.gpio:
+        from tamburi.gpio import GpioPads
+        closers.append(GpioPads(siren, GPIO_PINS, GPIO_PAUSE_PIN, GPIO_STOP_PIN).close)
+
+    done = threading.Event()
+    signal.signal(signal.SIGINT, lambda *a: done.set())
+    signal.signal(signal.SIGTERM, lambda *a: done.set())
+    print(f"rig up -> {args.host}:{args.port}  (Ctrl+C to quit)")
+    while not done.wait(args.stats or None):
+        print(json.dumps(siren.stats()))
+
+    for close in closers:
+        close()
+    siren.stop()
+
+
+if __name__ == "__main__":
+    main()
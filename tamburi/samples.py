@@ -0,0 +1,285 @@
+"""
+Sample bank for pygame.mixer: only the attack of each sample stays in RAM, the
+rest is streamed from disk in chunks queued behind it on the same Channel.
+
+    bank = SampleBank({17: "sounds/a.mp3", 27: "sounds/b.wav"}, budget_bytes=64 << 20)
+    bank.preload()              # attacks, in mapping order, until the budget is full
+    bank.play(17, channel)      # instant: the attack is resident (or loaded now, a miss)
+
+Sources are read as PCM in the mixer format (rate, 16-bit, channels):
+WAVs already in that format are mapped in place; anything else (MP3, OGG,
+other rates) is decoded once by pygame into the PcmCache and mapped from
+there on every later boot. Resident attacks are kept in LRU order and the least
+recently played are dropped when a new one would go over budget; a dropped
+sample costs one attack-sized disk read the next time it is pressed.
+
+With an analysis index (tamburi.analysis) every sample starts at its onset,
+not at frame 0, and plays at its levelling gain: Channel volumes stop at 1.0,
+so gains are taken relative to the highest one in the bank (the quietest
+sample plays at full volume, the others are turned down to match).
+
+pygame.mixer must be initialised before a bank is created.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import as_completed
+
+import numpy as np
+import pygame
+
+from tamburi.analysis import SampleIndex
+from tamburi.pcmcache import PcmCache, PcmSource, decode_job, decode_pool, wav_format
+
+ATTACK_SECONDS = 1.0   # resident per sample: enough for the streamer to queue the first chunk
+CHUNK_SECONDS = 0.5    # streamed piece queued behind what is playing
+POLL_SECONDS = 0.02    # streamer wake-up; well under CHUNK_SECONDS
+LEVEL_WINDOW = 0.05    # level(): RMS over this much audio
+
+
+class _Stream:
+    __slots__ = ("key", "pos", "left")
+
+    def __init__(self, key, pos, left):
+        self.key = key
+        self.pos = pos
+        self.left = left
+
+
+class SampleBank:
+    def __init__(self, files, budget_bytes=64 << 20, attack=ATTACK_SECONDS, chunk=CHUNK_SECONDS,
+                 cache=None, index=None, trim=True, normalize=True):
+        """
+        files: key (e.g. GPIO pin) -> path. budget_bytes: resident attacks, all samples
+        together. cache: PcmCache for decoded files (default: the per-user one).
+        index: SampleIndex (default: the per-user one, if trim or normalize).
+        trim: start at the analysed onset. normalize: play at the analysed gain.
+        """
+        freq, size, channels = pygame.mixer.get_init()
+        if abs(size) != 16:
+            raise ValueError(f"SampleBank needs a 16-bit mixer, got {size}")
+        self.freq = freq
+        self.channels = channels
+        self.frame = 2 * channels
+        self.attack_bytes = int(attack * freq) * self.frame
+        self.chunk_bytes = int(chunk * freq) * self.frame
+        self.budget = budget_bytes
+
+        self.files = dict(files)
+        self.cache = cache or PcmCache(freq, channels)
+        self._sources = {}              # key -> PcmSource, kept across evictions
+        self._resident = OrderedDict()  # key -> (attack Sound, bytes), LRU first
+        self.resident_bytes = 0
+
+        self.trim = trim
+        self.normalize = normalize
+        self.index = index if index is not None or not (trim or normalize) else SampleIndex()
+        self.start = {}  # key -> byte offset of the onset in its PcmSource
+        self.gain = {}   # key -> analysed gain (linear)
+        self._gain_top = 1.0
+
+        self._streams = {}  # Channel -> _Stream
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sample-stream", daemon=True)
+        self._thread.start()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.chunks = 0
+        self.underruns = 0
+        self.load_times = {}  # key -> (how, seconds) from preload()
+
+    # --- loading ---
+    def _source(self, key):
+        src = self._sources.get(key)
+        if src is None:
+            src = self._sources[key] = self._index(self.files[key])
+            self._analyse(key, src)
+        return src
+
+    def _analyse(self, key, src):
+        if self.index is None:
+            return
+        pcm = np.frombuffer(src.view(0, src.nbytes), dtype=np.int16).reshape(-1, self.channels)
+        a = self.index.get(self.files[key], pcm, self.freq)
+        if self.trim:
+            self.start[key] = int(a["onset"] * self.freq) * self.frame
+        if self.normalize:
+            self.gain[key] = a["gain"]
+            self._gain_top = max(self.gain.values())
+
+    def volume(self, key):
+        """Channel volume for `key`: its gain relative to the loudest-boosted sample."""
+        g = self.gain.get(key)
+        return 1.0 if g is None else g / self._gain_top
+
+    def _index(self, path):
+        if wav_format(path) == (self.freq, 2, self.channels):
+            return PcmSource.from_wav(path)
+        # anything else: SDL decodes / resamples it once, later boots map the cache entry
+        return self.cache.get(path, lambda p: pygame.mixer.Sound(p).get_raw())
+
+    def _load(self, key):
+        src = self._source(key)
+        start = self.start.get(key, 0)
+        # short samples are kept whole: not worth a stream
+        left = src.nbytes - start
+        n = left if left <= self.attack_bytes + self.chunk_bytes else self.attack_bytes
+        data = src.view(start, n)
+        while self._resident and self.resident_bytes + len(data) > self.budget:
+            _, (_, nbytes) = self._resident.popitem(last=False)
+            self.resident_bytes -= nbytes
+            self.evictions += 1
+        entry = self._resident[key] = (pygame.mixer.Sound(buffer=data), len(data))
+        self.resident_bytes += len(data)
+        return entry
+
+    def _ready(self, key, src, how, seconds, on_ready):
+        self._analyse(key, src)  # before the lock: a first analysis reads the whole file
+        with self._lock:
+            self._sources[key] = src
+            if key not in self._resident and self.resident_bytes + self.attack_bytes <= self.budget:
+                self._load(key)
+        self.load_times[key] = (how, seconds)
+        if on_ready is not None:
+            on_ready(key, how, seconds)
+
+    def preload(self, workers=1, on_ready=None):
+        """
+        Index every file and load attacks in mapping order while they fit the budget.
+        workers > 1: cache misses are decoded in that many processes, and each sample
+        is ready as soon as its own decode is done. on_ready(key, how, seconds) is
+        called on this thread per sample, how in "wav" / "cache" / "decoded".
+        """
+        todo = []
+        for key, path in self.files.items():
+            t0 = time.perf_counter()
+            if key in self._sources:
+                continue
+            if wav_format(path) == (self.freq, 2, self.channels):
+                self._ready(key, PcmSource.from_wav(path), "wav", time.perf_counter() - t0, on_ready)
+                continue
+            src, out = self.cache.lookup(path)
+            if src is not None:
+                self._ready(key, src, "cache", time.perf_counter() - t0, on_ready)
+            elif workers <= 1:
+                src = self.cache.decode_into(out, path, lambda p: pygame.mixer.Sound(p).get_raw())
+                self._ready(key, src, "decoded", time.perf_counter() - t0, on_ready)
+            else:
+                todo.append((key, path, out))
+        if len(todo) == 1:  # not worth starting a pool (spawning + importing pygame)
+            (key, path, out), = todo
+            t0 = time.perf_counter()
+            src = self.cache.decode_into(out, path, lambda p: pygame.mixer.Sound(p).get_raw())
+            self._ready(key, src, "decoded", time.perf_counter() - t0, on_ready)
+        if len(todo) <= 1:
+            return
+
+        t0 = time.perf_counter()
+        with decode_pool(self.freq, self.channels, min(workers, len(todo))) as pool:
+            jobs = {pool.submit(decode_job, path, out, self.freq, self.channels): (key, out)
+                    for key, path, out in todo}
+            for fut in as_completed(jobs):
+                key, out = jobs[fut]
+                self.cache.decode_seconds += fut.result()
+                # wall time since the pool started: when this button came online
+                self._ready(key, PcmSource.from_wav(out), "decoded", time.perf_counter() - t0, on_ready)
+
+    # --- playing ---
+    def play(self, key, channel):
+        """Start `key` on `channel` (replacing whatever it played); streams the rest if long."""
+        with self._lock:
+            entry = self._resident.get(key)
+            if entry is None:
+                self.misses += 1
+                entry = self._load(key)
+            else:
+                self.hits += 1
+                self._resident.move_to_end(key)
+            snd, played = entry
+            self._streams.pop(channel, None)
+            channel.set_volume(self.volume(key))
+            channel.play(snd)
+            src = self._sources[key]
+            pos = self.start.get(key, 0) + played
+            if src.nbytes > pos:
+                self._streams[channel] = _Stream(key, pos, src.nbytes - pos)
+
+    def release(self, channel):
+        """Stop streaming into `channel` (its voice was stolen / choked and is fading out)."""
+        with self._lock:
+            self._streams.pop(channel, None)
+
+    def level(self, key, seconds, window=LEVEL_WINDOW):
+        """RMS (0..1) of `key` around `seconds` into the sample; 0 past its end."""
+        src = self._sources.get(key)
+        if src is None:
+            return 0.0
+        start = self.start.get(key, 0) + int(seconds * self.freq) * self.frame
+        n = int(window * self.freq) * self.frame
+        x = np.frombuffer(src.view(start, n), dtype=np.int16)
+        if not len(x):
+            return 0.0
+        return float(np.sqrt(np.mean(np.square(x, dtype=np.float64)))) / 32768.0
+
+    def stop_all(self):
+        """Forget every stream (call with pygame.mixer.stop())."""
+        with self._lock:
+            self._streams = {}
+
+    def _run(self):
+        while not self._stop.wait(POLL_SECONDS):
+            with self._lock:
+                todo = []
+                for ch, st in list(self._streams.items()):
+                    if not ch.get_busy():  # stopped, or the queue ran dry
+                        if st.left > 0:
+                            self.underruns += 1
+                        del self._streams[ch]
+                    elif ch.get_queue() is None:
+                        if st.left > 0:
+                            todo.append((ch, st, self._sources[st.key]))
+                        else:
+                            del self._streams[ch]
+            # page faults outside the lock: play() from a button never waits on the disk
+            for ch, st, src in todo:
+                data = src.view(st.pos, min(self.chunk_bytes, st.left))
+                snd = pygame.mixer.Sound(buffer=data) if len(data) else None
+                with self._lock:
+                    if self._streams.get(ch) is not st:
+                        continue  # retriggered or stopped meanwhile
+                    if snd is None:  # file shorter than its header says
+                        st.left = 0
+                        continue
+                    st.pos += len(data)
+                    st.left -= len(data)
+                    ch.queue(snd)
+                    self.chunks += 1
+
+    def stats(self):
+        return {
+            "samples": len(self.files),
+            "resident": len(self._resident),
+            "resident_bytes": self.resident_bytes,
+            "budget_bytes": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "streams": len(self._streams),
+            "chunks": self.chunks,
+            "underruns": self.underruns,
+            "cache": self.cache.stats(),
+            "analysis": self.index.stats() if self.index is not None else None,
+        }
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(1.0)
+        self.stop_all()
+        self._resident.clear()
+        self.resident_bytes = 0
+        for src in self._sources.values():
+            src.close()
@@ -0,0 +1,197 @@
+"""
+The delay + master vol + 3 sirens rig (effettiera/second_test.scd), headless.
+
+SirenController is the Engine with this rig's parameter table and the actions
+the front ends map to keys / sliders / buttons: steps, tap tempo, true x2,
+siren toggles. effettiera/controller.py is the Tk front end on top of it.
+
+Once the taps give a tempo, siren toggles and the delay time set by a tap or
+x2 are quantized: sent at once, timetagged for the next QUANTIZE beat that is
+at least SCHEDULE_LATENCY away, and played there by scsynth (second_test.scd
+schedules them with s.makeBundle). Before the first tempo, or with
+quantize = 0, they act immediately as before. Stops and clear never wait.
+"""
+
+import time
+
+from tamburi.engine import Engine
+from tamburi.params import ParamTable, EXP
+from tamburi.record import TAP
+from tamburi.tempo import TempoClock
+
+SC_IP = "127.0.0.1"
+SC_PORT = 57120
+
+TIME_STEP = 0.02
+FB_STEP = 0.03
+VOL_STEP = 0.05
+
+TIME_MIN, TIME_MAX = 0.03, 2.0
+FB_MIN, FB_MAX = 0.0, 0.92
+VOL_MIN, VOL_MAX = 0.0, 1.0
+
+# Per-siren pitch ranges
+S1_HZ_MIN, S1_HZ_MAX = 500.0, 5000.0
+BENS_HZ_MIN, BENS_HZ_MAX = 500.0, 5000.0
+AIR_HZ_MIN, AIR_HZ_MAX = 200.0, 2000.0
+
+# Per-siren rate ranges
+S1_RATE_MIN, S1_RATE_MAX = 0.05, 5.0
+BENS_RATE_MIN, BENS_RATE_MAX = 0.5, 12.0
+AIR_RATE_MIN, AIR_RATE_MAX = 0.05, 1.5
+
+SEND_HZ = 120.0
+
+# beat grid for toggles / tapped delay times: 1 = next beat, 0.5 = next 8th, 0 = off (immediate)
+QUANTIZE = 1.0
+# how far ahead a quantized event is sent at least: > the worst Python -> sclang -> scsynth path
+SCHEDULE_LATENCY = 0.05
+
+# True: everything that changed in a tick goes out as ONE bundle (one timetag, one datagram)
+# False: old path, one datagram per parameter (keep for A/B)
+SEND_BUNDLES = True
+
+# smoothing (audio-safe), time constants in seconds, applied with the measured tick dt
+# (same glide as the old per-tick alphas 0.06 / 0.10 / 0.12 at 120 Hz)
+DELAY_TAU = 0.135
+FB_TAU = 0.135
+
+PITCH_TAU = 0.079
+RATE_TAU  = 0.065
+
+S1_DEPTH_TAU = 0.079
+AIR_DEPTH_TAU = 0.079
+
+BENS_TONE_TAU  = 0.065
+BENS_DRIVE_TAU = 0.065
+
+# sleep completely once everything is sent and converged, wake on the next slider/key/tap
+IDLE_SLEEP = True
+
+# False: smooth here and stream every intermediate value (reference for A/B)
+# True: send only the new target + a glide time, the SynthDef VarLags glide inside scsynth
+SERVER_SMOOTHING = False
+GLIDE_PER_TAU = 3.0  # glide sent = 3 tau, where the one-pole is ~95% of the way
+
+
+def clamp(x, lo, hi):
+    return lo if x < lo else hi if x > hi else x
+
+
+def siren_params():
+    """One row per OSC address of second_test.scd, in the order they used to be sent."""
+    p = ParamTable()
+
+    p.add("/delay/time", 0.33, DELAY_TAU,   TIME_MIN, TIME_MAX, eps=0.0005, group="delay_time")
+    p.add("/delay/fb",   0.55, FB_TAU,      FB_MIN,   FB_MAX,   eps=0.0005, group="fb")
+    p.add("/master/vol", 0.25, 0.0,         VOL_MIN,  VOL_MAX,  eps=0.0005, group="vol")
+
+    # shared PITCH / RATE (0..1) -> per-siren exp ranges
+    p.add("/siren/freq",  0.55, PITCH_TAU, eps=1.0,  curve=EXP, vmin=S1_HZ_MIN, vmax=S1_HZ_MAX, group="pitch")
+    p.add("/siren/rate",  0.45, RATE_TAU,  eps=0.01, curve=EXP, vmin=S1_RATE_MIN, vmax=S1_RATE_MAX, group="rate")
+    p.add("/siren/depth", 0.55, S1_DEPTH_TAU, eps=0.003, group="s1_depth")
+
+    p.add("/air/freq",  0.55, PITCH_TAU, eps=0.7,   curve=EXP, vmin=AIR_HZ_MIN, vmax=AIR_HZ_MAX, group="pitch")
+    p.add("/air/rate",  0.45, RATE_TAU,  eps=0.005, curve=EXP, vmin=AIR_RATE_MIN, vmax=AIR_RATE_MAX, group="rate")
+    p.add("/air/depth", 0.60, AIR_DEPTH_TAU, eps=0.003, group="air_depth")
+
+    p.add("/bens/freq",  0.55, PITCH_TAU, eps=1.0,  curve=EXP, vmin=BENS_HZ_MIN, vmax=BENS_HZ_MAX, group="pitch")
+    p.add("/bens/rate",  0.45, RATE_TAU,  eps=0.01, curve=EXP, vmin=BENS_RATE_MIN, vmax=BENS_RATE_MAX, group="rate")
+    p.add("/bens/tone",  0.25, BENS_TONE_TAU,  eps=0.003, group="bens_tone")
+    p.add("/bens/drive", 0.15, BENS_DRIVE_TAU, eps=0.003, group="bens_drive")
+    return p
+
+
+class SirenController(Engine):
+    def __init__(self, host=SC_IP, port=SC_PORT, **kw):
+        kw.setdefault("hz", SEND_HZ)
+        kw.setdefault("bundles", SEND_BUNDLES)
+        kw.setdefault("idle_sleep", IDLE_SLEEP)
+        kw.setdefault("server_smoothing", SERVER_SMOOTHING)
+        kw.setdefault("glide_per_tau", GLIDE_PER_TAU)
+        kw.setdefault("name", "osc-sender")
+        super().__init__(siren_params(), host, port, **kw)
+        self.clock = TempoClock()
+        self.quantize = QUANTIZE
+        self.latency = SCHEDULE_LATENCY
+        self.x2 = False
+
+    def when(self):
+        """Unix time of the next grid point SCHEDULE_LATENCY ahead; None = now (no tempo / quantize off)."""
+        if not self.quantize or not self.clock.running:
+            return None
+        return self.clock.wall(self.clock.next(time.perf_counter() + self.latency, self.quantize))
+
+    # --- delay / fb / vol steps ---
+    def time_down(self):
+        return self.nudge("delay_time", -TIME_STEP)
+
+    def time_up(self):
+        return self.nudge("delay_time", TIME_STEP)
+
+    def fb_down(self):
+        return self.nudge("fb", -FB_STEP)
+
+    def fb_up(self):
+        return self.nudge("fb", FB_STEP)
+
+    def vol_down(self):
+        return self.nudge("vol", -VOL_STEP)
+
+    def vol_up(self):
+        return self.nudge("vol", VOL_STEP)
+
+    def tap(self):
+        """Tap sets the ACTUAL delay time (on the next beat) and the clock. Returns the TempoClock state."""
+        t = time.perf_counter()
+        self.note(TAP, "tap")
+        state, est = self.clock.tap(t)
+        if state == "ok":
+            self.set_at("delay_time", clamp(est, TIME_MIN, TIME_MAX), self.when())
+        return state
+
+    def set_x2(self, on):
+        """x2 that actually doubles (on) / halves (off) the delay time target."""
+        on = bool(on)
+        if on == self.x2:
+            return
+        self.x2 = on
+        self.set_at("delay_time", self.get("delay_time") * (2.0 if on else 0.5), self.when())
+
+    def toggle_x2(self):
+        self.set_x2(not self.x2)
+
+    # --- one-shots ---
+    def clear_delay(self):
+        self.trigger("/delay/clear", 1)
+
+    def siren1_toggle(self):
+        self.trigger("/siren/toggle", 1, when=self.when())
+
+    def siren1_stop(self):
+        self.trigger("/siren/stop", 1)
+
+    def air_toggle(self):
+        self.trigger("/air/toggle", 1, when=self.when())
+
+    def air_stop(self):
+        self.trigger("/air/stop", 1)
+
+    def bens_toggle(self):
+        self.trigger("/bens/toggle", 1, when=self.when())
+
+    def bens_stop(self):
+        self.trigger("/bens/stop", 1)
+
+
+# key -> action name, shared by the Tk window and the headless keyboard front end
+KEYMAP = {
+    "Left": "time_down", "Right": "time_up",
+    "Down": "fb_down", "Up": "fb_up",
+    "Escape": "clear_delay",
+    "[": "vol_down", "]": "vol_up",
+    "t": "tap", "2": "toggle_x2",
+    "s": "siren1_toggle", "x": "siren1_stop",
+    "a": "air_toggle", "z": "air_stop",
+    "b": "bens_toggle", "n": "bens_stop",
+}
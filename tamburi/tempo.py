@@ -0,0 +1,122 @@
+"""
+Tap tempo clock on time.perf_counter(): period AND phase, so one-shots and
+delay-time changes can be put on the next beat (or subdivision) as timetagged
+OSC bundles, which sclang hands to scsynth to play at that exact time.
+
+    clock = TempoClock()
+    state, period = clock.tap()         # on every tap
+    t = clock.next(time.perf_counter() + 0.05, sub=0.5)   # next 8th >= 50 ms ahead
+    osc.send_bundle([(msg, args)], when=clock.wall(t))
+
+Period: the median of the last WINDOW tap intervals, kept as a sorted list
+updated by one bisect remove + insert per tap (no full sort). A gap outside
+[lo, hi] starts over; a single interval close to twice the current period is
+taken as a missed tap (two beats), but a second one right after it means the
+player has gone to half tempo: the window restarts from those two intervals.
+
+Phase: `anchor` is the time of one beat. Each tap is compared with the beat
+the clock predicts nearest to it and the anchor moves PHASE_GAIN of the way
+towards the tap, so a single sloppy tap shifts the grid only a little while a
+deliberate change of phase is followed within a few taps. Between taps the
+clock keeps running at the last period.
+"""
+
+import bisect
+import math
+import time
+from collections import deque
+
+WINDOW = 6
+PHASE_GAIN = 0.5
+MISSED_TAP = 0.15  # an interval within 15% of 2 periods counts as 2 beats
+
+
+class TempoClock:
+    def __init__(self, lo=0.08, hi=2.5, window=WINDOW):
+        self.lo = lo
+        self.hi = hi
+        self.period = None  # seconds per beat, None until two intervals agree
+        self.anchor = None  # perf_counter() time of a beat
+        self._last = None
+        self._window = deque(maxlen=window)
+        self._sorted = []
+        self._doubled = None  # the last interval, if it was taken as a missed tap
+        # perf_counter -> Unix time for the timetags (taken once: both clocks tick at the same rate)
+        self._wall_offset = time.time() - time.perf_counter()
+        self.taps = 0
+
+    @property
+    def running(self):
+        return self.period is not None
+
+    @property
+    def bpm(self):
+        return 60.0 / self.period if self.period else 0.0
+
+    def reset(self):
+        self.period = self.anchor = self._last = self._doubled = None
+        self._window.clear()
+        self._sorted.clear()
+
+    def tap(self, now=None):
+        """Returns (state, period): state is "first", "reset", "wait" or "ok"."""
+        now = time.perf_counter() if now is None else now
+        self.taps += 1
+        last, self._last = self._last, now
+        if last is None:
+            return "first", None
+        dt = now - last
+        missed = self.period is not None and abs(dt - 2.0 * self.period) < MISSED_TAP * 2.0 * self.period
+        if missed and self._doubled is None:
+            self._doubled = dt
+            dt *= 0.5
+        else:
+            if missed:  # two in a row: half tempo, not missed taps
+                self._window.clear()
+                self._sorted.clear()
+                self._add(self._doubled)
+            self._doubled = None
+            if dt < self.lo or dt > self.hi:
+                self.reset()
+                self._last = now
+                return "reset", None
+        self._add(dt)
+        if len(self._sorted) < 2:
+            return "wait", None
+
+        s = self._sorted
+        mid = len(s) // 2
+        self.period = s[mid] if len(s) % 2 else 0.5 * (s[mid - 1] + s[mid])
+        if self.anchor is None:
+            self.anchor = now
+        else:
+            predicted = self.anchor + round((now - self.anchor) / self.period) * self.period
+            self.anchor = predicted + PHASE_GAIN * (now - predicted)
+        return "ok", self.period
+
+    def _add(self, dt):
+        if len(self._window) == self._window.maxlen:
+            del self._sorted[bisect.bisect_left(self._sorted, self._window[0])]
+        self._window.append(dt)
+        bisect.insort(self._sorted, dt)
+
+    # --- grid ---
+    def beat(self, t=None):
+        """Beats since the anchor at perf_counter() time t (fractional)."""
+        t = time.perf_counter() if t is None else t
+        return (t - self.anchor) / self.period
+
+    def next(self, t, sub=1.0):
+        """First grid point (every `sub` beats) at or after perf_counter() time t; t if not running."""
+        if not self.running:
+            return t
+        step = self.period * sub
+        return self.anchor + math.ceil((t - self.anchor) / step - 1e-9) * step
+
+    def wall(self, t):
+        """perf_counter() time -> Unix time, for osc timetags."""
+        return t + self._wall_offset
+
+    def stats(self):
+        return {"bpm": self.bpm, "period": self.period, "taps": self.taps,
+                "phase": self.beat() % 1.0 if self.running else None}
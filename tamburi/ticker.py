@@ -0,0 +1,139 @@
+"""
+Fixed-rate loop on its own thread.
+
+The schedule is absolute (next = start + n * period on the monotonic clock),
+so a late tick does not push every following tick later: the loop catches up
+instead of drifting. If it falls more than MAX_BEHIND periods behind (GC pause,
+machine suspended...) it resyncs and counts an overrun instead of bursting.
+
+With an `idle` callable the loop is event driven: when idle() is true after a
+tick the thread blocks with no timeout until wake() is called, so a converged
+controller costs no CPU at all between gestures.
+
+An exception from fn does not end the thread: it is counted (stats()["errors"],
+"last_error"), its traceback printed the first time, and the loop keeps ticking.
+"""
+
+import threading
+import time
+import traceback
+from collections import deque
+
+MAX_BEHIND = 4        # periods; beyond this we resync instead of catching up
+JITTER_WINDOW = 2048  # ticks kept for rate / jitter percentiles
+
+
+def percentile(sorted_vals, q):
+    """Nearest-rank percentile of an already sorted sequence (q in 0..100)."""
+    if not sorted_vals:
+        return 0.0
+    k = int(round(q / 100.0 * (len(sorted_vals) - 1)))
+    return sorted_vals[k]
+
+
+class Ticker:
+    """
+    Calls fn(now, dt) at `hz` on a daemon thread.
+
+    now is time.perf_counter() at wake-up, dt the measured time since the
+    previous call (one nominal period right after an idle sleep). fn must not
+    touch Tk: it runs off the GUI thread.
+    """
+
+    def __init__(self, hz, fn, name="ticker", idle=None):
+        self.period = 1.0 / hz
+        self.fn = fn
+        self.idle = idle
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+        self.ticks = 0
+        self.overruns = 0
+        self.sleeps = 0
+        self.sleeping = False
+        self.errors = 0
+        self.last_error = None
+        self._jitter = deque(maxlen=JITTER_WINDOW)     # wake-up lateness, seconds
+        self._intervals = deque(maxlen=JITTER_WINDOW)  # time between active ticks, for achieved rate
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def set_rate(self, hz):
+        """New target rate, from the next tick on (any thread)."""
+        self.period = 1.0 / hz
+
+    def wake(self):
+        """Leave the idle sleep (cheap, safe to call from any thread on every event)."""
+        self._wake.set()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _run(self):
+        clock = time.perf_counter
+        next_t = clock()
+        last = next_t - self.period
+
+        while not self._stop.is_set():
+            period = self.period
+            wait = next_t - clock()
+            if wait > 0 and self._stop.wait(wait):
+                break
+
+            now = clock()
+            late = now - next_t
+            if late > MAX_BEHIND * period:
+                self.overruns += 1
+                next_t = now
+                late = 0.0
+
+            dt = now - last
+            self._jitter.append(late)
+            self._intervals.append(dt)
+            self.ticks += 1
+
+            # clear before asking idle(): a wake() racing with the check is not lost
+            self._wake.clear()
+            try:
+                self.fn(now, dt)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                if self.errors == 1:
+                    traceback.print_exc()
+            last = now
+            next_t += period
+
+            if self.idle is not None and self.idle():
+                self.sleeping = True
+                self.sleeps += 1
+                self._wake.wait()
+                self.sleeping = False
+                next_t = clock()
+                last = next_t - period
+
+    def stats(self):
+        """Achieved rate and wake-up jitter (ms) over the last JITTER_WINDOW ticks."""
+        intervals = list(self._intervals)
+        jit = sorted(self._jitter)
+        total = sum(intervals)
+        hz = len(intervals) / total if total > 0 else 0.0
+        return {
+            "target_hz": 1.0 / self.period,
+            "hz": hz,
+            "jitter_p50_ms": percentile(jit, 50) * 1000.0,
+            "jitter_p95_ms": percentile(jit, 95) * 1000.0,
+            "jitter_p99_ms": percentile(jit, 99) * 1000.0,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "sleeps": self.sleeps,
+            "sleeping": self.sleeping,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
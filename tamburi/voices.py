@@ -0,0 +1,160 @@
+"""
+Polyphonic voice allocation on pygame.mixer Channels for a SampleBank.
+
+    pool = VoicePool(bank, polyphony=8, policy="oldest", choke={17: "hats", 27: "hats"})
+    pool.play(17)
+
+Every play() takes a free Channel. When `polyphony` voices are already sounding,
+one is stolen by the policy:
+
+    oldest     the voice that started first
+    quietest   lowest level right now (RMS of the sample where it is playing)
+    same-pad   the oldest voice of the pad being pressed, else the oldest
+
+Pads in the same choke group cut each other (and themselves), like an open /
+closed hi-hat pair. Stolen and choked voices are not cut: they fade out over
+fade_ms on one of `spare` extra Channels, so a steal never clicks and never
+delays the new voice. Only if the spares are all still fading is one stopped
+dead (counted in hard_stops).
+
+A fading voice stops streaming at once, but a chunk the bank already queued on
+its Channel would start when fadeout() ends; such a voice is stop()ped (which
+drops the queue) as its fade ends. A voice is only given up once its Channel is
+idle.
+"""
+
+import threading
+import time
+
+import pygame
+
+POLICIES = ("oldest", "quietest", "same-pad")
+FADE_MS = 15
+
+
+class _Voice:
+    __slots__ = ("key", "t0", "fade_end")
+
+    def __init__(self, key, t0):
+        self.key = key
+        self.t0 = t0
+        self.fade_end = 0.0  # monotonic time the fade-out ends, 0 = not fading
+
+
+class VoicePool:
+    def __init__(self, bank, polyphony=8, policy="oldest", fade_ms=FADE_MS, choke=None, spare=2):
+        """
+        bank: SampleBank. polyphony: voices sounding at once (fades excluded).
+        choke: pad key -> group name. spare: extra Channels for fade-outs.
+        Takes Channels 0 .. polyphony + spare - 1 (set_num_channels is called here).
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, not {policy!r}")
+        self.bank = bank
+        self.polyphony = polyphony
+        self.policy = policy
+        self.fade_ms = fade_ms
+        self.choke = dict(choke or {})
+
+        pygame.mixer.set_num_channels(polyphony + spare)
+        self.channels = [pygame.mixer.Channel(i) for i in range(polyphony + spare)]
+        self._voices = {}  # Channel -> _Voice, sounding or fading
+        self._lock = threading.Lock()
+
+        self.plays = 0
+        self.steals = 0
+        self.chokes = 0
+        self.hard_stops = 0
+        self.peak = 0
+
+    def _reap(self, now):
+        for ch, v in list(self._voices.items()):
+            if v.fade_end and now >= v.fade_end and ch.get_busy():
+                ch.stop()  # past its fade: whatever still plays is a queued chunk
+            if not ch.get_busy():
+                del self._voices[ch]
+
+    def _fade(self, ch, now):
+        v = self._voices[ch]
+        if not v.fade_end:
+            self.bank.release(ch)
+            ch.fadeout(self.fade_ms)
+            v.fade_end = now + self.fade_ms / 1000.0
+            if ch.get_queue() is not None:  # would start when the fade ends
+                t = threading.Timer(self.fade_ms / 1000.0, self._end_fade, (ch, v))
+                t.daemon = True
+                t.start()
+
+    def _end_fade(self, ch, v):
+        with self._lock:
+            if self._voices.get(ch) is v:  # not reused (hard stop) meanwhile
+                ch.stop()
+                del self._voices[ch]
+
+    def _victim(self, key, sounding, now):
+        if self.policy == "same-pad":
+            own = [c for c in sounding if self._voices[c].key == key]
+            if own:
+                sounding = own
+        elif self.policy == "quietest":
+            return min(sounding, key=lambda c: c.get_volume() * self.bank.level(
+                self._voices[c].key, now - self._voices[c].t0))
+        return min(sounding, key=lambda c: self._voices[c].t0)
+
+    def play(self, key):
+        """Start pad `key` on a voice; returns the Channel."""
+        now = time.monotonic()
+        with self._lock:
+            self._reap(now)
+            self.plays += 1
+
+            group = self.choke.get(key)
+            if group is not None:
+                for ch, v in list(self._voices.items()):
+                    if not v.fade_end and self.choke.get(v.key) == group:
+                        self._fade(ch, now)
+                        self.chokes += 1
+
+            sounding = [c for c, v in self._voices.items() if not v.fade_end]
+            if len(sounding) >= self.polyphony:
+                self._fade(self._victim(key, sounding, now), now)
+                self.steals += 1
+
+            free = [c for c in self.channels if c not in self._voices]
+            if free:
+                ch = free[0]
+            else:  # every spare still fading: cut the one closest to silence
+                ch = min(self._voices, key=lambda c: (not self._voices[c].fade_end,
+                                                      self._voices[c].fade_end or self._voices[c].t0))
+                self.bank.release(ch)
+                ch.stop()
+                self.hard_stops += 1
+
+            self._voices[ch] = _Voice(key, now)
+            self.bank.play(key, ch)
+            active = sum(1 for v in self._voices.values() if not v.fade_end)
+            self.peak = max(self.peak, active)
+            return ch
+
+    def stop_all(self):
+        """Call after pygame.mixer.stop()."""
+        with self._lock:
+            self._voices.clear()
+        self.bank.stop_all()
+
+    def stats(self):
+        with self._lock:
+            self._reap(time.monotonic())
+            active = sum(1 for v in self._voices.values() if not v.fade_end)
+            fading = len(self._voices) - active
+        return {
+            "polyphony": self.polyphony,
+            "policy": self.policy,
+            "active": active,
+            "fading": fading,
+            "peak": self.peak,
+            "plays": self.plays,
+            "steals": self.steals,
+            "chokes": self.chokes,
+            "hard_stops": self.hard_stops,
+        }
@@ -0,0 +1,34 @@
+"""Regression: a message with a string arg must not stop the hub's stream."""
+
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tamburi.hub import Hub
+from tamburi.osc import decode_packet, encode_message
+
+
+def test_string_message_does_not_stop_the_stream(tmp_path):
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    sink.settimeout(1.0)
+    hub = Hub(str(tmp_path / "hub.sock"), "127.0.0.1", sink.getsockname()[1]).start()
+    src = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        src.sendto(encode_message("/name", ["abc"]), hub.path)
+        time.sleep(0.05)
+        src.sendto(encode_message("/delay/fb", [0.5]), hub.path)
+        got = []
+        deadline = time.monotonic() + 2.0
+        while ("/delay/fb", (0.5,)) not in got and time.monotonic() < deadline:
+            got += [(a, args) for a, _, args, _ in decode_packet(sink.recv(65536))]
+        assert ("/name", ("abc",)) in got
+        assert ("/delay/fb", (0.5,)) in got
+        assert hub.ticker._thread.is_alive()
+        assert hub.counters["send_errors"] == 0
+    finally:
+        src.close()
+        hub.close()
+        sink.close()